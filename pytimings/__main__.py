@@ -0,0 +1,5 @@
+import sys
+
+from pytimings.cli import main
+
+sys.exit(main())
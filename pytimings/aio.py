@@ -0,0 +1,187 @@
+"""asyncio-aware timing context managers and decorators.
+
+Running sections are tracked per task through a context variable instead of the
+shared running flags of :py:class:`pytimings.timer.Timings`, so concurrent tasks
+can time the same section without interfering. Async and sync sections nest into
+one call tree, in either order.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Awaitable, Callable, Coroutine, Generator
+from contextlib import AbstractAsyncContextManager
+from contextvars import Token
+from typing import Any
+
+from pytimings.timer import (
+    _DISABLED_SCOPE,
+    THREAD_TIME_FUNCTION,
+    TO_SECONDS_FACTOR,
+    TimingData,
+    Timings,
+    _async_sections,
+    _check_sample,
+    _settings,
+    global_timings,
+)
+
+__all__ = ["AsyncScopedTiming", "async_function_timer", "async_scoped_timing"]
+
+
+class _OnCpuAwaitable:
+    """Drives a coroutine step by step, summing the thread CPU time spent inside each step.
+
+    Time the coroutine spends suspended at an ``await`` is not counted.
+    """
+
+    __slots__ = ("_coroutine", "thread_ns")
+
+    def __init__(self, coroutine: Coroutine) -> None:
+        self._coroutine = coroutine
+        self.thread_ns = 0
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        iterator = self._coroutine.__await__()
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            start = THREAD_TIME_FUNCTION()
+            try:
+                yielded = iterator.send(value) if error is None else iterator.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.thread_ns += THREAD_TIME_FUNCTION() - start
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:  # forward cancellation and everything else into the coroutine
+                value, error = None, e
+
+
+class AsyncScopedTiming:
+    """Async context manager timing one entry into a section, see :py:func:`async_scoped_timing`
+
+    sample: only measure some entries, see :py:func:`pytimings.timer.scoped_timing`
+    """
+
+    __slots__ = ("_data", "_token", "format", "log_function", "on_cpu_ns", "sample", "section_name", "timings")
+
+    def __init__(
+        self,
+        section_name: str,
+        log_function: Callable[[str], None] | None = None,
+        timings: Timings | None = None,
+        format: str = "",
+        sample: int | float | None = None,
+    ) -> None:
+        if sample is not None:
+            _check_sample(sample)
+        self.section_name = section_name
+        self.log_function = log_function
+        self.timings = timings or global_timings
+        self.format = format
+        self.sample = sample
+        # set by async_function_timer(on_cpu=True) to replace the thread time of the delta
+        self.on_cpu_ns: int | None = None
+        self._data: TimingData | None = None
+        self._token: Token | None = None
+
+    async def __aenter__(self) -> AsyncScopedTiming:
+        # the object recording this thread's sections, in concurrent mode not the Timings itself
+        buffer = self.timings._buffer()
+        running = _async_sections.get()
+        if any(timings is buffer and name == self.section_name for timings, name, _ in running):
+            # the task already times this section, mirror Timings.start and ignore the nested entry
+            return self
+        weight = 1.0
+        if self.sample is not None:
+            weight = buffer._sampling_weight(self.section_name, self.sample)
+            if not weight:
+                return self
+        path = buffer._child_path(self.section_name)
+        self._data = TimingData(self.section_name, self.timings._backend, path, weight)
+        self._token = _async_sections.set((*running, (buffer, self.section_name, path)))
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        data = self._data
+        if data is None:
+            return
+        assert self._token is not None  # set together with _data
+        _async_sections.reset(self._token)
+        self._data = self._token = None
+        data.stop()
+        delta = data.delta()
+        if self.on_cpu_ns is not None:
+            delta = delta._replace(thread=self.on_cpu_ns * TO_SECONDS_FACTOR)
+        self.timings._buffer()._commit(self.section_name, delta, data.path, data.weight)
+        if self.log_function:
+            self.log_function(f"Executing {self.section_name} took {delta.wall:^{self.format}}s")
+
+
+def async_scoped_timing(
+    section_name: str,
+    log_function: Callable[[str], None] | None = None,
+    timings: Timings | None = None,
+    format: str = "",
+    sample: int | float | None = None,
+) -> AbstractAsyncContextManager:
+    """Start timer on entering an ``async with`` block, stop it (and optionally output) on exiting.
+
+    sample: only measure some entries, see :py:func:`pytimings.timer.scoped_timing`
+    The recorded thread time includes CPU time other tasks spent while this block was suspended,
+    use :py:func:`async_function_timer` with ``on_cpu=True`` to only count this task's own CPU time.
+    Returns a no-op context manager while instrumentation is disabled, see :py:func:`pytimings.timer.set_enabled`.
+    """
+    if not _settings.enabled:
+        return _DISABLED_SCOPE
+    return AsyncScopedTiming(section_name, log_function, timings, format, sample)
+
+
+def _timed_coroutine_function(
+    function: Callable[..., Awaitable], timing: Callable[[], AsyncScopedTiming], on_cpu: bool = False
+) -> Callable[..., Awaitable]:
+    """wrap function to time each of its runs in a fresh scope created by timing()"""
+
+    @functools.wraps(function)
+    async def wrapper(*args, **kwargs):
+        scope = timing()
+        async with scope:
+            if not on_cpu:
+                return await function(*args, **kwargs)
+            stepper = _OnCpuAwaitable(function(*args, **kwargs))
+            try:
+                return await stepper
+            finally:
+                scope.on_cpu_ns = stepper.thread_ns
+
+    return wrapper
+
+
+def async_function_timer(
+    section_name: str | None = None,
+    log_function: Callable[[str], None] | None = None,
+    timings: Timings | None = None,
+    on_cpu: bool = False,
+    sample: int | float | None = None,
+) -> Callable:
+    """Time each run of the decorated coroutine function, from first step to completion.
+
+    on_cpu: record only the CPU time spent inside the coroutine's steps between awaits as thread time,
+        wall time still covers the coroutine's whole lifetime
+    sample: only measure some runs, see :py:func:`pytimings.timer.scoped_timing`
+    While instrumentation is disabled the function is returned unchanged.
+    """
+    if sample is not None:
+        _check_sample(sample)
+
+    def decorator(function: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        if not _settings.enabled:
+            return function
+        timing = functools.partial(
+            AsyncScopedTiming, section_name or function.__qualname__, log_function, timings, sample=sample
+        )
+        return _timed_coroutine_function(function, timing, on_cpu)
+
+    return decorator
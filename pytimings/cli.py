@@ -0,0 +1,138 @@
+"""The ``pytimings`` command line interface, also available as ``python -m pytimings``."""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import runpy
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+__all__ = ["main"]
+
+# exit codes, argparse itself exits with 2 on usage errors
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+
+
+def _compare(args: argparse.Namespace) -> int:
+    from rich import console
+
+    from pytimings.compare import compare_files
+
+    report = compare_files(args.baseline, args.candidate, args.field, args.threshold, args.confidence)
+    csl = console.Console()
+    csl.print(report.to_table())
+    for label, sections in (("baseline", report.only_baseline), ("candidate", report.only_candidate)):
+        if sections:
+            csl.print(f"only in {label}: {', '.join(sections)}")
+    if report.inconclusive:
+        csl.print(f"[yellow]{len(report.inconclusive)} section(s) need at least two runs per side[/yellow]")
+    if args.json:
+        report.write_json(args.json)
+    if report.regressions and not args.no_fail:
+        csl.print(f"[bold red]{len(report.regressions)} section(s) got significantly slower[/bold red]")
+        return EXIT_REGRESSION
+    return EXIT_OK
+
+
+def _run(args: argparse.Namespace) -> int:
+    from pytimings.instrument import ImportInstrumenter, MonitoringInstrumenter
+    from pytimings.timer import global_timings, scoped_timing
+    from pytimings.tools import output_at_exit
+
+    script = Path(args.script)
+    # registered before the script runs, so outputs are also written if it calls sys.exit
+    output_at_exit(output_dir=args.output_dir, csv_base=args.base, files=args.format == "csv", console=not args.quiet)
+    if args.format == "npz":
+        atexit.register(global_timings.output_npz, args.output_dir or Path.cwd(), args.base)
+    global_timings.add_extra_data({"script": str(script), "arguments": " ".join(args.arguments)})
+    # the script sees the same argv and import path as if it was run by the interpreter directly
+    sys.argv = [str(script), *args.arguments]
+    sys.path.insert(0, str(script.resolve().parent))
+    instrumenter = MonitoringInstrumenter if args.monitoring else ImportInstrumenter
+    with instrumenter(args.instrument, args.exclude), scoped_timing(script.name):
+        runpy.run_path(str(script), run_name="__main__")
+    return EXIT_OK
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pytimings", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compare = commands.add_parser(
+        "compare",
+        help="compare baseline and candidate timings, exit with 1 on significant slowdowns",
+        description="Compare per-section means of repeated runs with bootstrapped confidence intervals. "
+        "BASELINE and CANDIDATE each are a timing output file, a directory or a glob pattern.",
+    )
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--field", default="wall", help="TimingDelta field to compare (default: %(default)s)")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="relative slowdown tolerated even when significant (default: %(default)s)",
+    )
+    compare.add_argument(
+        "--confidence", type=float, default=0.95, help="confidence level of the intervals (default: %(default)s)"
+    )
+    compare.add_argument("--json", metavar="PATH", help="also write the report as JSON to PATH")
+    compare.add_argument("--no-fail", action="store_true", help="exit with 0 even if sections got slower")
+    compare.set_defaults(handler=_compare)
+
+    run = commands.add_parser(
+        "run",
+        help="run a python script with timings output at exit",
+        description="Run SCRIPT like 'python SCRIPT ARGUMENTS' and write the timings it recorded when it exits. "
+        "The whole run is timed in a section named after the script, and the functions of the modules "
+        "matching '--instrument' patterns in sections of their own. A pattern is 'module' or 'module:function', "
+        "both parts are shell-style globs, e.g. 'mypackage.*' or 'mypackage.solver:Solver.*'.",
+    )
+    run.add_argument("script")
+    run.add_argument("arguments", nargs=argparse.REMAINDER, help="passed on to the script")
+    run.add_argument(
+        "-i",
+        "--instrument",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="time the functions of modules matching PATTERN, may be repeated",
+    )
+    run.add_argument(
+        "-x",
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="do not time the functions matching PATTERN, may be repeated",
+    )
+    run.add_argument(
+        "--monitoring",
+        action="store_true",
+        help="observe calls through sys.monitoring instead of wrapping functions on import, "
+        "also times functions of the script itself ('__main__:*')",
+    )
+    run.add_argument("-o", "--output-dir", help="directory to write the outputs to (default: working directory)")
+    run.add_argument("--base", default="timings", help="file name stem of the outputs (default: %(default)s)")
+    run.add_argument(
+        "--format",
+        choices=("csv", "npz"),
+        default="csv",
+        help="csv rows or a columnar NumPy archive, see Timings.output_npz (default: %(default)s)",
+    )
+    run.add_argument("-q", "--quiet", action="store_true", help="do not print the timings to the console")
+    run.set_defaults(handler=_run)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """run the command line interface, returns the exit code"""
+    args = _parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Detect performance regressions between two sets of timing outputs.
+
+Both the baseline and the candidate are sets of repeated runs, as read by
+:py:func:`pytimings.processing.csv_to_dataframe` or :py:func:`pytimings.processing.npz_to_dataframe`.
+Per section, the speedup is the baseline's mean over the candidate's mean of one TimingDelta field,
+values above 1 mean the candidate is faster. Its confidence interval is bootstrapped by resampling the
+runs of both sides independently, which needs at least two runs per side.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import pandas as pd
+
+__all__ = ["ComparisonReport", "SectionComparison", "compare", "compare_files", "load_runs"]
+
+SLOWER = "slower"
+FASTER = "faster"
+UNCHANGED = "unchanged"
+INCONCLUSIVE = "inconclusive"
+
+# a single run has no spread, its bootstrap interval collapses to the speedup itself
+_MIN_RUNS = 2
+
+# fixed, so repeated comparisons of the same files agree, which a CI gate relies on
+_BOOTSTRAP_SEED = 0
+_BOOTSTRAP_RESAMPLES = 10_000
+
+
+class SectionComparison(NamedTuple):
+    """Comparison of one section, means in the unit of the compared field (seconds for the times)."""
+
+    section: str
+    baseline_mean: float
+    candidate_mean: float
+    baseline_runs: int
+    candidate_runs: int
+    speedup: float
+    ci_low: float
+    ci_high: float
+    status: str
+
+
+@dataclasses.dataclass
+class ComparisonReport:
+    """Result of :py:func:`compare`, sections present on one side only are not compared."""
+
+    field: str
+    confidence: float
+    threshold: float
+    sections: list[SectionComparison]
+    only_baseline: list[str] = dataclasses.field(default_factory=list)
+    only_candidate: list[str] = dataclasses.field(default_factory=list)
+
+    @property
+    def regressions(self) -> list[SectionComparison]:
+        """the sections that got significantly slower"""
+        return [section for section in self.sections if section.status == SLOWER]
+
+    @property
+    def inconclusive(self) -> list[SectionComparison]:
+        """the sections with too few runs on either side to tell"""
+        return [section for section in self.sections if section.status == INCONCLUSIVE]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "field": self.field,
+            "confidence": self.confidence,
+            "threshold": self.threshold,
+            "sections": [section._asdict() for section in self.sections],
+            "only_baseline": self.only_baseline,
+            "only_candidate": self.only_candidate,
+            "regressions": [section.section for section in self.regressions],
+            "inconclusive": [section.section for section in self.inconclusive],
+        }
+
+    def write_json(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        return path
+
+    def to_table(self) -> Any:
+        """the comparison as a rich Table, slower sections in red and faster ones in green"""
+        from rich import box, table
+
+        tbl = table.Table(
+            title=f"{self.field}: speedup of candidate over baseline, {self.confidence:.0%} confidence interval",
+            show_header=True,
+            header_style="bold magenta",
+            box=box.SIMPLE_HEAVY,
+        )
+        tbl.add_column("Section")
+        for column in ("Baseline", "Candidate", "Runs", "Speedup", "CI", "Status"):
+            tbl.add_column(column, justify="right")
+        styles = {SLOWER: "bold red", FASTER: "green", UNCHANGED: "", INCONCLUSIVE: "yellow"}
+        for section in self.sections:
+            tbl.add_row(
+                section.section,
+                f"{section.baseline_mean:.4g}",
+                f"{section.candidate_mean:.4g}",
+                f"{section.baseline_runs}/{section.candidate_runs}",
+                f"{section.speedup:.3f}",
+                f"[{section.ci_low:.3f}, {section.ci_high:.3f}]",
+                section.status,
+                style=styles[section.status],
+            )
+        return tbl
+
+
+def load_runs(filenames: str | Path | Iterable[str | Path]) -> pd.DataFrame:
+    """Read a set of runs, csv files or ``.npz`` archives, given like to :py:func:`csv_to_dataframe`"""
+    from pytimings.processing import _expand_filenames, csv_to_dataframe, npz_to_dataframe
+
+    files = _expand_filenames(filenames, ".csv")
+    if not files and isinstance(filenames, str | Path):
+        files = _expand_filenames(filenames, ".npz")
+    if not files:
+        raise ValueError(f"no timing outputs found in {filenames}")
+    if all(str(fn).endswith(".npz") for fn in files):
+        return npz_to_dataframe(files)
+    return csv_to_dataframe(files, strict=False)
+
+
+def _sections(runs: pd.DataFrame) -> list[str]:
+    sections = runs["pytimings::data::_sections"].dropna()
+    return sorted({section for value in sections for section in value.split("||") if section})
+
+
+def _bootstrap_speedups(baseline: Any, candidate: Any) -> Any:
+    """speedups of resampled means, one per bootstrap resample"""
+    import numpy as np
+
+    rng = np.random.default_rng(_BOOTSTRAP_SEED)
+    baseline_means = baseline[rng.integers(0, len(baseline), (_BOOTSTRAP_RESAMPLES, len(baseline)))].mean(axis=1)
+    candidate_means = candidate[rng.integers(0, len(candidate), (_BOOTSTRAP_RESAMPLES, len(candidate)))].mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return baseline_means / candidate_means
+
+
+def compare(
+    baseline: pd.DataFrame,
+    candidate: pd.DataFrame,
+    field: str = "wall",
+    threshold: float = 0.05,
+    confidence: float = 0.95,
+) -> ComparisonReport:
+    """Compare per-section means of field between two frames of runs.
+
+    A section is flagged slower if the whole confidence interval of its speedup lies below 1 and the
+    candidate is slower by more than the relative threshold, so that insignificant noise and significant
+    but negligible changes both pass. Faster sections are flagged likewise. Sections with a single run
+    on either side are reported as inconclusive instead, their interval says nothing about the noise.
+    """
+    import numpy as np
+
+    from pytimings.timer import FIELD_SUFFIXES
+
+    suffix = FIELD_SUFFIXES.get(field, field)
+    baseline_sections, candidate_sections = _sections(baseline), _sections(candidate)
+    tail = (1 - confidence) / 2 * 100
+    comparisons = []
+    for section in sorted(set(baseline_sections) & set(candidate_sections)):
+        column = f"{section}_{suffix}"
+        if column not in baseline or column not in candidate:
+            raise ValueError(f"field '{field}' was not recorded for section '{section}'")
+        before = baseline[column].dropna().to_numpy(dtype=np.float64)
+        after = candidate[column].dropna().to_numpy(dtype=np.float64)
+        speedup = before.mean() / after.mean() if after.mean() else float("inf")
+        ci_low, ci_high = np.nanpercentile(_bootstrap_speedups(before, after), [tail, 100 - tail])
+        if min(len(before), len(after)) < _MIN_RUNS:
+            status = INCONCLUSIVE
+        elif ci_high < 1 and speedup < 1 / (1 + threshold):
+            status = SLOWER
+        elif ci_low > 1 and speedup > 1 + threshold:
+            status = FASTER
+        else:
+            status = UNCHANGED
+        comparisons.append(
+            SectionComparison(
+                section,
+                float(before.mean()),
+                float(after.mean()),
+                len(before),
+                len(after),
+                float(speedup),
+                float(ci_low),
+                float(ci_high),
+                status,
+            )
+        )
+    return ComparisonReport(
+        field,
+        confidence,
+        threshold,
+        comparisons,
+        only_baseline=sorted(set(baseline_sections) - set(candidate_sections)),
+        only_candidate=sorted(set(candidate_sections) - set(baseline_sections)),
+    )
+
+
+def compare_files(
+    baseline: str | Path | Iterable[str | Path],
+    candidate: str | Path | Iterable[str | Path],
+    field: str = "wall",
+    threshold: float = 0.05,
+    confidence: float = 0.95,
+) -> ComparisonReport:
+    """:py:func:`compare` two sets of timing outputs read with :py:func:`load_runs`"""
+    return compare(load_runs(baseline), load_runs(candidate), field, threshold, confidence)
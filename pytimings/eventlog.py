@@ -0,0 +1,177 @@
+"""Append-only, crash tolerant event log of everything a Timings object records.
+
+Each finished measurement becomes one JSON line. Lines are buffered in memory and
+written in batches by a background thread, so a process that dies loses at most
+the events recorded since the last flush.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytimings
+
+if TYPE_CHECKING:
+    from pytimings.timer import TimingDelta, Timings
+
+__all__ = ["EventLogSink", "read_event_log"]
+
+
+class EventLogSink:
+    """Stream every measurement committed to `timings` into the file at `path`.
+
+    Events are flushed once `max_events` are pending or `flush_interval` seconds have passed,
+    whichever comes first. Recording only appends to a lock-free queue; serialization and file
+    I/O happen on the background thread. The file is opened for appending, so several runs
+    may share one log, see :py:func:`read_event_log` for reading them apart. Extra data of the timings
+    is written with the header and again with the next flush whenever it changed. Close the sink (or use
+    it as a context manager) to flush the remainder, this also happens automatically at interpreter exit.
+
+    fsync: force each batch to disk, not just to the OS, so it survives power loss as well
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        timings: Timings | None = None,
+        max_events: int = 1000,
+        flush_interval: float = 1.0,
+        fsync: bool = True,
+    ) -> None:
+        from pytimings.timer import global_timings
+
+        self.path = Path(path)
+        self.timings = timings or global_timings
+        self.max_events = max_events
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._pending: deque[tuple[float, str, TimingDelta, tuple[str, ...], float]] = deque()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._file = self.path.open("a", encoding="utf-8")
+        self._extra_data = self._encoded_extra_data()
+        header = {
+            "event": "header",
+            "time": time.time(),
+            "pid": os.getpid(),
+            "version": pytimings.__version__,
+            "extra_data": json.loads(self._extra_data),
+        }
+        self._write_lines([json.dumps(header)])
+        self._thread = threading.Thread(target=self._run, name="pytimings-eventlog", daemon=True)
+        self._thread.start()
+        self.timings.add_listener(self)
+        atexit.register(self.close)
+
+    def __call__(self, section_name: str, delta: TimingDelta, path: tuple[str, ...], weight: float) -> None:
+        self._pending.append((time.time(), section_name, delta, path, weight))
+        if len(self._pending) >= self.max_events:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _write_lines(self, lines: list[str]) -> None:
+        with self._write_lock:
+            self._file.write("".join(f"{line}\n" for line in lines))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def _encoded_extra_data(self) -> str:
+        # copying is atomic, the timings' owner may add data meanwhile
+        return json.dumps(dict(self.timings.extra_data), default=str)
+
+    def flush(self) -> None:
+        """write all pending events now, and the extra data if it changed since it was last written"""
+        lines = []
+        pending = self._pending
+        # popleft is atomic, recording threads may keep appending meanwhile
+        while pending:
+            stamp, section_name, delta, path, weight = pending.popleft()
+            event = {"event": "stop", "time": stamp, "section": section_name, "path": path, **delta._asdict()}
+            if weight != 1.0:
+                # a sampled measurement standing for weight calls
+                event["weight"] = weight
+            lines.append(json.dumps(event))
+        extra_data = self._encoded_extra_data()
+        if extra_data != self._extra_data:
+            self._extra_data = extra_data
+            event = {"event": "extra_data", "time": time.time(), "extra_data": json.loads(extra_data)}
+            lines.append(json.dumps(event))
+        if lines and not self._file.closed:
+            self._write_lines(lines)
+
+    def close(self) -> None:
+        """stop listening, flush and close the file"""
+        if self._closed:
+            return
+        self._closed = True
+        self.timings.remove_listener(self)
+        atexit.unregister(self.close)
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+        with self._write_lock:
+            self._file.close()
+
+    def __enter__(self) -> EventLogSink:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _read_runs(path: str | Path) -> list[list[dict]]:
+    """the events of an event log, split into runs at each header"""
+    runs: list[list[dict]] = []
+    with Path(path).open(encoding="utf-8") as log:
+        for line in log:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event["event"] == "header" or not runs:
+                runs.append([])
+            runs[-1].append(event)
+    return runs
+
+
+def read_event_log(path: str | Path, timings: Timings | None = None, run: int | None = None) -> Timings:
+    """Rebuild a Timings object (or add to the given one) by replaying an event log.
+
+    run: index of the run to replay if several sinks appended to the log, negative ones count from
+        the end. Replaying a log with several runs raises a ValueError unless one is selected.
+    Sampled sections are marked as estimated again, their number of calls is estimated from the
+    weights of their measurements. A truncated last line, as left by a crash during a write, is skipped.
+    """
+    from pytimings.timer import TimingDelta, Timings
+
+    runs = _read_runs(path)
+    if run is None:
+        if len(runs) > 1:
+            raise ValueError(f"event log {path} holds {len(runs)} runs, select one with run=<index>")
+        run = 0
+    timings = timings or Timings()
+    for event in runs[run] if runs else []:
+        if event["event"] in ("header", "extra_data"):
+            timings.add_extra_data(event["extra_data"])
+        elif event["event"] == "stop":
+            section, weight = event["section"], event.get("weight", 1.0)
+            delta = TimingDelta(**{field: event[field] for field in TimingDelta._fields if field in event})
+            buffer = timings._buffer()
+            buffer._commit(section, delta, tuple(event["path"]), weight)
+            if weight != 1.0:
+                buffer._sampled_calls[section] = buffer._sampled_calls.get(section, 0) + round(weight)
+    return timings
@@ -0,0 +1,195 @@
+"""Periodic export of the timings of long running processes in the Prometheus text format.
+
+A :py:class:`PrometheusExporter` takes snapshots of a :py:class:`pytimings.timer.Timings` object
+without stopping its timers, at a fixed interval and on demand, and publishes them over a small
+HTTP server (``GET /metrics``) and/or as a file for the node exporter's textfile collector.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytimings.timer import RESOURCE_FIELDS, global_timings
+
+if TYPE_CHECKING:
+    from pytimings.timer import Timings, TimingsSnapshot
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["CONTENT_TYPE", "PrometheusExporter", "to_prometheus"]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# metric name suffix, type and help text per TimingDelta field
+_FIELD_METRICS = {
+    "wall": ("wall_seconds_total", "counter", "walltime spent in the section"),
+    "sys": ("sys_seconds_total", "counter", "system CPU time of the process while in the section"),
+    "user": ("user_seconds_total", "counter", "user CPU time of the process while in the section"),
+    "thread": ("thread_seconds_total", "counter", "CPU time of the recording thread while in the section"),
+    "rss": ("rss_change_bytes", "gauge", "summed change of resident set size over the section's runs"),
+    "peak_rss": ("peak_rss_bytes", "gauge", "peak resident set size of the process when the section stopped"),
+    "page_faults": ("page_faults_total", "counter", "page faults while in the section"),
+    "context_switches": ("context_switches_total", "counter", "context switches while in the section"),
+    "io_bytes": ("io_bytes_total", "counter", "bytes of I/O while in the section"),
+}
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def to_prometheus(snapshot: TimingsSnapshot, prefix: str = "pytimings") -> str:
+    """render snapshot in the Prometheus text exposition format, one sample per section and metric
+
+    Resource metrics are only included if any section recorded them. Sections with statistics
+    additionally get a summary of their per-call walltime with the 50th, 90th and 99th percentile.
+    """
+    lines = []
+    sections = sorted(snapshot.deltas.items())
+    recorded = [field for field in RESOURCE_FIELDS if any(getattr(delta, field) for _, delta in sections)]
+    for field, (suffix, kind, description) in _FIELD_METRICS.items():
+        if field in RESOURCE_FIELDS and field not in recorded:
+            continue
+        name = f"{prefix}_section_{suffix}"
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+        lines += [f'{name}{{section="{_label(section)}"}} {getattr(delta, field)!r}' for section, delta in sections]
+    if snapshot.statistics:
+        name = f"{prefix}_section_call_seconds"
+        lines += [f"# HELP {name} walltime of single calls of the section", f"# TYPE {name} summary"]
+        for section, stats in sorted(snapshot.statistics.items()):
+            label = _label(section)
+            for quantile in _QUANTILES:
+                value = stats.percentile(quantile * 100) if stats.count else float("nan")
+                lines.append(f'{name}{{section="{label}",quantile="{quantile}"}} {value!r}')
+            lines.append(f'{name}_sum{{section="{label}"}} {stats.mean * stats.count!r}')
+            lines.append(f'{name}_count{{section="{label}"}} {stats.count}')
+    if snapshot.sampled_calls:
+        name = f"{prefix}_section_sampled_calls_total"
+        lines += [f"# HELP {name} calls of sections timed with sampling", f"# TYPE {name} counter"]
+        lines += [
+            f'{name}{{section="{_label(section)}"}} {calls}'
+            for section, calls in sorted(snapshot.sampled_calls.items())
+        ]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    server: _MetricsServer
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.metrics().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format, *args)
+
+
+class _MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], exporter: PrometheusExporter) -> None:
+        self.exporter = exporter
+        super().__init__(address, _MetricsHandler)
+
+
+class PrometheusExporter:
+    """Publish snapshots of timings, including running timers, every interval seconds.
+
+    textfile: path the metrics are written to after every snapshot, atomically replaced so the node
+        exporter never reads a partial file (its textfile collector expects a ``.prom`` suffix)
+    port: serve ``GET /metrics`` on host:port, 0 picks a free port, see :py:attr:`port`.
+        The host defaults to localhost, exposing the server to the network is up to the caller.
+
+    Scrapes are answered from the latest snapshot, a new one is only taken if it is older than
+    interval, so the overhead on the timed process stays bounded however often it is scraped.
+    Call :py:meth:`export` to snapshot on demand, :py:meth:`close` (or leave the context manager)
+    to stop the background thread and the server.
+    """
+
+    def __init__(
+        self,
+        timings: Timings | None = None,
+        interval: float = 15.0,
+        textfile: str | Path | None = None,
+        port: int | None = None,
+        host: str = "127.0.0.1",
+    ) -> None:
+        self.timings = timings or global_timings
+        self.interval = interval
+        self.textfile = Path(textfile) if textfile is not None else None
+        self._lock = threading.Lock()
+        self._metrics = ""
+        self._taken = float("-inf")
+        self._closed = threading.Event()
+        self._server = _MetricsServer((host, port), self) if port is not None else None
+        self._threads = [threading.Thread(target=self._run, name="pytimings-exporter", daemon=True)]
+        if self._server is not None:
+            self._threads.append(
+                threading.Thread(target=self._server.serve_forever, name="pytimings-metrics-server", daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def port(self) -> int | None:
+        """the port the HTTP server listens on, None without a server"""
+        return self._server.server_address[1] if self._server is not None else None
+
+    def export(self) -> str:
+        """take a snapshot now, write the textfile and return the metrics
+
+        Called from the exporter's own threads, recording threads only wait while their records are copied.
+        """
+        with self._lock:
+            metrics = to_prometheus(self.timings.snapshot(running=True))
+            self._metrics, self._taken = metrics, time.monotonic()
+            if self.textfile is not None:
+                temporary = self.textfile.with_name(f".{self.textfile.name}.{os.getpid()}.tmp")
+                temporary.write_text(metrics, encoding="utf-8")
+                temporary.replace(self.textfile)
+            return metrics
+
+    def metrics(self) -> str:
+        """the latest metrics, snapshotting first if they are older than interval"""
+        with self._lock:
+            if time.monotonic() - self._taken < self.interval:
+                return self._metrics
+        return self.export()
+
+    def _run(self) -> None:
+        while not self._closed.wait(self.interval):
+            try:
+                self.export()
+            except Exception:
+                logger.exception("exporting timings failed")
+
+    def close(self) -> None:
+        """stop exporting, the textfile is left in place"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> PrometheusExporter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,342 @@
+"""Time functions of modules without editing their source.
+
+:py:class:`ImportInstrumenter` wraps matching functions when their module is imported,
+:py:class:`MonitoringInstrumenter` observes calls through ``sys.monitoring`` (PEP 669, Python 3.12+)
+and leaves the functions untouched. Patterns select what to time, ``module`` or ``module:function``, both parts are
+:py:mod:`fnmatch` globs. ``function`` matches against qualified names, so ``pkg.*:Solver.*`` times all
+methods of ``Solver`` classes in the submodules of ``pkg``. Omitting the function part times all public
+functions and methods of the matching modules. Names starting with an underscore (or ``<`` like
+``<lambda>``) are only matched by function globs that start with the same character, e.g. ``pkg:*`` skips
+``_helper`` and ``__init__``, ``pkg:_helper`` and ``pkg:*.__init__`` do not.
+
+Matching functions are wrapped with :py:func:`pytimings.timer.function_timer`, in sections named
+``<module>.<qualified name>``. Generator functions are left alone, timing them would only cover the
+creation of the generator. Patterns should select your own code, timing modules the timer itself
+relies on (like ``threading``) would recurse, pytimings' own modules are never instrumented.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.abc
+import importlib.machinery
+import inspect
+import operator
+import sys
+import threading
+from fnmatch import fnmatchcase
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from pytimings.timer import function_timer, global_timings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from pytimings.timer import Timings
+
+__all__ = ["ImportInstrumenter", "MonitoringInstrumenter", "instrument_module"]
+
+
+def _split(pattern: str) -> tuple[str, str]:
+    module, _, function = pattern.partition(":")
+    return module, function or "*"
+
+
+def _matches(qualname: str, function_pattern: str) -> bool:
+    first = qualname.rpartition(".")[2][:1]
+    if first in ("_", "<") and not function_pattern.rpartition(".")[2].startswith(first):
+        return False
+    return fnmatchcase(qualname, function_pattern)
+
+
+def _is_own_module(module_name: str) -> bool:
+    # timing the timer would recurse
+    return module_name == "pytimings" or module_name.startswith("pytimings.")
+
+
+def _candidates(module: ModuleType) -> Iterable[tuple[Any, str, str, Any]]:
+    """(owner, attribute name, qualified name, attribute) of the functions and methods defined in module"""
+    for name, value in list(vars(module).items()):
+        if inspect.isfunction(value) and value.__module__ == module.__name__:
+            yield module, name, value.__qualname__, value
+        elif inspect.isclass(value) and value.__module__ == module.__name__:
+            for attribute, member in list(vars(value).items()):
+                function = member.__func__ if isinstance(member, staticmethod | classmethod) else member
+                if inspect.isfunction(function):
+                    yield value, attribute, f"{value.__qualname__}.{attribute}", member
+
+
+def instrument_module(
+    module: ModuleType,
+    function_patterns: Sequence[str],
+    timings: Timings | None = None,
+    exclude: Sequence[str] = (),
+) -> list[str]:
+    """Time the functions of module whose qualified names match any of function_patterns and none of exclude.
+
+    Functions instrumented before are skipped. Returns the names of the newly timed sections.
+    """
+    instrumented = []
+    for owner, attribute, qualname, member in _candidates(module):
+        if not any(_matches(qualname, pattern) for pattern in function_patterns):
+            continue
+        if any(fnmatchcase(qualname, pattern) for pattern in exclude):
+            continue
+        function = member.__func__ if isinstance(member, staticmethod | classmethod) else member
+        if hasattr(function, "__pytimings_section__"):
+            continue
+        if inspect.isgeneratorfunction(function) or inspect.isasyncgenfunction(function):
+            continue
+        section = f"{module.__name__}.{qualname}"
+        wrapped = function_timer(section_name=section, timings=timings)(function)
+        if wrapped is function:
+            # instrumentation is disabled
+            continue
+        wrapped.__pytimings_section__ = section  # type: ignore[attr-defined]
+        if isinstance(member, staticmethod | classmethod):
+            wrapped = type(member)(wrapped)
+        setattr(owner, attribute, wrapped)
+        instrumented.append(section)
+    return instrumented
+
+
+class _InstrumentingLoader(importlib.abc.Loader):
+    """runs the original loader, then instruments the freshly executed module"""
+
+    def __init__(self, loader: importlib.abc.Loader, instrumenter: ImportInstrumenter) -> None:
+        self._loader = loader
+        self._instrumenter = instrumenter
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._loader.exec_module(module)
+        self._instrumenter.instrument(module)
+
+    def __getattr__(self, name: str) -> Any:
+        # resource readers, get_source etc. of the original loader
+        return getattr(self._loader, name)
+
+
+class ImportInstrumenter(importlib.abc.MetaPathFinder):
+    """Import hook timing the functions matched by include and not by exclude patterns, see the module documentation.
+
+    Exclude patterns match private names as well. Installing it also instruments matching modules that
+    were imported already. Removing it leaves instrumented functions in place.
+    """
+
+    def __init__(self, include: Iterable[str], exclude: Iterable[str] = (), timings: Timings | None = None) -> None:
+        self.include = [_split(pattern) for pattern in include]
+        self.exclude = [_split(pattern) for pattern in exclude]
+        self.timings = timings
+        self.sections: list[str] = []
+
+    def _function_patterns(self, module_name: str) -> list[str]:
+        if _is_own_module(module_name):
+            return []
+        return [function for module, function in self.include if fnmatchcase(module_name, module)]
+
+    def instrument(self, module: ModuleType) -> None:
+        function_patterns = self._function_patterns(module.__name__)
+        if function_patterns:
+            exclude = [function for pattern, function in self.exclude if fnmatchcase(module.__name__, pattern)]
+            self.sections += instrument_module(module, function_patterns, self.timings, exclude)
+
+    def find_spec(
+        self, fullname: str, path: Sequence[str] | None, target: ModuleType | None = None
+    ) -> importlib.machinery.ModuleSpec | None:
+        if not self._function_patterns(fullname):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _InstrumentingLoader(spec.loader, self)
+                return spec
+        return None
+
+    def install(self) -> ImportInstrumenter:
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        for module in list(sys.modules.values()):
+            if isinstance(module, ModuleType):
+                self.instrument(module)
+        return self
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def __enter__(self) -> ImportInstrumenter:
+        return self.install()
+
+    def __exit__(self, *exc_info) -> None:
+        self.uninstall()
+
+
+class _ThreadState(threading.local):
+    def __init__(self) -> None:
+        # nesting depth of the running timed sections, recursive calls only count once
+        self.depth: dict[str, int] = {}
+        # set while the timer runs, calls made by the timer itself are not timed
+        self.busy = False
+
+
+class MonitoringInstrumenter:
+    """Time every call of the functions matched by include and not by exclude patterns via ``sys.monitoring``.
+
+    Patterns are those of the module documentation, exclude patterns match private names as well.
+    Functions are matched by their code objects, including those of scripts run as ``__main__``, nested
+    functions and functions defined before installing the instrumenter. The monitoring events of
+    unmatched code are disabled after their first occurrence, so unlike ``sys.setprofile`` the
+    instrumenter costs (almost) nothing outside the timed functions.
+
+    Recursive calls are timed as one run of the outermost call. Generators and coroutines are timed
+    while they execute, time spent suspended at ``yield`` or ``await`` is not included. Each resumption
+    is a run of its own, so their section statistics count resumptions rather than calls: iterating a
+    generator that yields twice counts 3 runs.
+    Uses the ``sys.monitoring`` tool id reserved for profilers, so it cannot run alongside other profilers.
+    Installing calls ``sys.monitoring.restart_events()``, which re-enables the events that any tool,
+    e.g. coverage, disabled for code locations it is done with. Those tools see such events again.
+    """
+
+    def __init__(self, include: Iterable[str], exclude: Iterable[str] = (), timings: Timings | None = None) -> None:
+        self.include = [_split(pattern) for pattern in include]
+        self.exclude = [_split(pattern) for pattern in exclude]
+        self.timings = timings or global_timings
+        self._sections: dict[Any, str | None] = {}
+        self._modules_by_file: dict[str, str] = {}
+        self._state = _ThreadState()
+        self._installed = False
+
+    def _module_name(self, filename: str) -> str | None:
+        if filename not in self._modules_by_file:
+            # modules imported since the last lookup, or __main__ replaced by runpy
+            for name, module in list(sys.modules.items()):
+                module_file = getattr(module, "__file__", None)
+                if isinstance(module_file, str):
+                    self._modules_by_file[module_file] = name
+        return self._modules_by_file.get(filename)
+
+    def _section(self, code: Any) -> str | None:
+        """the section timing code, None if code is not selected"""
+        try:
+            return self._sections[code]
+        except KeyError:
+            pass
+        module, qualname = self._module_name(code.co_filename), code.co_qualname
+        section = None
+        if (
+            module is not None
+            and not _is_own_module(module)
+            and any(fnmatchcase(module, pattern) and _matches(qualname, function) for pattern, function in self.include)
+            and not any(
+                fnmatchcase(module, pattern) and fnmatchcase(qualname, function) for pattern, function in self.exclude
+            )
+        ):
+            section = f"{module}.{qualname}"
+        self._sections[code] = section
+        return section
+
+    def _enter(self, code: Any, offset: int) -> Any:
+        section = self._section(code)
+        if section is None:
+            return sys.monitoring.DISABLE
+        state = self._state
+        if state.busy:
+            return None
+        depth = state.depth.get(section, 0)
+        state.depth[section] = depth + 1
+        if not depth:
+            state.busy = True
+            try:
+                self.timings.start(section)
+            finally:
+                state.busy = False
+        return None
+
+    def _exit(self, code: Any, offset: int, value: object) -> Any:
+        section = self._section(code)
+        if section is None:
+            return sys.monitoring.DISABLE
+        self._leave(section)
+        return None
+
+    def _unwind(self, code: Any, offset: int, exception: BaseException) -> None:
+        # unwinding cannot be disabled per code object, look up instead
+        section = self._section(code)
+        if section is not None:
+            self._leave(section)
+
+    def _leave(self, section: str) -> None:
+        state = self._state
+        depth = state.depth.get(section, 0)
+        if state.busy or not depth:
+            # entered before installing or by the timer itself
+            return
+        state.depth[section] = depth - 1
+        if depth == 1:
+            state.busy = True
+            try:
+                self.timings.stop(section)
+            finally:
+                state.busy = False
+
+    def install(self) -> MonitoringInstrumenter:
+        if self._installed:
+            return self
+        monitoring = sys.monitoring
+        tool = monitoring.PROFILER_ID
+        try:
+            monitoring.use_tool_id(tool, "pytimings")
+        except ValueError:
+            raise RuntimeError(
+                f"sys.monitoring profiler tool id is already used by '{monitoring.get_tool(tool)}'"
+            ) from None
+        events = monitoring.events
+        callbacks: dict[int, Callable[..., object]] = {
+            events.PY_START: self._enter,
+            events.PY_RESUME: self._enter,
+            events.PY_RETURN: self._exit,
+            events.PY_YIELD: self._exit,
+            events.PY_UNWIND: self._unwind,
+        }
+        for event, callback in callbacks.items():
+            monitoring.register_callback(tool, event, callback)
+        monitoring.set_events(tool, functools.reduce(operator.or_, callbacks))
+        # events disabled by an earlier instrumenter may be selected by this one
+        monitoring.restart_events()
+        self._installed = True
+        return self
+
+    def uninstall(self) -> None:
+        """stop timing, sections still running in the calling thread are stopped"""
+        if not self._installed:
+            return
+        monitoring = sys.monitoring
+        tool = monitoring.PROFILER_ID
+        monitoring.set_events(tool, monitoring.events.NO_EVENTS)
+        for event in (
+            monitoring.events.PY_START,
+            monitoring.events.PY_RESUME,
+            monitoring.events.PY_RETURN,
+            monitoring.events.PY_YIELD,
+            monitoring.events.PY_UNWIND,
+        ):
+            monitoring.register_callback(tool, event, None)
+        monitoring.free_tool_id(tool)
+        self._installed = False
+        for section, depth in self._state.depth.items():
+            if depth:
+                self.timings.stop(section)
+        self._state.depth.clear()
+
+    def __enter__(self) -> MonitoringInstrumenter:
+        return self.install()
+
+    def __exit__(self, *exc_info) -> None:
+        self.uninstall()
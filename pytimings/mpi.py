@@ -0,0 +1,110 @@
+"""Reduction of timings across MPI ranks.
+
+Communicators are duck-typed: anything providing ``Get_rank()``, ``Get_size()`` and
+``gather(obj, root=0)`` like an ``mpi4py.MPI.Comm`` works, which allows testing without MPI.
+"""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import pytimings
+from pytimings.tools import ensure_directory_exists
+
+if TYPE_CHECKING:
+    from pytimings.timer import TimingDelta, Timings
+
+__all__ = ["RankSummary", "default_communicator", "gather_deltas", "output_files", "summarize"]
+
+
+class RankSummary(NamedTuple):
+    """Reduction of one delta field of one section over all ranks."""
+
+    min: float
+    max: float
+    mean: float
+
+    @property
+    def imbalance(self) -> float:
+        """max over mean, 1 for a perfectly balanced section"""
+        return self.max / self.mean if self.mean else 1.0
+
+
+def default_communicator() -> Any:
+    """``mpi4py.MPI.COMM_WORLD``"""
+    try:
+        from mpi4py import MPI
+    except ImportError as e:  # pragma: no cover
+        raise ImportError("MPI support requires mpi4py. Install it with 'pip install mpi4py'.") from e
+    return MPI.COMM_WORLD
+
+
+def gather_deltas(timings: Timings, comm: Any) -> list[dict[str, TimingDelta]] | None:
+    """Collect every rank's committed deltas on rank 0, other ranks get None"""
+    return comm.gather(timings.snapshot().deltas, root=0)
+
+
+def summarize(per_rank: list[dict[str, TimingDelta]]) -> dict[str, dict[str, RankSummary]]:
+    """Reduce per-rank deltas to min/max/mean per section and field.
+
+    A section missing on some rank counts as zero time spent there.
+    """
+    from pytimings.timer import TimingDelta
+
+    sections = sorted(set().union(*per_rank))
+    zero = TimingDelta(0, 0, 0)
+    summary = {}
+    for section in sections:
+        deltas = [rank_deltas.get(section, zero) for rank_deltas in per_rank]
+        summary[section] = {
+            field: RankSummary(min(values), max(values), sum(values) / len(values))
+            for field, values in zip(TimingDelta._fields, zip(*deltas, strict=True), strict=True)
+        }
+    return summary
+
+
+def output_files(timings: Timings, output_dir: str | Path, csv_base: str, comm: Any = None) -> Path | None:
+    """Write a csv per rank and, on rank 0, a summary over all ranks.
+
+    Every rank writes ``<csv_base>_p<rank>.csv``, rank 0 additionally writes ``<csv_base>.csv`` with
+    ``<section>_<field>_min/_max/_mean`` rows and a ``<section>_imbalance`` row (max over mean walltime).
+    This is a collective operation, all ranks of ``comm`` must call it.
+    Returns the summary file's path on rank 0 and None on all other ranks.
+    """
+    from pytimings.timer import FIELD_SUFFIXES
+
+    comm = comm or default_communicator()
+    rank, size = comm.Get_rank(), comm.Get_size()
+    output_dir = Path(output_dir)
+    ensure_directory_exists(output_dir)
+    with (output_dir / f"{csv_base}_p{rank:05}.csv").open("w") as out:
+        timings.output_all_measures(out)
+
+    per_rank = gather_deltas(timings, comm)
+    if rank != 0:
+        return None
+    assert per_rank is not None  # root always receives the gathered data
+    outfile = output_dir / f"{csv_base}.csv"
+    with outfile.open("w") as out:
+        csv_file = csv.writer(out, lineterminator="\n")
+        csv_file.writerow(["section", "value"])
+        csv_file.writerow(["ranks", size])
+        csv_file.writerow(["threads", 1])
+        summary = summarize(per_rank)
+        for section, fields in summary.items():
+            for field, reduced in fields.items():
+                suffix = FIELD_SUFFIXES.get(field, field)
+                csv_file.writerows(
+                    [
+                        [f"{section}_{suffix}_min", reduced.min],
+                        [f"{section}_{suffix}_max", reduced.max],
+                        [f"{section}_{suffix}_mean", reduced.mean],
+                    ]
+                )
+            csv_file.writerow([f"{section}_imbalance", fields["wall"].imbalance])
+        csv_file.writerows([[f"pytimings::data::{k}", v] for k, v in timings.extra_data.items()])
+        csv_file.writerow(["pytimings::data::_sections", "||".join(summary)])
+        csv_file.writerow(["pytimings::data::_version", pytimings.__version__])
+    return outfile
@@ -0,0 +1,58 @@
+"""Time series of a section's recent per-call measurements, see :py:meth:`pytimings.timer.Timings.history`."""
+
+from __future__ import annotations
+
+from statistics import median
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from pytimings.statistics import SectionHistory
+
+__all__ = ["detect_warmup", "plot_history"]
+
+
+def detect_warmup(values: Sequence[float], window: int = 10, tolerance: float = 0.1) -> int:
+    """number of leading values that belong to a warm-up phase, 0 if there is none
+
+    The steady state is the median of the second half of values. Warm-up ends after the last window
+    whose rolling median deviates from it by more than tolerance (relative), mid-window.
+    """
+    if window < 1:
+        raise ValueError(f"window must be positive, got {window}")
+    if len(values) < 2 * window:
+        return 0
+    steady = median(values[len(values) // 2 :])
+    limit = tolerance * abs(steady)
+    last_deviating = None
+    for start in range(len(values) - window + 1):
+        if abs(median(values[start : start + window]) - steady) > limit:
+            last_deviating = start
+    if last_deviating is None:
+        return 0
+    return last_deviating + (window + 1) // 2
+
+
+def plot_history(
+    history: SectionHistory, field: str = "wall", ax: Any = None, label: str | None = None, warmup: int | None = 10
+) -> Any:
+    """plot one field of history against the call number, returns the matplotlib Axes
+
+    Unless warmup is None, the end of the warm-up phase found by :py:func:`detect_warmup` with a window
+    of warmup calls is marked by a vertical line.
+    """
+    if ax is None:
+        import matplotlib.pyplot as plt
+
+        _, ax = plt.subplots()
+    first = history.count - len(history)
+    values = history.values(field)
+    (line,) = ax.plot(range(first, history.count), values, label=label)
+    if warmup is not None:
+        calls = detect_warmup(values, window=warmup)
+        if calls:
+            ax.axvline(first + calls, color=line.get_color(), linestyle="--", label=f"{label or field} warm-up")
+    ax.set_xlabel("call")
+    ax.set_ylabel(f"{field} [s]")
+    return ax
@@ -0,0 +1,44 @@
+"""Plots of the metrics computed by :py:func:`pytimings.scaling.scaling_metrics`."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import pandas as pd
+
+__all__ = ["plot_scaling"]
+
+_LABELS = {"speedup": "speedup", "efficiency": "parallel efficiency", "karp_flatt": "Karp-Flatt serial fraction"}
+
+
+def plot_scaling(
+    metrics: pd.DataFrame, metric: str = "speedup", sections: Sequence[str] | None = None, ax: Any = None
+) -> Any:
+    """plot one metric against the worker count, a line per section (and size), returns the matplotlib Axes
+
+    Speedup is drawn on log-log axes with the ideal linear speedup as reference, efficiency with the
+    ideal of 1, the Karp-Flatt metric as is. For a weak scaling study the speedup is the scaled one.
+    """
+    if ax is None:
+        import matplotlib.pyplot as plt
+
+        _, ax = plt.subplots()
+    selected = metrics if sections is None else metrics[metrics["section"].isin(sections)]
+    keys = ["size", "section"] if "size" in selected and selected["size"].nunique() > 1 else ["section"]
+    for key, group in selected.groupby(keys, sort=False, dropna=False):
+        label = " ".join(str(value) for value in key) if isinstance(key, tuple) else str(key)
+        ax.plot(group["workers"], group[metric], marker="o", label=label)
+    workers = sorted(selected["workers"].unique())
+    if workers and metric == "speedup":
+        ax.plot(workers, [count / workers[0] for count in workers], color="grey", linestyle=":", label="ideal")
+        ax.set_xscale("log", base=2)
+        ax.set_yscale("log", base=2)
+    elif metric == "efficiency":
+        ax.axhline(1.0, color="grey", linestyle=":", label="ideal")
+    ax.set_xlabel("workers")
+    ax.set_ylabel(_LABELS.get(metric, metric))
+    ax.legend()
+    return ax
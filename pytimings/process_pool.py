@@ -0,0 +1,110 @@
+"""Collect timings recorded in worker processes of a process pool."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pytimings.timer import Timings, TimingsSnapshot
+
+__all__ = ["TimedProcessPoolExecutor", "call_and_snapshot"]
+
+
+def _take_global_timings() -> tuple[int, TimingsSnapshot]:
+    """the worker's pid and a snapshot of its `global_timings`, which are cleared afterwards"""
+    from pytimings.timer import global_timings
+
+    snapshot = global_timings.snapshot()
+    global_timings._clear()
+    return os.getpid(), snapshot
+
+
+def _initialize_worker(initializer: Callable | None, initargs: tuple) -> None:
+    # forked workers inherit the parent's records, which would otherwise be merged back with the first task
+    _take_global_timings()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def call_and_snapshot(function: Callable, *args, **kwargs) -> tuple[Any, int, TimingsSnapshot]:
+    """Run function, then return its result with the worker's pid and what it recorded in `global_timings`
+
+    The worker's `global_timings` is cleared afterwards, so each snapshot only covers a single call.
+    If function raises, the pid and snapshot are attached to the exception as ``__pytimings_snapshot__``.
+    """
+    try:
+        result = function(*args, **kwargs)
+    except BaseException as e:
+        # pickled along with the exception, so the parent can still merge what the task recorded
+        e.__pytimings_snapshot__ = _take_global_timings()  # type: ignore[attr-defined]
+        raise
+    return (result, *_take_global_timings())
+
+
+class TimedProcessPoolExecutor(ProcessPoolExecutor):
+    """A ProcessPoolExecutor that merges the timings recorded by each task into a parent Timings object.
+
+    Tasks record into their worker's `global_timings` as usual, e.g. via `function_timer`. Workers start
+    with empty `global_timings`, also when forked from a parent that recorded already. The timings of
+    tasks that raise are merged as well.
+
+    timings: where the workers' records are merged to, defaults to the parent's `global_timings`
+    per_worker: keep the sections of each worker apart, prefixed with ``worker_<pid>.``
+    initializer, initargs: as for ProcessPoolExecutor, only accepted as keyword arguments
+    """
+
+    def __init__(
+        self,
+        *args,
+        timings: Timings | None = None,
+        per_worker: bool = False,
+        initializer: Callable | None = None,
+        initargs: tuple = (),
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, initializer=_initialize_worker, initargs=(initializer, initargs), **kwargs)
+        from pytimings.timer import global_timings
+
+        self.timings = timings or global_timings
+        self.per_worker = per_worker
+
+    def _merge(self, pid: int, snapshot: TimingsSnapshot) -> None:
+        self.timings.merge(snapshot, prefix=f"worker_{pid}." if self.per_worker else "")
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        inner = super().submit(call_and_snapshot, fn, *args, **kwargs)
+        outer: Future = Future()
+
+        def _unwrap(done: Future) -> None:
+            if done.cancelled():
+                # outer is still pending (or cancelled by its owner), wait() and as_completed() only
+                # see it once it was notified like an executor notifies the futures it cancels
+                outer.cancel()
+                outer.set_running_or_notify_cancel()
+                return
+            exception = done.exception()
+            if exception is None:
+                result, pid, snapshot = done.result()
+                self._merge(pid, snapshot)
+            else:
+                recorded = exception.__dict__.pop("__pytimings_snapshot__", None)
+                if recorded is not None:
+                    self._merge(*recorded)
+            # the task ran even if outer was cancelled meanwhile, its timings are merged above regardless
+            if not outer.set_running_or_notify_cancel():
+                return
+            if exception is None:
+                outer.set_result(result)
+            else:
+                outer.set_exception(exception)
+
+        def _forward_cancel(future: Future) -> None:
+            if future.cancelled():
+                inner.cancel()
+
+        outer.add_done_callback(_forward_cancel)
+        inner.add_done_callback(_unwrap)
+        return outer
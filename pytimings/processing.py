@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import csv
+import glob
+import pickle
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -10,11 +14,83 @@ if TYPE_CHECKING:
 
 logger = getLogger(__name__)
 
-__all__ = ["csv_to_dataframe"]
+__all__ = ["csv_to_dataframe", "file_sections", "npz_to_dataframe"]
 
 
-def csv_to_dataframe(filenames: Iterable[str | Path], sort: bool = False) -> pd.DataFrame:
-    """Read csv files into a Pandas.DataFrame"""
+def _expand_filenames(filenames: str | Path | Iterable[str | Path], suffix: str) -> list[str | Path]:
+    """a directory yields all its files with the given suffix, a string with wildcards is globbed"""
+    if isinstance(filenames, str | Path):
+        path = Path(filenames)
+        if path.is_dir():
+            return sorted(path.glob(f"*{suffix}"))
+        if glob.has_magic(str(filenames)):
+            return sorted(glob.glob(str(filenames)))  # noqa: PTH207
+        return [filenames]
+    return list(filenames)
+
+
+def _read_measures(filename: str | Path) -> dict[str, str]:
+    """parse one file written by Timings.output_all_measures into a row name to value mapping"""
+    with Path(filename).open(newline="") as csv_file:
+        reader = csv.reader(csv_file)
+        next(reader, None)  # header
+        return {row[0]: row[1] for row in reader if len(row) > 1}
+
+
+def _load_cache(cache: Path) -> dict[str, tuple[int, int, dict[str, str]]]:
+    try:
+        with cache.open("rb") as cache_file:
+            return pickle.load(cache_file)
+    except FileNotFoundError:
+        return {}
+    except (pickle.UnpicklingError, EOFError):
+        logger.warning("ignoring unreadable csv cache %s", cache)
+        return {}
+
+
+def _read_all_measures(
+    filenames: list[str | Path], workers: int | None, cache: str | Path | None
+) -> list[dict[str, str]]:
+    """parse all files in parallel, reusing cached results of files unchanged since they were parsed"""
+    keys = [str(Path(fn).resolve()) for fn in filenames]
+    stats = [Path(fn).stat() for fn in filenames]
+    cached = _load_cache(Path(cache)) if cache is not None else {}
+    results: dict[str, dict[str, str]] = {}
+    todo = []
+    for key, fn, stat in zip(keys, filenames, stats, strict=True):
+        entry = cached.get(key)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            results[key] = entry[2]
+        else:
+            todo.append((key, fn, stat))
+    if todo:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parsed = executor.map(_read_measures, [fn for _, fn, _ in todo])
+            for (key, _, stat), measures in zip(todo, parsed, strict=True):
+                results[key] = measures
+                cached[key] = (stat.st_mtime_ns, stat.st_size, measures)
+        if cache is not None:
+            with Path(cache).open("wb") as cache_file:
+                pickle.dump(cached, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+    return [results[key] for key in keys]
+
+
+def csv_to_dataframe(
+    filenames: str | Path | Iterable[str | Path],
+    sort: bool = False,
+    workers: int | None = None,
+    cache: str | Path | None = None,
+    strict: bool = True,
+) -> pd.DataFrame:
+    """Read csv files into a Pandas.DataFrame
+
+    filenames: csv files, a directory containing them or a glob pattern
+    workers: number of threads parsing files in parallel, defaults to the ThreadPoolExecutor default
+    cache: a file to keep parsed results in, files are only parsed again once their mtime or size changes
+    strict: raise a ValueError if the files do not all contain the same sections. Otherwise the frame
+        has the union of all columns, NaN where a file lacks a section, see :py:func:`file_sections`
+        for the sections each file contains.
+    """
     try:
         import pandas as pd
     except ImportError as e:  # pragma: no cover
@@ -22,16 +98,90 @@ def csv_to_dataframe(filenames: Iterable[str | Path], sort: bool = False) -> pd.
             "csv_to_dataframe requires pandas. Install the optional dependencies with 'pip install pytimings[plot]'."
         ) from e
 
+    filenames = _expand_filenames(filenames, ".csv")
     if sort:
         filenames = sorted(filenames)
-    tbls = [pd.read_csv(fn, index_col=0, header=0, names=[fn]) for fn in filenames]
-    timings_cols = [s for s in tbls[0].T.columns if "pytimings::data" not in s]
-    dataframe = pd.concat(tbls, axis=1).T
-    if not all(dataframe["pytimings::data::_sections"] == dataframe["pytimings::data::_sections"].iloc[0]):
-        raise ValueError("input csv files do not all contain the same sections")
+    rows = _read_all_measures(filenames, workers, cache)
+    dataframe = pd.DataFrame.from_records(rows, index=filenames)
+    sections = dataframe["pytimings::data::_sections"]
+    if not all(sections == sections.iloc[0]):
+        if strict:
+            raise ValueError("input csv files do not all contain the same sections")
+        logger.info("input csv files contain differing sections, missing values are NaN")
     if not all(dataframe["pytimings::data::_version"] == dataframe["pytimings::data::_version"].iloc[0]):
         logger.warning("input csv files created from different pytimings versions")
-    for col in timings_cols:
-        dataframe[col] = pd.to_numeric(dataframe[col])
+    timings_cols = [s for s in dataframe.columns if "pytimings::data" not in s]
+    # a single vectorized conversion instead of one to_numeric call per column
+    dataframe[timings_cols] = dataframe[timings_cols].astype(float)
 
     return dataframe
+
+
+def file_sections(dataframe: pd.DataFrame) -> dict:
+    """map each file (the index) of a frame read by :py:func:`csv_to_dataframe` to the list of its sections"""
+    # kept in a column rather than in dataframe.attrs, which pandas deep-copies on every column access
+    return {
+        fn: value.split("||") if isinstance(value, str) and value else []
+        for fn, value in dataframe["pytimings::data::_sections"].items()
+    }
+
+
+def npz_to_dataframe(
+    filenames: str | Path | Iterable[str | Path], sort: bool = False, long: bool = False
+) -> pd.DataFrame:
+    """Batch-read ``.npz`` files written by :py:meth:`pytimings.timer.Timings.output_npz` into one frame
+
+    Like for :py:func:`csv_to_dataframe`, filenames may also be a directory or a glob pattern.
+
+    By default the frame has the same layout as :py:func:`csv_to_dataframe`, one row per file,
+    but with typed extra data. With ``long=True`` there is one row per file and section instead,
+    with ``file`` and ``section`` columns, one column per TimingDelta field and one per extra data key.
+    """
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "npz_to_dataframe requires pandas. Install the optional dependencies with 'pip install pytimings[plot]'."
+        ) from e
+    import json
+
+    from pytimings.timer import FIELD_SUFFIXES, TimingDelta
+
+    filenames = _expand_filenames(filenames, ".npz")
+    if sort:
+        filenames = sorted(filenames)
+    # collect plain python rows and build a single frame at the end instead of concatenating per file
+    rows: list[dict] = []
+    versions = set()
+    for fn in filenames:
+        with np.load(fn, allow_pickle=False) as archive:
+            sections = archive["sections"].tolist()
+            columns = {field: archive[field].tolist() for field in TimingDelta._fields if field in archive}
+            counts = archive["count"].tolist()
+            extra_data = json.loads(archive["extra_data"].item())
+            version = archive["version"].item()
+        versions.add(version)
+        extra = {f"pytimings::data::{key}": value for key, value in extra_data.items()}
+        if long:
+            for i, section in enumerate(sections):
+                row = {"file": str(fn), "section": section, "count": counts[i]}
+                row.update({field: values[i] for field, values in columns.items()})
+                row.update(extra_data)
+                rows.append(row)
+            continue
+        row = {}
+        for i, section in enumerate(sections):
+            for field, values in columns.items():
+                row[f"{section}_{FIELD_SUFFIXES[field]}"] = values[i]
+            if counts[i]:
+                row[f"{section}_count"] = counts[i]
+        row.update(extra)
+        row["pytimings::data::_sections"] = "||".join(sorted(sections))
+        row["pytimings::data::_version"] = version
+        rows.append(row)
+    if len(versions) > 1:
+        logger.warning("input npz files created from different pytimings versions")
+    if long:
+        return pd.DataFrame(rows)
+    return pd.DataFrame(rows, index=filenames)
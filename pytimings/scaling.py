@@ -0,0 +1,150 @@
+"""Run scaling studies and compute speedup, parallel efficiency and the Karp-Flatt metric per section.
+
+A study runs a callable for every combination of worker counts and problem sizes, each run recording
+into a :py:class:`pytimings.timer.Timings` object of its own with the parameters as extra data.
+Studies are kept in long format, one row per run and section with ``workers``, ``size``, ``repeat``,
+``section`` and one column per TimingDelta field. See :py:mod:`pytimings.plotting.scaling` for plots.
+"""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pytimings.timer import FIELD_SUFFIXES, TimingDelta, Timings, scoped_timing
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    import pandas as pd
+
+__all__ = ["TOTAL_SECTION", "load_study", "run_study", "scaling_metrics"]
+
+# section timing each whole call of the studied callable
+TOTAL_SECTION = "total"
+
+_PARAMETERS = ("workers", "size", "repeat")
+
+
+def _pandas() -> Any:
+    try:
+        import pandas as pd
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "pytimings.scaling requires pandas. Install the optional dependencies with 'pip install pytimings[plot]'."
+        ) from e
+    return pd
+
+
+def run_study(
+    function: Callable[..., Any],
+    workers: Iterable[int],
+    sizes: Iterable[Any] = (None,),
+    repeats: int = 1,
+    output_dir: str | Path | None = None,
+) -> pd.DataFrame:
+    """Call ``function(workers=..., size=..., timings=...)`` for every worker count and size, repeats times.
+
+    The callable is timed as a whole in the :py:data:`TOTAL_SECTION` section and may record sections of
+    its own into the timings it is passed, also from threads of its own. With output_dir, every run also
+    writes its csv output there, ``scaling_<number>.csv``, which :py:func:`load_study` reads back.
+    """
+    pd = _pandas()
+    # iterated once per size
+    workers, sizes = list(workers), list(sizes)
+    rows = []
+    index = 0
+    for size in sizes:
+        for worker_count in workers:
+            for repeat in range(repeats):
+                # the callable is likely to record from several threads
+                timings = Timings(concurrent=True)
+                timings.add_extra_data({"workers": worker_count, "size": size, "repeat": repeat})
+                with scoped_timing(TOTAL_SECTION, timings=timings):
+                    function(workers=worker_count, size=size, timings=timings)
+                if output_dir is not None:
+                    timings.output_files(output_dir=Path(output_dir), csv_base=f"scaling_{index:05}")
+                index += 1
+                for section, delta in timings.snapshot().deltas.items():
+                    rows.append(
+                        {"workers": worker_count, "size": size, "repeat": repeat, "section": section, **delta._asdict()}
+                    )
+    return pd.DataFrame(rows, columns=[*_PARAMETERS, "section", *TimingDelta._fields])
+
+
+def _parse_size(value: Any) -> Any:
+    if value is None or value == "" or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if not isinstance(value, str):
+        return value
+    for number in (int, float):
+        try:
+            return number(value)
+        except ValueError:
+            pass
+    return value
+
+
+def load_study(filenames: str | Path | Iterable[str | Path]) -> pd.DataFrame:
+    """Read the csv outputs of a study into the long format of :py:func:`run_study`
+
+    Runs without ``workers`` extra data are skipped, files written by :py:func:`run_study` have it.
+    The csv output stores sizes as text: they are read back as numbers where they parse as one, as strings
+    otherwise, and sizes of None (written as empty values) as None.
+    """
+    from pytimings.processing import csv_to_dataframe, file_sections
+
+    pd = _pandas()
+    dataframe = csv_to_dataframe(filenames, sort=True, strict=False)
+    # one pass over plain dicts, looking rows up with .loc per file is quadratic in the number of files
+    runs = dataframe.to_dict("index")
+    rows = []
+    for filename, sections in file_sections(dataframe).items():
+        run = runs[filename]
+        workers = run.get("pytimings::data::workers")
+        if workers is None or pd.isna(workers):
+            continue
+        size = _parse_size(run.get("pytimings::data::size"))
+        repeat = run.get("pytimings::data::repeat", 0)
+        for section in sections:
+            fields = {
+                field: run[f"{section}_{FIELD_SUFFIXES[field]}"]
+                for field in TimingDelta._fields
+                if f"{section}_{FIELD_SUFFIXES[field]}" in run
+            }
+            rows.append({"workers": int(workers), "size": size, "repeat": int(repeat), "section": section, **fields})
+    return pd.DataFrame(rows)
+
+
+def scaling_metrics(study: pd.DataFrame, field: str = "wall", weak: bool = False) -> pd.DataFrame:
+    """Mean time per section and worker count with speedup, parallel efficiency and Karp-Flatt metric.
+
+    All metrics are relative to the smallest worker count p0 of each section (and size), counting p0
+    workers as one unit: with p0 = 2, a run with 4 workers taking half the time has speedup 2 and efficiency 1.
+
+    Strong scaling (the default) compares runs of the same size: speedup S = T(p0) / T(p) and
+    efficiency E = S p0 / p. Weak scaling (weak=True) expects the problem size to grow with the worker
+    count and compares all sizes of a section: efficiency E = T(p0) / T(p) and the scaled speedup
+    S = E p / p0. The Karp-Flatt metric, the experimentally determined serial fraction
+    e = (1/S - 1/n) / (1 - 1/n) with n = p / p0, is undefined (NaN) at p0.
+    """
+    keys = ["section", "workers"] if weak else ["size", "section", "workers"]
+    # studies without sizes have None there, which groupby would drop by default
+    grouped = study.groupby(keys, sort=True, dropna=False)[field]
+    metrics = grouped.agg(["mean", "std", "count"]).reset_index()
+    metrics = metrics.rename(columns={"mean": field, "std": f"{field}_std", "count": "runs"})
+    # sorted by worker count, so the first row of each group is the baseline
+    first = metrics.groupby(keys[:-1], sort=False, dropna=False)[["workers", field]].transform("first")
+    relative_workers = metrics["workers"] / first["workers"]
+    if weak:
+        efficiency = first[field] / metrics[field]
+        speedup = efficiency * relative_workers
+    else:
+        speedup = first[field] / metrics[field]
+        efficiency = speedup / relative_workers
+    metrics["speedup"] = speedup
+    metrics["efficiency"] = efficiency
+    serial = (1 / speedup - 1 / relative_workers) / (1 - 1 / relative_workers)
+    metrics["karp_flatt"] = serial.where(relative_workers != 1)
+    return metrics
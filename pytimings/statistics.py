@@ -0,0 +1,230 @@
+"""Streaming per-call statistics for timing sections."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any
+
+__all__ = ["QuantileSketch", "SectionHistory", "SectionStatistics"]
+
+
+class QuantileSketch:
+    """Log-bucketed histogram answering quantile queries with bounded relative error.
+
+    Values are assigned to buckets whose bounds grow geometrically by ``gamma = (1 + a) / (1 - a)``
+    for a ``relative_accuracy`` of ``a`` (the DDSketch scheme), so every quantile estimate is within
+    ``a`` of the true value. Adding a value is O(1), memory is capped at ``max_buckets`` buckets by
+    merging the lowest ones, which only degrades accuracy for the smallest quantiles.
+    """
+
+    __slots__ = ("_buckets", "_gamma", "_log_gamma", "_zero_count", "count", "max_buckets", "relative_accuracy")
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            # negative durations only stem from clock jitter, count them as zero
+            self._zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        buckets = self._buckets
+        buckets[key] = buckets.get(key, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def __getstate__(self) -> dict:
+        # explicit state keeps the slotted object picklable with protocols 0 and 1
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state: dict) -> None:
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def _collapse(self) -> None:
+        lowest, second = sorted(self._buckets)[:2]
+        self._buckets[second] += self._buckets.pop(lowest)
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other._gamma != self._gamma:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for key, count in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+        while len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> float:
+        """estimate the q-quantile, q in [0, 1]; NaN for an empty sketch"""
+        if not 0 <= q <= 1:
+            raise ValueError(f"quantile must be in [0, 1], got {q}")
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                # midpoint of the bucket (gamma^(key-1), gamma^key] in terms of relative error
+                return 2 * self._gamma**key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+
+class SectionStatistics:
+    """Call count, min/max and Welford running mean/variance of a section's walltime, plus percentiles."""
+
+    __slots__ = ("_m2", "count", "max", "mean", "min", "sketch")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch()
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        # comparisons are cheaper than calls of min() and max() on this hot path
+        if value < self.min:  # noqa: PLR1730
+            self.min = value
+        if value > self.max:  # noqa: PLR1730
+            self.max = value
+        self.sketch.add(value)
+
+    __getstate__ = QuantileSketch.__getstate__
+    __setstate__ = QuantileSketch.__setstate__
+
+    def merge(self, other: SectionStatistics) -> None:
+        """combine with statistics recorded elsewhere, using Chan et al.'s parallel update"""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def copy(self) -> SectionStatistics:
+        duplicate = SectionStatistics()
+        duplicate.merge(self)
+        return duplicate
+
+    @property
+    def variance(self) -> float:
+        """unbiased sample variance, NaN for less than two calls"""
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def percentile(self, p: float) -> float:
+        """estimated p-th percentile, p in [0, 100]"""
+        return self.sketch.quantile(p / 100)
+
+
+class SectionHistory:
+    """Ring buffer of a section's last `size` per-call measurements, oldest ones are overwritten.
+
+    Every column is preallocated on creation, so recording a call allocates nothing. Rows hold the
+    (``perf_counter``) time the call finished followed by its delta fields.
+    """
+
+    __slots__ = ("_columns", "_next", "_value_columns", "columns", "count", "size")
+
+    def __init__(self, size: int, fields: tuple[str, ...] = ("wall", "sys", "user", "thread")) -> None:
+        if size < 1:
+            raise ValueError(f"history size must be positive, got {size}")
+        self.size = size
+        self.columns = ("time", *fields)
+        self._columns = tuple(array("d", bytes(8 * size)) for _ in self.columns)
+        self._value_columns = self._columns[1:]
+        self._next = 0
+        # calls recorded in total, including those already overwritten
+        self.count = 0
+
+    def add(self, time: float, values: tuple[float, ...]) -> None:
+        index = self._next
+        self._columns[0][index] = time
+        for column, value in zip(self._value_columns, values, strict=True):
+            column[index] = value
+        self._next = index + 1 if index + 1 < self.size else 0
+        self.count += 1
+
+    __getstate__ = QuantileSketch.__getstate__
+    __setstate__ = QuantileSketch.__setstate__
+
+    def __len__(self) -> int:
+        return min(self.count, self.size)
+
+    def _ordered(self, column: array) -> array:
+        """a copy of column with the stored rows in recording order"""
+        if self.count <= self.size:
+            return column[: self.count]
+        return column[self._next :] + column[: self._next]
+
+    def values(self, column: str = "wall") -> list[float]:
+        """the stored values of one column, oldest first"""
+        return self._ordered(self._columns[self.columns.index(column)]).tolist()
+
+    def _rows(self) -> list[tuple[float, ...]]:
+        return list(zip(*(self._ordered(column) for column in self._columns), strict=True))
+
+    def merge(self, other: SectionHistory) -> None:
+        """interleave another history of the same section by time, keeping the latest `size` rows"""
+        rows = sorted([*self._rows(), *other._rows()])[-self.size :]
+        for index, row in enumerate(rows):
+            for column, value in zip(self._columns, row, strict=True):
+                column[index] = value
+        self._next = len(rows) % self.size
+        self.count += other.count
+
+    def copy(self) -> SectionHistory:
+        duplicate = SectionHistory(self.size, self.columns[1:])
+        duplicate.merge(self)
+        return duplicate
+
+    def to_numpy(self, column: str | None = None) -> Any:
+        """one column as a 1-d array or, by default, all columns as a 2-d array with a row per call, oldest first"""
+        try:
+            import numpy as np
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                "SectionHistory.to_numpy requires numpy. Install the optional dependencies with 'pip install pytimings[plot]'."
+            ) from e
+        if column is not None:
+            return np.frombuffer(self._ordered(self._columns[self.columns.index(column)]), dtype=np.float64)
+        return np.column_stack([np.frombuffer(self._ordered(values), dtype=np.float64) for values in self._columns])
+
+    def to_dataframe(self) -> Any:
+        """the stored rows as a DataFrame indexed by call number, counting from the first call ever recorded"""
+        try:
+            import pandas as pd
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                "SectionHistory.to_dataframe requires pandas. Install the optional dependencies with 'pip install pytimings[plot]'."
+            ) from e
+        first = self.count - len(self)
+        return pd.DataFrame(
+            self.to_numpy(), columns=list(self.columns), index=pd.RangeIndex(first, self.count, name="call")
+        )
@@ -0,0 +1,238 @@
+"""Compact storage for the accumulated deltas of very many sections.
+
+Section names (or call tree paths) are interned to dense integer ids once, the deltas themselves live
+field by field in contiguous ``array('d')`` columns indexed by that id. Compared to a dict of
+:py:class:`pytimings.timer.TimingDelta` tuples this saves the per-section tuple and its float objects,
+see ``scripts/benchmark_memory.py``. The columns of the resource fields are only allocated once a delta
+with resource usage is stored, so sections timed without the ``resources`` backend don't pay for them.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Hashable, Iterator, MutableMapping
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pytimings.timer import TimingDelta
+
+__all__ = ["DeltaColumns", "PathColumns", "SectionIds"]
+
+
+class SectionIds:
+    """Bidirectional mapping of keys to dense integer ids, which are never reused or released."""
+
+    __slots__ = ("_ids", "_keys")
+
+    def __init__(self) -> None:
+        self._ids: dict[Hashable, int] = {}
+        self._keys: list = []
+
+    def intern(self, key: Hashable) -> int:
+        """the id of key, assigning the next free one on first use"""
+        section_id = self._ids.get(key)
+        if section_id is not None:
+            return section_id
+        if isinstance(key, str):
+            # dynamically built names are often equal but distinct objects, keep a single copy
+            key = sys.intern(key)
+        section_id = self._ids[key] = len(self._keys)
+        self._keys.append(key)
+        return section_id
+
+    def get(self, key: Hashable) -> int | None:
+        return self._ids.get(key)
+
+    def key(self, section_id: int) -> Hashable:
+        return self._keys[section_id]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ids
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._keys)
+
+    def __getstate__(self) -> dict:
+        # explicit state keeps the slotted object picklable with protocols 0 and 1
+        return {"_keys": self._keys}
+
+    def __setstate__(self, state: dict) -> None:
+        self._keys = state["_keys"]
+        self._ids = {key: section_id for section_id, key in enumerate(self._keys)}
+
+
+class DeltaColumns(MutableMapping[Hashable, tuple]):
+    """Mapping of keys to :py:class:`pytimings.timer.TimingDelta` stored column-wise by interned id.
+
+    Reading an item builds a new tuple from the columns. Deleting an item only marks its id as unused,
+    setting the key again reuses the id. Several mappings may share one :py:class:`SectionIds`.
+    Until the first delta with a non-zero resource field arrives only the time fields have columns.
+    """
+
+    __slots__ = ("_columns", "_count", "_delta_type", "_ids", "_max_columns", "_present")
+
+    def __init__(self, ids: SectionIds | None = None) -> None:
+        # imported here since pytimings.timer builds its storage from this module
+        from pytimings.timer import RESOURCE_FIELDS, TimingDelta
+
+        self._delta_type = TimingDelta
+        self._ids: SectionIds = SectionIds() if ids is None else ids
+        # the resource fields come last, their columns are appended by _add_resource_columns
+        self._columns = [array("d") for _ in TimingDelta._fields[: -len(RESOURCE_FIELDS)]]
+        self._max_columns: tuple[int, ...] = ()
+        # one byte per id, non-zero where a delta is stored; like the columns it may be longer than needed
+        self._present = bytearray()
+        self._count = 0
+
+    @property
+    def ids(self) -> SectionIds:
+        return self._ids
+
+    def column(self, field: str) -> array:
+        """a copy of the column of a TimingDelta field, indexed by id; ids without a delta hold zeros"""
+        index = self._delta_type._fields.index(field)
+        if index >= len(self._columns):
+            return array("d", bytes(8 * len(self._ids)))
+        return self._columns[index][: len(self._ids)]
+
+    def _add_resource_columns(self) -> None:
+        from pytimings.timer import MAX_FIELDS
+
+        fields = self._delta_type._fields
+        size = len(self._present)
+        self._columns.extend(array("d", bytes(8 * size)) for _ in fields[len(self._columns) :])
+        self._max_columns = tuple(fields.index(field) for field in MAX_FIELDS)
+
+    def _grow(self, size: int) -> None:
+        # grow geometrically, appending to all columns for every new id would dominate the recording cost
+        missing = max(size, 2 * len(self._present), 16) - len(self._present)
+        if missing > 0:
+            zeros = array("d", bytes(8 * missing))
+            for column in self._columns:
+                column.extend(zeros)
+            self._present.extend(bytes(missing))
+
+    def __getitem__(self, key: Hashable) -> TimingDelta:
+        delta = self.get(key)
+        if delta is None:
+            raise KeyError(key)
+        return delta
+
+    def get(self, key: Hashable, default: TimingDelta | None = None) -> TimingDelta | None:  # type: ignore[override]
+        # implemented directly instead of through __getitem__, a miss is the common case on first commit
+        section_id = self._ids.get(key)
+        if section_id is None or section_id >= len(self._present) or not self._present[section_id]:
+            return default
+        return self._delta_type(*[column[section_id] for column in self._columns])
+
+    def __setitem__(self, key: Hashable, delta: tuple) -> None:
+        section_id = self._ids.intern(key)
+        if section_id >= len(self._present):
+            self._grow(section_id + 1)
+        if len(self._columns) < len(delta) and any(delta[len(self._columns) :]):
+            self._add_resource_columns()
+        # without resource columns the delta's resource fields are all zero and left out
+        for column, value in zip(self._columns, delta, strict=False):
+            column[section_id] = value
+        if not self._present[section_id]:
+            self._present[section_id] = 1
+            self._count += 1
+
+    def add(self, key: Hashable, delta: tuple) -> TimingDelta:
+        """accumulate delta into the value of key in place, a missing key counts as zero; returns the new total"""
+        return self.add_id(self._ids.intern(key), delta)
+
+    def add_id(self, section_id: int, delta: tuple) -> TimingDelta:
+        """:py:meth:`add` for a key already interned to section_id"""
+        if section_id >= len(self._present):
+            self._grow(section_id + 1)
+        if not self._present[section_id]:
+            self._present[section_id] = 1
+            self._count += 1
+        columns = self._columns
+        if len(columns) < len(delta) and any(delta[len(columns) :]):
+            self._add_resource_columns()
+        totals = []
+        # without resource columns the delta's resource fields are all zero and left out
+        for column, value in zip(columns, delta, strict=False):
+            column[section_id] = total = column[section_id] + value
+            totals.append(total)
+        for index in self._max_columns:
+            value = delta[index]
+            if value:
+                # the values are whole numbers of bytes, subtracting recovers the previous one exactly
+                columns[index][section_id] = totals[index] = max(totals[index] - value, value)
+        return self._delta_type(*totals)
+
+    def __delitem__(self, key: Hashable) -> None:
+        section_id = self._ids.get(key)
+        if section_id is None or section_id >= len(self._present) or not self._present[section_id]:
+            raise KeyError(key)
+        for column in self._columns:
+            column[section_id] = 0.0
+        self._present[section_id] = 0
+        self._count -= 1
+
+    def clear(self) -> None:
+        # the inherited clear pops items one by one, rescanning from the first id every time
+        for column in self._columns:
+            column[:] = array("d", bytes(8 * len(column)))
+        self._present[:] = bytes(len(self._present))
+        self._count = 0
+
+    def __iter__(self) -> Iterator[Hashable]:
+        present, key = self._present, self._ids.key
+        return (key(section_id) for section_id in range(len(present)) if present[section_id])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: object) -> bool:
+        section_id = self._ids.get(key)  # type: ignore[arg-type]
+        return section_id is not None and section_id < len(self._present) and bool(self._present[section_id])
+
+    def __getstate__(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state: dict) -> None:
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class PathColumns(DeltaColumns):
+    """:py:class:`DeltaColumns` for call tree paths, tuples of section names.
+
+    A single element path shares the id of its section name, so sharing the :py:class:`SectionIds` of the
+    section totals adds no ids at all for sections that are never nested.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def _key(path: Hashable) -> Hashable:
+        return path[0] if isinstance(path, tuple) and len(path) == 1 else path
+
+    def get(self, key: Hashable, default: TimingDelta | None = None) -> TimingDelta | None:  # type: ignore[override]
+        return super().get(self._key(key), default)
+
+    def __setitem__(self, key: Hashable, delta: tuple) -> None:
+        super().__setitem__(self._key(key), delta)
+
+    def add(self, key: Hashable, delta: tuple) -> TimingDelta:
+        return super().add(self._key(key), delta)
+
+    def __delitem__(self, key: Hashable) -> None:
+        super().__delitem__(self._key(key))
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(self._key(key))  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (key if isinstance(key, tuple) else (key,) for key in super().__iter__())
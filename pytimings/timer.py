@@ -4,59 +4,126 @@ from __future__ import annotations
 
 import csv
 import functools
+import inspect
 import logging
+import operator
+import os
+import random
 import shutil
 import sys
+import threading
 import time
 from collections import defaultdict
-from collections.abc import Callable, Iterator
-from contextlib import contextmanager
+from collections.abc import Callable, Iterator, MutableMapping
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import timedelta
 from io import StringIO
 from pathlib import Path
-from typing import NamedTuple
+from typing import Any, NamedTuple, Protocol, cast
 
 import psutil
 
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
 import pytimings
+from pytimings.statistics import SectionHistory, SectionStatistics
+from pytimings.storage import DeltaColumns, PathColumns, SectionIds
 from pytimings.tools import ensure_directory_exists
 
 logger = logging.getLogger(__name__)
 
 PERF_COUNTER_FUNCTION = time.perf_counter_ns
-THREAD_TIME_FUNCTION = time.time_ns
+THREAD_TIME_FUNCTION = time.thread_time_ns
 TO_SECONDS_FACTOR = 1e-9
 
 THREAD_TIME = "thread"
 WALL_TIME = "wall"
 SYS_TIME = "sys"
 USER_TIME = "user"
+RSS = "rss"
+PEAK_RSS = "peak_rss"
+PAGE_FAULTS = "page_faults"
+CONTEXT_SWITCHES = "context_switches"
+IO_BYTES = "io_bytes"
+
+# TimingDelta fields only recorded by the resources backend, see ResourceBackend
+RESOURCE_FIELDS = (RSS, PEAK_RSS, PAGE_FAULTS, CONTEXT_SWITCHES, IO_BYTES)
+# TimingDelta fields holding a high-water mark, they accumulate by maximum instead of sum
+MAX_FIELDS = (PEAK_RSS,)
+
+# row name suffixes of the TimingDelta fields in csv output
+FIELD_SUFFIXES = {"wall": "wall", "sys": "sys", "user": "usr", "thread": "thread"} | {
+    field: field for field in RESOURCE_FIELDS
+}
 
 
 class TimingDelta(NamedTuple):
-    """Elapsed wall/system/user time for a section, all in seconds."""
+    """Elapsed wall/system/user time and CPU time of the recording thread for a section, all in seconds.
+
+    The resource fields stay zero unless the section was timed with the ``resources`` backend: change of
+    resident set size and the process' peak resident set size when the section stopped (both in bytes),
+    the number of page faults and context switches and the bytes of I/O during the section.
+    """
 
     wall: float
     sys: float
     user: float
+    thread: float = 0.0
+    rss: float = 0.0
+    peak_rss: float = 0.0
+    page_faults: float = 0.0
+    context_switches: float = 0.0
+    io_bytes: float = 0.0
 
 
 __all__ = [
+    "CONTEXT_SWITCHES",
+    "FIELD_SUFFIXES",
+    "IO_BYTES",
+    "MAX_FIELDS",
+    "PAGE_FAULTS",
+    "PEAK_RSS",
+    "RESOURCE_FIELDS",
+    "RSS",
     "SYS_TIME",
     "THREAD_TIME",
     "USER_TIME",
     "WALL_TIME",
+    "CummulativeScopedTiming",
+    "FastBackend",
     "NoTimerError",
+    "PsutilBackend",
+    "ResourceBackend",
+    "ScopedTiming",
+    "SectionHandle",
+    "SectionNode",
+    "TimingBackend",
     "TimingData",
     "TimingDelta",
     "Timings",
+    "TimingsSnapshot",
     "cummulative_scoped_timing",
     "function_timer",
+    "get_backend",
     "global_timings",
+    "is_enabled",
     "scoped_timing",
+    "set_default_backend",
+    "set_enabled",
 ]
 
 
+# (recording Timings, section name, call tree path) of the async sections running in the current task,
+# outermost first, see pytimings.aio
+_async_sections: ContextVar[tuple[tuple[Timings, str, tuple[str, ...]], ...]] = ContextVar(
+    "pytimings_async_sections", default=()
+)
+
+
 class NoTimerError(Exception):
     def __init__(self, section: str, timings: Timings | None = None, is_unstopped: bool = False) -> None:
         self.section = section
@@ -65,20 +132,41 @@ class NoTimerError(Exception):
         if is_unstopped:
             super().__init__(f"trying to access timer for section '{section}' that has not been stopped yet")
         else:
-            avail = "Available sections: " + ",".join(self.timings._known_timers_map)
+            known = dict.fromkeys([*self.timings._commited_deltas, *self.timings._known_timers_map])
+            avail = "Available sections: " + ",".join(known)
             super().__init__(f"trying to access timer for unknown section '{section}'\n{avail}")
 
 
-class TimingData:
-    def __init__(self, name: str) -> None:
-        self.name = name
-        self._end_resources = None
-        self._end_times: dict[str, float] | None = None
-        self._process = psutil.Process()
-        self._start_times = self._get()
+class TimingBackend(Protocol):
+    """Source of the raw clock readings a :py:class:`TimingData` is built from."""
 
-    def _get(self) -> dict[str, float]:
-        ps_times = self._process.cpu_times()
+    name: str
+
+    def sample(self) -> dict[str, float]: ...
+
+
+class PsutilBackend:
+    """Reads process CPU times through psutil.
+
+    The ``psutil.Process`` handle is created once per process id and reused for all samples.
+    """
+
+    name = "psutil"
+
+    def __init__(self) -> None:
+        self._process: psutil.Process | None = None
+        self._pid: int | None = None
+
+    def _get_process(self) -> psutil.Process:
+        pid = os.getpid()
+        # re-create the handle after a fork so children do not report their parent's times
+        if self._process is None or self._pid != pid:
+            self._process = psutil.Process(pid)
+            self._pid = pid
+        return self._process
+
+    def sample(self) -> dict[str, float]:
+        ps_times = self._get_process().cpu_times()
         return {
             USER_TIME: ps_times.user,
             SYS_TIME: ps_times.system,
@@ -86,86 +174,768 @@ class TimingData:
             THREAD_TIME: THREAD_TIME_FUNCTION(),
         }
 
+    def __getstate__(self) -> dict:
+        # process handles are bound to the current process and must not travel with pickles
+        return {"_process": None, "_pid": None}
+
+
+class FastBackend:
+    """Reads only cheap clocks: ``perf_counter_ns`` for wall time and ``os.times`` for CPU times."""
+
+    name = "fast"
+
+    def sample(self) -> dict[str, float]:
+        cpu_times = os.times()
+        return {
+            USER_TIME: cpu_times.user,
+            SYS_TIME: cpu_times.system,
+            WALL_TIME: PERF_COUNTER_FUNCTION(),
+            THREAD_TIME: THREAD_TIME_FUNCTION(),
+        }
+
+
+class ResourceBackend(PsutilBackend):
+    """:py:class:`PsutilBackend` that additionally samples memory and kernel resource usage of the process.
+
+    Fills the resource fields of :py:class:`TimingDelta`. Every sample costs a few more system calls than
+    the CPU times alone, so it has to be selected explicitly, ``Timings(backend="resources")`` or
+    ``set_default_backend("resources")``. I/O bytes count all data passed through read/write calls where
+    the platform reports it (Linux), storage I/O otherwise, and stay zero where neither is available (macOS).
+    """
+
+    name = "resources"
+
+    def sample(self) -> dict[str, float]:
+        process = self._get_process()
+        if resource is not None:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            # ru_maxrss is in kilobytes everywhere but on macOS
+            peak_rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+            page_faults = usage.ru_minflt + usage.ru_majflt
+            context_switches = usage.ru_nvcsw + usage.ru_nivcsw
+        else:  # pragma: no cover
+            memory = process.memory_info()
+            peak_rss = getattr(memory, "peak_wset", memory.rss)
+            page_faults = getattr(memory, "num_page_faults", 0)
+            context_switches = sum(process.num_ctx_switches())
+        try:
+            io = process.io_counters()
+            io_bytes = getattr(io, "read_chars", io.read_bytes) + getattr(io, "write_chars", io.write_bytes)
+        except (AttributeError, psutil.Error):
+            io_bytes = 0
+        samples = super().sample()
+        samples.update(
+            {
+                RSS: process.memory_info().rss,
+                PEAK_RSS: peak_rss,
+                PAGE_FAULTS: page_faults,
+                CONTEXT_SWITCHES: context_switches,
+                IO_BYTES: io_bytes,
+            }
+        )
+        return samples
+
+
+_BACKENDS: dict[str, TimingBackend] = {
+    PsutilBackend.name: PsutilBackend(),
+    FastBackend.name: FastBackend(),
+    ResourceBackend.name: ResourceBackend(),
+}
+
+
+def _enabled_from_environment() -> bool:
+    return os.environ.get("PYTIMINGS_DISABLE", "").strip().lower() in {"", "0", "false", "no", "off"}
+
+
+class _Settings:
+    """Process-wide defaults, mutated through the module level setter functions"""
+
+    backend: TimingBackend = _BACKENDS[PsutilBackend.name]
+    enabled: bool = _enabled_from_environment()
+
+
+_settings = _Settings()
+
+
+def get_backend(backend: str | TimingBackend | None = None) -> TimingBackend:
+    """Resolve a backend name (or pass through a backend object), ``None`` yields the global default"""
+    if backend is None:
+        return _settings.backend
+    if isinstance(backend, str):
+        try:
+            return _BACKENDS[backend]
+        except KeyError:
+            raise ValueError(f"unknown timing backend '{backend}', choose one of {sorted(_BACKENDS)}") from None
+    return backend
+
+
+def set_default_backend(backend: str | TimingBackend) -> None:
+    """Select the backend used by all :py:class:`Timings` objects that were not given an explicit one"""
+    _settings.backend = get_backend(backend)
+
+
+def is_enabled() -> bool:
+    """False if instrumentation was switched off, by :py:func:`set_enabled` or the ``PYTIMINGS_DISABLE`` env var"""
+    return _settings.enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    """Switch the scope and decorator instrumentation on or off for the whole process.
+
+    While disabled, :py:func:`function_timer` returns the decorated function unchanged and
+    :py:func:`scoped_timing`/:py:func:`cummulative_scoped_timing` return a shared no-op scope,
+    so instrumented code runs at (almost) uninstrumented speed. Decoration happens once, functions
+    decorated while disabled stay uninstrumented after re-enabling and vice versa. Explicit
+    :py:meth:`Timings.start`/:py:meth:`Timings.stop` calls are not affected.
+    Setting ``PYTIMINGS_DISABLE`` to anything but an empty string, ``0``, ``false``, ``no`` or ``off``
+    disables instrumentation from the start.
+    """
+    _settings.enabled = enabled
+
+
+class TimingData:
+    def __init__(
+        self, name: str, backend: TimingBackend | None = None, path: tuple[str, ...] = (), weight: float = 1.0
+    ) -> None:
+        self.name = name
+        self.path = path or (name,)
+        self.weight = weight
+        self._backend = backend or _settings.backend
+        self._end_times: dict[str, float] | None = None
+        self._start_times = self._get()
+
+    def _get(self) -> dict[str, float]:
+        return self._backend.sample()
+
     def stop(self) -> None:
         self._end_times = self._get()
 
     def delta(self) -> TimingDelta:
-        delta_times = self._end_times or self._get()
+        return _delta_between(self._start_times, self._end_times or self._get())
+
 
-        wall = (delta_times[WALL_TIME] - self._start_times[WALL_TIME]) * TO_SECONDS_FACTOR
-        # kernel resource usage already is in seconds
+def _delta_between(start_times: dict[str, float], end_times: dict[str, float]) -> TimingDelta:
+    """the delta between two backend samples"""
+    wall = (end_times[WALL_TIME] - start_times[WALL_TIME]) * TO_SECONDS_FACTOR
+    thread = (end_times[THREAD_TIME] - start_times[THREAD_TIME]) * TO_SECONDS_FACTOR
+    # kernel resource usage already is in seconds
+    if RSS not in start_times:
         return TimingDelta(
             wall,
-            delta_times[SYS_TIME] - self._start_times[SYS_TIME],
-            delta_times[USER_TIME] - self._start_times[USER_TIME],
+            end_times[SYS_TIME] - start_times[SYS_TIME],
+            end_times[USER_TIME] - start_times[USER_TIME],
+            thread,
         )
+    return TimingDelta(
+        wall,
+        end_times[SYS_TIME] - start_times[SYS_TIME],
+        end_times[USER_TIME] - start_times[USER_TIME],
+        thread,
+        end_times[RSS] - start_times[RSS],
+        end_times[PEAK_RSS],
+        end_times[PAGE_FAULTS] - start_times[PAGE_FAULTS],
+        end_times[CONTEXT_SWITCHES] - start_times[CONTEXT_SWITCHES],
+        end_times[IO_BYTES] - start_times[IO_BYTES],
+    )
+
+
+def _accumulate(previous: TimingDelta, delta: TimingDelta) -> TimingDelta:
+    total = TimingDelta._make(map(operator.add, previous, delta))
+    if previous.peak_rss and delta.peak_rss:
+        total = total._replace(peak_rss=max(previous.peak_rss, delta.peak_rss))
+    return total
+
+
+def _scaled(delta: TimingDelta, weight: float) -> TimingDelta:
+    """delta extrapolated to weight calls, high-water marks are kept as they are"""
+    return TimingDelta._make(value * weight for value in delta)._replace(peak_rss=delta.peak_rss)
+
+
+def _add_to(deltas: MutableMapping, key: Any, delta: TimingDelta) -> TimingDelta:
+    """accumulate delta into deltas[key], returns the new total"""
+    if isinstance(deltas, DeltaColumns):
+        return deltas.add(key, delta)
+    previous = deltas.get(key)
+    total = deltas[key] = delta if previous is None else _accumulate(previous, delta)
+    return total
+
+
+def _check_sample(sample: int | float) -> None:
+    """raise a ValueError unless sample is an integer >= 1 or a probability in (0, 1]"""
+    # bool is an int, but sample=True most likely meant something else than measuring every call
+    if isinstance(sample, bool) or not (
+        (isinstance(sample, int) and sample >= 1) or (isinstance(sample, float) and 0 < sample <= 1)
+    ):
+        raise ValueError(f"sample must be an integer >= 1 or a probability in (0, 1], got {sample!r}")
+
+
+_BYTE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB")
+_KIBI = 1024
+
+
+def _format_bytes(value: float) -> str:
+    unit = 0
+    while abs(value) >= _KIBI and unit < len(_BYTE_UNITS) - 1:
+        value /= _KIBI
+        unit += 1
+    return f"{value:.0f} B" if unit == 0 else f"{value:.1f} {_BYTE_UNITS[unit]}"
+
+
+# console table columns of the statistics, the short table only shows the first three
+_STATISTICS_COLUMNS = ("Calls", "Mean (s)", "P99 (s)", "Std (s)", "Min (s)", "P50 (s)", "Max (s)")
+_SHORT_STATISTICS = 3
+
+
+def _statistics_cells(stats: SectionStatistics | None, calls: int | None, columns: int) -> list[str]:
+    """console table cells of a section's statistics, calls overrides the count of sampled sections"""
+    if stats is None:
+        return [""] * columns
+    values = (stats.mean, stats.percentile(99), stats.std, stats.min, stats.percentile(50), stats.max)
+    return [str(stats.count if calls is None else calls)] + [f"{value:.3g}" for value in values[: columns - 1]]
+
+
+def _resource_cells(delta: TimingDelta) -> list[str]:
+    """console table cells of the resource fields"""
+    return [
+        _format_bytes(delta.rss),
+        _format_bytes(delta.peak_rss),
+        f"{delta.page_faults:.0f}",
+        f"{delta.context_switches:.0f}",
+        _format_bytes(delta.io_bytes),
+    ]
+
+
+@dataclass
+class SectionNode:
+    """One node of the section call tree, as returned by :py:meth:`Timings.tree`.
+
+    `inclusive` covers everything recorded while the section ran, `exclusive` subtracts the time
+    spent in child sections (clamped at zero per field to absorb coarse CPU clock resolution).
+    """
+
+    name: str
+    path: tuple[str, ...]
+    inclusive: TimingDelta
+    children: dict[str, SectionNode] = field(default_factory=dict)
+
+    @property
+    def exclusive(self) -> TimingDelta:
+        nested = [child.inclusive for child in self.children.values()]
+        exclusive = []
+        for name, total, *values in zip(TimingDelta._fields, self.inclusive, *nested, strict=True):
+            if name in MAX_FIELDS:
+                exclusive.append(total)
+            elif name in RESOURCE_FIELDS:
+                # memory may be released, unlike time these can legitimately be negative
+                exclusive.append(total - sum(values))
+            else:
+                exclusive.append(max(0.0, total - sum(values)))
+        return TimingDelta._make(exclusive)
+
+    def walk(self) -> Iterator[SectionNode]:
+        """yield this node and all its descendants, depth first"""
+        yield self
+        for child in self.children.values():
+            yield from child.walk()
+
+
+class TimingsSnapshot(NamedTuple):
+    """Recorded data of a :py:class:`Timings` object without any live timer state, see :py:meth:`Timings.snapshot`"""
+
+    deltas: dict[str, TimingDelta]
+    tree: dict[tuple[str, ...], TimingDelta]
+    statistics: dict[str, SectionStatistics]
+    # number of calls seen by sections recorded with sampling, their deltas are estimates
+    sampled_calls: dict[str, int]
+    histories: dict[str, SectionHistory]
 
 
 def _default_timer_dict_entry() -> tuple[bool, TimingData | None]:
     return (False, None)
 
 
+STORAGES = ("dict", "columns")
+
+
 class Timings:
-    def __init__(self) -> None:
-        self._commited_deltas: dict[str, TimingDelta] = {}
+    def __init__(
+        self,
+        backend: str | TimingBackend | None = None,
+        concurrent: bool = False,
+        statistics: bool = True,
+        storage: str = "dict",
+        history: int = 0,
+    ) -> None:
+        """backend: a backend name ("psutil" or "fast") or object, defaults to the global default backend
+        concurrent: record into one buffer per thread, merged lazily whenever results are read
+        statistics: keep per-call walltime statistics (count, min/max, mean/variance, percentiles)
+        storage: "dict" keeps a tuple per section, "columns" stores the deltas in contiguous arrays
+            indexed by section id (see :py:mod:`pytimings.storage`). For 1e5 sections recorded with
+            ``statistics=False`` that takes about 275 instead of 425 bytes per section, at the price of
+            slower recording of sections seen for the first time. Dict tuples always carry the resource
+            fields, columns only once a section was timed with the ``resources`` backend
+        history: keep the last `history` per-call measurements of every section, see :py:meth:`history`
+        """
+        if storage not in STORAGES:
+            raise ValueError(f"unknown storage '{storage}', choose one of {list(STORAGES)}")
+        self._backend = None if backend is None else get_backend(backend)
+        self._record_statistics = statistics
+        self._storage = storage
+        self._section_ids = SectionIds()
+        self._statistics: dict[str, SectionStatistics] = {}
+        self._history_size = history
+        self._histories: dict[str, SectionHistory] = {}
+        self._listeners: list[Callable[[str, TimingDelta, tuple[str, ...], float], None]] = []
+        self._sampled_calls: dict[str, int] = {}
+        self._commited_deltas: MutableMapping[str, TimingDelta] = self._new_deltas()
+        # running sections only, a stopped section's TimingData is released and only its total is kept
         self._known_timers_map: dict[str, tuple[bool, TimingData | None]] = defaultdict(_default_timer_dict_entry)
         self.extra_data: dict = dict()
+        # call tree paths of the running sections, innermost last
+        self._stack: list[tuple[str, ...]] = []
+        self._tree_deltas: MutableMapping[tuple[str, ...], TimingDelta] = self._new_deltas(tree=True)
+        self._handles: dict[str, SectionHandle] = {}
+        # held while the records are changed or copied, so snapshots may be taken from other threads
+        self._records_lock = threading.Lock()
+        self._concurrent = concurrent
+        self._thread_timings: list[Timings] = []
+        self._thread_local: threading.local | None = None
+        self._thread_timings_lock: threading.Lock | None = None
+        if concurrent:
+            self._thread_local = threading.local()
+            self._thread_timings_lock = threading.Lock()
         self.reset()
 
-    def start(self, section_name: str) -> None:
-        """set this to begin a named section"""
-        if section_name in self._known_timers_map:
-            running, _data = self._known_timers_map[section_name]
+    def __getstate__(self) -> dict:
+        self._merge_threads()
+        state = self.__dict__.copy()
+        # thread buffers are folded into the merged deltas, locks, thread locals, listeners and handles stay behind
+        state.update(
+            _thread_timings=[],
+            _thread_local=None,
+            _thread_timings_lock=None,
+            _records_lock=None,
+            _listeners=[],
+            _handles={},
+        )
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        # objects pickled by older versions lack attributes added since, take those from a fresh instance
+        self.__dict__.update(Timings().__dict__)
+        self.__dict__.update(state)
+        self._records_lock = threading.Lock()
+        # older versions kept the timers of stopped sections
+        self._known_timers_map = defaultdict(
+            _default_timer_dict_entry, {section: entry for section, entry in self._known_timers_map.items() if entry[0]}
+        )
+        # protocol 0 pickles rebuild tuples without field defaults, pad deltas that predate newer fields
+        if isinstance(self._commited_deltas, dict):
+            self._commited_deltas = {section: TimingDelta(*delta) for section, delta in self._commited_deltas.items()}
+        if self._concurrent:
+            self._thread_local = threading.local()
+            self._thread_timings_lock = threading.Lock()
+            # keep the unpickled totals as a buffer of their own, no thread records into it
+            restored = Timings(backend=self._backend, storage=self._storage)
+            restored._commited_deltas.update(self._commited_deltas)
+            self._thread_timings = [restored]
+
+    def _new_deltas(self, tree: bool = False) -> MutableMapping:
+        """an empty mapping of section names (or tree paths) to deltas in this object's storage format"""
+        if self._storage == "dict":
+            return {}
+        return PathColumns(self._section_ids) if tree else DeltaColumns(self._section_ids)
+
+    def section(self, section_name: str) -> SectionHandle:
+        """get the handle of a section, for timing it in hot loops without name lookups
+
+        Repeated calls return the same handle. Results stay available under the section's name.
+        The lookups are only saved with ``storage="columns"``, see :py:class:`SectionHandle`.
+        """
+        try:
+            return self._handles[section_name]
+        except KeyError:
+            handle = self._handles[section_name] = SectionHandle(self, section_name)
+            return handle
+
+    def section_id(self, section_name: str) -> int:
+        """the interned integer id of a section name, assigned on first use and stable for this object"""
+        return self._section_ids.intern(section_name)
+
+    def section_name(self, section_id: int) -> str:
+        """the section name an id was assigned to by :py:meth:`section_id`"""
+        return cast(str, self._section_ids.key(section_id))
+
+    def _local(self) -> Timings:
+        """the calling thread's private buffer in concurrent mode, created on first use"""
+        assert self._thread_local is not None and self._thread_timings_lock is not None
+        try:
+            return self._thread_local.timings
+        except AttributeError:
+            local = Timings(
+                backend=self._backend,
+                statistics=self._record_statistics,
+                storage=self._storage,
+                history=self._history_size,
+            )
+            local._listeners = self._listeners
+            # the lock is only taken once per thread, recording itself never contends
+            with self._thread_timings_lock:
+                self._thread_timings.append(local)
+            self._thread_local.timings = local
+            return local
+
+    def _buffer(self) -> Timings:
+        """the object the calling thread records into"""
+        return self._local() if self._concurrent else self
+
+    def _merged_buffers(self, running: bool = False) -> Timings:
+        """a new object holding the records and running timers of all per-thread buffers
+
+        Merging aside and leaving this object untouched keeps threads reading at the same time, e.g. an
+        exporter, from interleaving their merges. With running, the records include the running time of
+        each buffer's timers, see :py:meth:`_snapshot`.
+        """
+        assert self._thread_timings_lock is not None
+        with self._thread_timings_lock:
+            buffers = list(self._thread_timings)
+        merged = Timings(
+            backend=self._backend,
+            statistics=self._record_statistics,
+            storage=self._storage,
+            history=self._history_size,
+        )
+        merged._section_ids = self._section_ids
+        merged._commited_deltas = self._new_deltas()
+        merged._tree_deltas = self._new_deltas(tree=True)
+        for buffer in buffers:
+            merged._absorb(buffer._snapshot(running))
+            merged._known_timers_map.update(list(buffer._known_timers_map.items()))
+        return merged
+
+    def _merge_threads(self) -> None:
+        """fold all per-thread buffers into this object's deltas, a no-op outside concurrent mode"""
+        if not self._concurrent:
+            return
+        merged = self._merged_buffers()
+        self._commited_deltas = merged._commited_deltas
+        self._tree_deltas = merged._tree_deltas
+        self._statistics = merged._statistics
+        self._sampled_calls = merged._sampled_calls
+        self._histories = merged._histories
+        self._known_timers_map = merged._known_timers_map
+
+    def _snapshot(self, running: bool = False) -> TimingsSnapshot:
+        """copy of this object's own records, consistent even while another thread records into it
+
+        running: add the running time of the timers to their totals. Stops end and commit their run while
+        holding the same lock, so every run is counted exactly once and totals never decrease between snapshots.
+        """
+        with self._records_lock:
+            view = TimingsSnapshot(
+                dict(self._commited_deltas),
+                dict(self._tree_deltas),
+                {section: stats.copy() for section, stats in self._statistics.items()},
+                dict(self._sampled_calls),
+                {section: history.copy() for section, history in self._histories.items()},
+            )
             if running:
-                logger.info("timer for section '%s' is already running, ignoring start()", section_name)
-                return
-        self._known_timers_map[section_name] = (True, TimingData(section_name))
+                deltas = view.deltas
+                for section, elapsed in self._running_deltas():
+                    previous = deltas.get(section)
+                    deltas[section] = elapsed if previous is None else _accumulate(previous, elapsed)
+        return view
+
+    def _absorb(self, snapshot: TimingsSnapshot, prefix: str = "") -> None:
+        """add all recorded deltas of snapshot to ours, prefixing its section names"""
+        with self._records_lock:
+            for name, delta in snapshot.deltas.items():
+                _add_to(self._commited_deltas, prefix + name, delta)
+            for other_path, delta in snapshot.tree.items():
+                path = (prefix + other_path[0], *other_path[1:]) if prefix else other_path
+                _add_to(self._tree_deltas, path, delta)
+            for name, stats in snapshot.statistics.items():
+                section = prefix + name
+                if section in self._statistics:
+                    self._statistics[section].merge(stats)
+                else:
+                    self._statistics[section] = stats.copy()
+            for name, calls in snapshot.sampled_calls.items():
+                section = prefix + name
+                self._sampled_calls[section] = self._sampled_calls.get(section, 0) + calls
+            for name, history in snapshot.histories.items():
+                section = prefix + name
+                if section in self._histories:
+                    self._histories[section].merge(history)
+                else:
+                    self._histories[section] = history.copy()
+
+    def snapshot(self, running: bool = False) -> TimingsSnapshot:
+        """get a compact, picklable copy of everything recorded so far
+
+        Running timers are never stopped. With running, the time they have been running for so far is
+        included in their section's totals, not in the call tree or statistics. The thread CPU time of
+        running timers is left out, the clocks of other threads cannot be read.
+        May be called from another thread than the recording one(s), e.g. for exporting the timings of
+        a long running process. Every commit waits for a copy in progress, so take snapshots sparingly.
+        """
+        if self._concurrent:
+            return self._merged_buffers(running)._snapshot()
+        return self._snapshot(running)
+
+    def _running_deltas(self) -> Iterator[tuple[str, TimingDelta]]:
+        """the deltas of all running timers and section handles up to now"""
+        for section, (running, data) in list(self._known_timers_map.items()):
+            if running and data is not None:
+                elapsed = data.delta()._replace(thread=0.0)
+                yield section, elapsed if data.weight == 1.0 else _scaled(elapsed, data.weight)
+        backend = self._backend or _settings.backend
+        for handle in list(self._handles.values()):
+            start_times = handle._start_times
+            if start_times is not None:
+                yield handle.name, _delta_between(start_times, backend.sample())._replace(thread=0.0)
+
+    def merge(self, other: Timings | TimingsSnapshot, prefix: str = "") -> None:
+        """add the records of another Timings object or a snapshot of one to this object
+
+        Sections present in both are summed up. A prefix, e.g. ``"worker_1."``, keeps the merged
+        sections apart as a per-source breakdown instead.
+        In concurrent mode the data lands in the calling thread's buffer.
+        """
+        if isinstance(other, Timings):
+            other = other.snapshot()
+        self._buffer()._absorb(other, prefix)
+
+    def start(self, section_name: str, *, weight: float = 1.0) -> None:
+        """set this to begin a named section
+
+        weight: the number of calls this measurement stands for, its delta is scaled accordingly on stop.
+            Used for sampling, see :py:func:`scoped_timing`.
+        """
+        if self._concurrent:
+            self._local().start(section_name, weight=weight)
+            return
+        if section_name in self._known_timers_map:
+            logger.info("timer for section '%s' is already running, ignoring start()", section_name)
+            return
+        path = self._child_path(section_name)
+        data = TimingData(section_name, self._backend, path, weight)
+        self._stack.append(path)
+        self._known_timers_map[section_name] = (True, data)
 
     def stop(self, section_name: str | None = None) -> TimingDelta | None:
-        """stop named section's counter or all of them if section_name is None"""
+        """stop named section's counter or all of them if section_name is None
+
+        In concurrent mode only the calling thread's timers are affected.
+        """
+        if self._concurrent:
+            return self._local().stop(section_name)
         if section_name is None:
-            for section in self._known_timers_map:
+            for section in list(self._known_timers_map):
                 self.stop(section)
+            for handle in list(self._handles.values()):
+                if handle.running:
+                    handle.stop()
             return None
         if section_name not in self._known_timers_map:
-            raise NoTimerError(section_name, self)
-        self._known_timers_map[section_name] = (
-            False,
-            self._known_timers_map[section_name][1],
-        )  # mark as not running
-        timing = self._known_timers_map[section_name][1]
-        assert timing is not None  # a known section always has an associated TimingData
-        timing.stop()
-        delta = timing.delta()
-        if section_name not in self._commited_deltas:
-            self._commited_deltas[section_name] = delta
+            total = self._commited_deltas.get(section_name)
+            if total is None:
+                raise NoTimerError(section_name, self)
+            logger.info("timer for section '%s' is not running, ignoring stop()", section_name)
+            return total
+        # a snapshot taking running time into account sees the timer either running or committed, never neither
+        with self._records_lock:
+            timing = self._known_timers_map.pop(section_name)[1]
+            assert timing is not None  # a running section always has an associated TimingData
+            timing.stop()
+            measured = timing.delta()
+            path = getattr(timing, "path", (section_name,))
+            weight = getattr(timing, "weight", 1.0)
+            total = self._record(section_name, measured, path, weight)
+        self._pop_stack(section_name)
+        for listener in self._listeners:
+            listener(section_name, measured, path, weight)
+        return total
+
+    def _child_path(self, section_name: str) -> tuple[str, ...]:
+        """the call tree path of a section started now, below the innermost running section
+
+        That is the innermost section of this object's stack or the innermost async section of the
+        current task, whichever started last.
+        """
+        stack = self._stack
+        # extending the parent's own path keeps out of order stops from leaving parentless nodes behind
+        parent = stack[-1] if stack else ()
+        for timings, _, path in reversed(_async_sections.get()):
+            if timings is self:
+                # sync sections started within the async one extend its path, others started before it
+                if parent[: len(path)] != path:
+                    parent = path
+                break
+        return (*parent, section_name)
+
+    def _pop_stack(self, section_name: str) -> None:
+        stack = self._stack
+        if stack and stack[-1][-1] == section_name:
+            stack.pop()
+            return
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index][-1] == section_name:
+                # stopped out of order, the sections started after it keep their recorded parents
+                del stack[index]
+                return
+
+    def _commit(
+        self,
+        section_name: str,
+        measured: TimingDelta,
+        path: tuple[str, ...],
+        weight: float = 1.0,
+        section_id: int | None = None,
+    ) -> TimingDelta:
+        """add one finished measurement to the section's total and its node in the call tree
+
+        Totals receive the measurement scaled by weight, statistics the unscaled per-call values.
+        section_id: the section's interned id, with columnar storage the delta is added at that slot directly
+        """
+        with self._records_lock:
+            total = self._record(section_name, measured, path, weight, section_id)
+        for listener in self._listeners:
+            listener(section_name, measured, path, weight)
+        return total
+
+    def _record(
+        self,
+        section_name: str,
+        measured: TimingDelta,
+        path: tuple[str, ...],
+        weight: float = 1.0,
+        section_id: int | None = None,
+    ) -> TimingDelta:
+        """the part of :py:meth:`_commit` that changes the records, the caller holds the records lock"""
+        delta = measured if weight == 1.0 else _scaled(measured, weight)
+        deltas, tree = self._commited_deltas, self._tree_deltas
+        if section_id is not None and isinstance(deltas, DeltaColumns) and isinstance(tree, PathColumns):
+            total = deltas.add_id(section_id, delta)
+            if len(path) == 1:
+                # a flat path shares the slot of its section
+                tree.add_id(section_id, delta)
+            else:
+                tree.add(path, delta)
         else:
-            previous_delta = self._commited_deltas[section_name]
-            new_delta = TimingDelta(*(a + b for a, b in zip(delta, previous_delta, strict=True)))
-            self._commited_deltas[section_name] = new_delta
-        return self._commited_deltas[section_name]
+            total = _add_to(deltas, section_name, delta)
+            _add_to(tree, path, delta)
+        if self._record_statistics:
+            try:
+                self._statistics[section_name].add(measured.wall)
+            except KeyError:
+                stats = self._statistics[section_name] = SectionStatistics()
+                stats.add(measured.wall)
+        if self._history_size:
+            try:
+                history = self._histories[section_name]
+            except KeyError:
+                history = self._histories[section_name] = SectionHistory(self._history_size, TimingDelta._fields)
+            history.add(PERF_COUNTER_FUNCTION() * TO_SECONDS_FACTOR, measured)
+        return total
+
+    def add_listener(self, listener: Callable[[str, TimingDelta, tuple[str, ...], float], None]) -> None:
+        """call listener(section_name, delta, path, weight) for every measurement committed from now on
+
+        delta is the single measurement, weight the number of calls it stands for, 1 unless the
+        section is sampled (see :py:func:`scoped_timing`), so the section's total grew by delta * weight.
+
+        Listeners run synchronously on the recording thread, so they should return quickly.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, TimingDelta, tuple[str, ...], float], None]) -> None:
+        self._listeners.remove(listener)
 
     def reset(self, section_name: str | None = None) -> None:
-        """set elapsed time back to 0 for a given section or all of them if section_name is None"""
+        """set elapsed time back to 0 for a given section or all of them if section_name is None
+
+        In concurrent mode this resets all threads' buffers, so it must not race with running timers.
+        """
+        if self._concurrent:
+            assert self._thread_timings_lock is not None
+            with self._thread_timings_lock:
+                buffers = list(self._thread_timings)
+            for buffer in buffers:
+                buffer.reset(section_name)
+            self._merge_threads()
+            return
         if section_name is None:
-            for section in self._known_timers_map:
-                self.reset(section)
+            self.stop()
+            zero = TimingDelta(0, 0, 0)
+            with self._records_lock:
+                for section in list(self._commited_deltas):
+                    self._commited_deltas[section] = zero
+                self._tree_deltas.clear()
+                self._statistics.clear()
+                self._sampled_calls.clear()
+                self._histories.clear()
             return
-        try:
+        if section_name in self._known_timers_map:
             self.stop(section_name)
-        except NoTimerError:
-            pass  # not stopping no timer is not an error
-        self._commited_deltas[section_name] = TimingDelta(0, 0, 0)
+        handle = self._handles.get(section_name)
+        if handle is not None and handle.running:
+            handle.stop()
+        with self._records_lock:
+            self._commited_deltas[section_name] = TimingDelta(0, 0, 0)
+            for path in [path for path in self._tree_deltas if path[-1] == section_name]:
+                del self._tree_deltas[path]
+            self._statistics.pop(section_name, None)
+            self._sampled_calls.pop(section_name, None)
+            self._histories.pop(section_name, None)
+
+    def _clear(self) -> None:
+        """stop and forget all sections, unlike reset() which keeps them with zero totals"""
+        if self._concurrent:
+            assert self._thread_timings_lock is not None
+            with self._thread_timings_lock:
+                buffers = list(self._thread_timings)
+            for buffer in buffers:
+                buffer._clear()
+            self._merge_threads()
+            return
+        self.reset()
+        with self._records_lock:
+            self._commited_deltas.clear()
+
+    def _sampling_weight(self, section_name: str, sample: int | float) -> float:
+        """count a call of a sampled section, return the weight to measure it with or 0 to skip it
+
+        An integer `sample` measures the first of every `sample` calls, which then stands for `sample` calls.
+        A float in (0, 1] measures calls at random with that probability, each standing for 1 / sample calls.
+        """
+        calls = self._sampled_calls.get(section_name, 0)
+        self._sampled_calls[section_name] = calls + 1
+        # checked by _check_sample when the scope was created
+        if isinstance(sample, float):
+            return 1.0 / sample if random.random() < sample else 0.0
+        return float(sample) if calls % sample == 0 else 0.0
+
+    def is_estimated(self, section_name: str) -> bool:
+        """whether the section was recorded with sampling, so its totals are extrapolated estimates"""
+        self._merge_threads()
+        return section_name in self._sampled_calls
 
     def walltime(self, section_name: str) -> float:
         """get runtime of section in seconds"""
         return self.delta(section_name)[0]
 
     def add_walltime(self, section_name: str, time: float) -> None:
-        self._commited_deltas[section_name] = TimingDelta(time, 0, 0)
+        if self._concurrent:
+            self._local().add_walltime(section_name, time)
+            return
+        with self._records_lock:
+            self._commited_deltas[section_name] = TimingDelta(time, 0, 0)
+            self._tree_deltas[(section_name,)] = TimingDelta(time, 0, 0)
 
     def delta(self, section_name: str) -> TimingDelta:
         """get the full delta tuple"""
+        self._merge_threads()
         try:
             return self._commited_deltas[section_name]
         except KeyError:
@@ -173,8 +943,56 @@ class Timings:
             is_unstopped = section_name in self._known_timers_map
             raise NoTimerError(section_name, self, is_unstopped=is_unstopped) from None
 
-    def output_files(self, output_dir: str | Path, csv_base: str) -> Path:
-        """output all recorded measures to a csv file"""
+    def statistics(self, section_name: str) -> SectionStatistics:
+        """get the per-call walltime statistics of a section"""
+        self._merge_threads()
+        try:
+            return self._statistics[section_name]
+        except KeyError:
+            is_unstopped = section_name in self._known_timers_map
+            raise NoTimerError(section_name, self, is_unstopped=is_unstopped) from None
+
+    def history(self, section_name: str) -> SectionHistory:
+        """get the section's most recent per-call measurements, requires a Timings object created with `history`"""
+        if not self._history_size:
+            raise ValueError("no history is recorded, create the Timings object with history=<number of calls>")
+        self._merge_threads()
+        try:
+            return self._histories[section_name]
+        except KeyError:
+            is_unstopped = section_name in self._known_timers_map
+            raise NoTimerError(section_name, self, is_unstopped=is_unstopped) from None
+
+    def tree(self) -> SectionNode:
+        """get the call tree of all recorded sections below an unnamed, zero-time root node"""
+        self._merge_threads()
+        root = SectionNode("", (), TimingDelta(0, 0, 0))
+        for path, delta in sorted(self._tree_deltas.items()):
+            node = root
+            for depth, name in enumerate(path, start=1):
+                if name not in node.children:
+                    # parents that have not finished yet still get a (zero) node
+                    node.children[name] = SectionNode(name, path[:depth], TimingDelta(0, 0, 0))
+                node = node.children[name]
+            node.inclusive = delta
+        for top_level in root.children.values():
+            root.inclusive = _accumulate(root.inclusive, top_level.inclusive)
+        return root
+
+    def _is_nested(self) -> bool:
+        return any(len(path) > 1 for path in self._tree_deltas)
+
+    def output_files(self, output_dir: str | Path, csv_base: str, comm=None) -> Path | None:
+        """output all recorded measures to a csv file
+
+        comm: an MPI communicator, if given every rank writes its own csv and rank 0 additionally
+        writes a min/max/mean summary, see :py:func:`pytimings.mpi.output_files`.
+        Returns None on ranks other than 0.
+        """
+        if comm is not None:
+            from pytimings.mpi import output_files
+
+            return output_files(self, output_dir, csv_base, comm)
         output_dir = Path(output_dir)
         ensure_directory_exists(output_dir)
         outfile = output_dir / f"{csv_base}.csv"
@@ -182,10 +1000,56 @@ class Timings:
             self.output_all_measures(out)
         return outfile
 
-    def output_console(self) -> None:
-        """output the recorded walltime per section to the console"""
+    def output_npz(self, output_dir: str | Path, base: str) -> Path:
+        """output all recorded totals to a typed, columnar NumPy ``.npz`` archive
+
+        The archive holds a ``sections`` string column, one float64 column per TimingDelta field,
+        an int64 ``count`` column (0 where no statistics were recorded) and the extra data as a
+        JSON encoded ``extra_data`` entry, so value types survive the round trip.
+        See :py:func:`pytimings.processing.npz_to_dataframe` for loading many of them at once.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                "output_npz requires numpy. Install the optional dependencies with 'pip install pytimings[plot]'."
+            ) from e
+        import json
+
+        self._merge_threads()
+        output_dir = Path(output_dir)
+        ensure_directory_exists(output_dir)
+        outfile = output_dir / f"{base}.npz"
+        sections = list(self._commited_deltas)
+        deltas = list(self._commited_deltas.values())
+        counts = [self._statistics[s].count if s in self._statistics else 0 for s in sections]
+        arrays: dict[str, Any] = {
+            field: np.array([getattr(delta, field) for delta in deltas], dtype=np.float64)
+            for field in TimingDelta._fields
+        }
+        arrays.update(
+            sections=np.array(sections, dtype=np.str_),
+            count=np.array(counts, dtype=np.int64),
+            extra_data=np.array(json.dumps(self.extra_data, default=str)),
+            version=np.array(pytimings.__version__),
+        )
+        np.savez(outfile, **arrays)
+        return outfile
+
+    def _recorded_resources(self) -> bool:
+        """whether any section was timed with the resources backend, their fields are only output then"""
+        resources = operator.attrgetter(*RESOURCE_FIELDS)
+        return any(any(resources(delta)) for delta in self._commited_deltas.values())
+
+    def output_console(self, all_statistics: bool = False) -> None:
+        """output the recorded walltime per section to the console
+
+        Of the statistics, only calls, mean and 99th percentile are shown unless all_statistics is set,
+        which adds standard deviation, minimum, median and maximum.
+        """
         from rich import box, console, table
 
+        self._merge_threads()
         csl = console.Console()
         tbl = table.Table(show_header=True, header_style="bold blue", box=box.SIMPLE_HEAVY)
         tbl.add_column("Extra")
@@ -196,21 +1060,56 @@ class Timings:
             csl.print(tbl)
 
         tbl = table.Table(show_header=True, header_style="bold magenta", box=box.SIMPLE_HEAVY)
-        tbl.add_column("Section")
+        # the other columns are squeezed first on narrow terminals
+        tbl.add_column("Section", no_wrap=True)
         tbl.add_column(
             "Walltime (HH:MM:SS)",
             justify="right",
+            no_wrap=True,
         )
+        with_statistics = bool(self._statistics)
+        with_resources = self._recorded_resources()
+        statistics_columns = _STATISTICS_COLUMNS if all_statistics else _STATISTICS_COLUMNS[:_SHORT_STATISTICS]
+        resource_columns = ("RSS change", "Peak RSS", "Page faults", "Ctx switches", "I/O")
+        columns = (statistics_columns if with_statistics else ()) + (resource_columns if with_resources else ())
+        for column in columns:
+            tbl.add_column(column, justify="right")
         for section, delta in self._commited_deltas.items():
-            tbl.add_row(section, str(timedelta(seconds=delta[0])))
+            calls = self._sampled_calls.get(section)
+            if calls is None:
+                row = [section, str(timedelta(seconds=delta[0]))]
+            else:
+                # sampled sections only hold extrapolated totals
+                row = [f"{section} (estimated)", f"~{timedelta(seconds=delta[0])}"]
+            if with_statistics:
+                row += _statistics_cells(self._statistics.get(section), calls, len(statistics_columns))
+            if with_resources:
+                row += _resource_cells(delta)
+            tbl.add_row(*row)
         if len(self._commited_deltas):
             csl.print(tbl)
         else:
             csl.print("No timings were recorded")
 
+        if self._is_nested():
+            from rich.tree import Tree
+
+            def _add_children(branch: Tree, node: SectionNode) -> None:
+                for child in node.children.values():
+                    label = (
+                        f"{child.name} [magenta]{timedelta(seconds=child.inclusive.wall)}[/magenta]"
+                        f" (self {timedelta(seconds=child.exclusive.wall)})"
+                    )
+                    _add_children(branch.add(label), child)
+
+            call_tree = Tree("[bold magenta]Call tree[/bold magenta] (inclusive walltime, self walltime)")
+            _add_children(call_tree, self.tree())
+            csl.print(call_tree)
+
     def output_all_measures(self, out=None) -> None:
         """output all recorded measures"""
         out = out or sys.stdout
+        self._merge_threads()
         stash = StringIO()
         csv_file = csv.writer(stash, lineterminator="\n")
         # header
@@ -219,15 +1118,56 @@ class Timings:
         # threadManager().max_threads()
         csv_file.writerow(["threads", 1])
 
+        with_resources = self._recorded_resources()
         for section, delta in self._commited_deltas.items():
             csv_file.writerows(
                 [
-                    [f"{section}_usr", delta.user],
-                    [f"{section}_wall", delta.wall],
-                    [f"{section}_sys", delta.sys],
+                    [f"{section}_{FIELD_SUFFIXES['user']}", delta.user],
+                    [f"{section}_{FIELD_SUFFIXES['wall']}", delta.wall],
+                    [f"{section}_{FIELD_SUFFIXES['sys']}", delta.sys],
+                    [f"{section}_{FIELD_SUFFIXES['thread']}", delta.thread],
                 ]
             )
+            if with_resources:
+                csv_file.writerows(
+                    [f"{section}_{FIELD_SUFFIXES[field]}", getattr(delta, field)] for field in RESOURCE_FIELDS
+                )
+            stats = self._statistics.get(section)
+            if stats is not None:
+                csv_file.writerows(
+                    [
+                        [f"{section}_count", stats.count],
+                        [f"{section}_min", stats.min],
+                        [f"{section}_max", stats.max],
+                        [f"{section}_mean", stats.mean],
+                        [f"{section}_var", stats.variance],
+                        [f"{section}_p50", stats.percentile(50)],
+                        [f"{section}_p90", stats.percentile(90)],
+                        [f"{section}_p99", stats.percentile(99)],
+                    ]
+                )
+            calls = self._sampled_calls.get(section)
+            if calls is not None:
+                # the totals above are extrapolated from `_count` measured out of `_calls` calls
+                csv_file.writerow([f"{section}_calls", calls])
+        if self._is_nested():
+            # flattened call tree, paths are joined with '/'
+            for node in self.tree().walk():
+                if not node.path:
+                    continue
+                path = "/".join(node.path)
+                for kind, delta in (("incl", node.inclusive), ("excl", node.exclusive)):
+                    csv_file.writerows(
+                        [
+                            [f"{path}_{kind}_usr", delta.user],
+                            [f"{path}_{kind}_wall", delta.wall],
+                            [f"{path}_{kind}_sys", delta.sys],
+                            [f"{path}_{kind}_thread", delta.thread],
+                        ]
+                    )
         csv_file.writerows([[f"pytimings::data::{k}", v] for k, v in self.extra_data.items()])
+        if self._sampled_calls:
+            csv_file.writerow(["pytimings::data::_estimated", "||".join(sorted(self._sampled_calls))])
         csv_file.writerow(
             [
                 "pytimings::data::_sections",
@@ -246,74 +1186,274 @@ class Timings:
         self.extra_data.update(data)
 
 
+class SectionHandle:
+    """Direct start/stop access to one section of a :py:class:`Timings` object, see :py:meth:`Timings.section`.
+
+    The handle keeps its own start sample instead of a timer in the section map and, with columnar storage,
+    adds its deltas straight at the section's slot. It also works as a context manager. Like named sections,
+    a handle that is already running ignores ``start()``. Its running state is independent of
+    ``Timings.start(name)``, so do not mix both for the same section. ``Timings.stop()`` and ``Timings.reset()``
+    stop running handles like named sections. In concurrent mode the handle falls back to the named timers of the
+    calling thread.
+
+    With the default dict storage, committing a measurement still looks the section up by name, which leaves
+    the handle only about 10% faster than ``Timings.start``/``stop``. Most of the gain needs ``storage="columns"``.
+    """
+
+    __slots__ = ("_path", "_start_times", "_timings", "name", "section_id")
+
+    def __init__(self, timings: Timings, section_name: str) -> None:
+        self._timings = timings
+        self.name = section_name
+        self.section_id = timings.section_id(section_name)
+        self._start_times: dict[str, float] | None = None
+        self._path: tuple[str, ...] = (section_name,)
+
+    @property
+    def running(self) -> bool:
+        return self._start_times is not None
+
+    def start(self) -> None:
+        timings = self._timings
+        if timings._concurrent:
+            timings.start(self.name)
+            return
+        if self._start_times is not None:
+            logger.info("timer for section '%s' is already running, ignoring start()", self.name)
+            return
+        self._path = timings._child_path(self.name)
+        timings._stack.append(self._path)
+        # sample last, so the bookkeeping above is not part of the measurement
+        self._start_times = (timings._backend or _settings.backend).sample()
+
+    def stop(self) -> TimingDelta | None:
+        """stop the section and return its total, the same as :py:meth:`Timings.stop`"""
+        timings = self._timings
+        if timings._concurrent:
+            return timings.stop(self.name)
+        start_times = self._start_times
+        if start_times is None:
+            logger.info("timer for section '%s' is not running, ignoring stop()", self.name)
+            return timings._commited_deltas.get(self.name)
+        # like Timings.stop, end and commit the run atomically for snapshots that include running time
+        with timings._records_lock:
+            end_times = (timings._backend or _settings.backend).sample()
+            self._start_times = None
+            measured = _delta_between(start_times, end_times)
+            total = timings._record(self.name, measured, self._path, 1.0, self.section_id)
+        timings._pop_stack(self.name)
+        for listener in timings._listeners:
+            listener(self.name, measured, self._path, 1.0)
+        return total
+
+    def __enter__(self) -> SectionHandle:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
 global_timings = Timings()
 
 
-@contextmanager
+class _DisabledScope:
+    """No-op stand-in for the scopes while instrumentation is disabled, reentrant and free of state.
+
+    Works as a (async) context manager and, like the scopes, as a decorator, returning functions unchanged.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    def __call__(self, function: Callable) -> Callable:
+        return function
+
+
+# handed out by the scope functions while instrumentation is disabled
+_DISABLED_SCOPE = _DisabledScope()
+
+
+class ScopedTiming:
+    """Reusable context manager and decorator timing each entry into a section, see :py:func:`scoped_timing`.
+
+    An instance can be entered again after exiting it, and with ``Timings(concurrent=True)`` from several
+    threads at once. Functions decorated with an instance may recurse and run in several threads at once,
+    since every call keeps its own state.
+    """
+
+    __slots__ = ("_skipped", "format", "log_function", "sample", "section_name", "timings")
+
+    # whether the log message reports the section's total instead of the current entry's walltime
+    _cummulative = False
+
+    def __init__(
+        self,
+        section_name: str,
+        log_function: Callable[[str], None] | None = None,
+        timings: Timings | None = None,
+        format: str = "",
+        sample: int | float | None = None,
+    ) -> None:
+        if sample is not None:
+            _check_sample(sample)
+        self.section_name = section_name
+        self.log_function = log_function
+        self.timings = timings or global_timings
+        self.format = format
+        self.sample = sample
+        # per thread, whether sampling skipped each of the currently open entries, innermost last
+        self._skipped = threading.local() if sample is not None else None
+
+    def _start(self) -> bool:
+        """start the timer unless sampling skips this entry, returns whether it was started"""
+        weight = 1.0
+        if self.sample is not None:
+            weight = self.timings._buffer()._sampling_weight(self.section_name, self.sample)
+            if not weight:
+                return False
+        self.timings.start(self.section_name, weight=weight)
+        return True
+
+    def _stop(self) -> None:
+        timings, section_name, log_function = self.timings, self.section_name, self.log_function
+        if not log_function:
+            timings.stop(section_name)
+            return
+        previous_wall = 0.0
+        if not self._cummulative:
+            # read from the recording buffer directly, this must neither merge nor raise
+            previous = timings._buffer()._commited_deltas.get(section_name)
+            previous_wall = previous.wall if previous is not None else 0.0
+        delta = timings.stop(section_name)
+        assert delta is not None  # stop() returns the committed delta for a named section
+        if self._cummulative:
+            log_function(f"Executing {section_name} cummulatively took {delta.wall:^{self.format}}s")
+        else:
+            log_function(f"Executing {section_name} took {delta.wall - previous_wall:^{self.format}}s")
+
+    def __enter__(self) -> None:
+        if self._skipped is None:
+            # without sampling every entry starts the timer, no state to keep
+            self._start()
+            return
+        try:
+            entries = self._skipped.entries
+        except AttributeError:
+            entries = self._skipped.entries = []
+        entries.append(not self._start())
+
+    def __exit__(self, *exc_info) -> None:
+        if self._skipped is None:
+            self._stop()
+        elif not self._skipped.entries.pop():
+            self._stop()
+
+    def __call__(self, function: Callable) -> Callable:
+        """decorate function to time each of its calls, returns it unchanged while instrumentation is disabled"""
+        if not _settings.enabled:
+            return function
+        if inspect.iscoroutinefunction(function):
+            from pytimings.aio import AsyncScopedTiming, _timed_coroutine_function
+
+            timing = functools.partial(
+                AsyncScopedTiming, self.section_name, self.log_function, self.timings, self.format, self.sample
+            )
+            return _timed_coroutine_function(function, timing)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not self._start():
+                return function(*args, **kwargs)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._stop()
+
+        return wrapper
+
+
+class CummulativeScopedTiming(ScopedTiming):
+    """:py:class:`ScopedTiming` logging the section's cummulated walltime, see :py:func:`cummulative_scoped_timing`"""
+
+    __slots__ = ()
+
+    _cummulative = True
+
+    def __init__(
+        self,
+        section_name: str,
+        log_function: Callable[[str], None] | None = None,
+        timings: Timings | None = None,
+        format: str = "",
+    ) -> None:
+        super().__init__(section_name, log_function, timings, format)
+
+
 def scoped_timing(
     section_name: str,
     log_function: Callable[[str], None] | None = None,
     timings: Timings | None = None,
     format: str = "",
-) -> Iterator[None]:
+    sample: int | float | None = None,
+) -> ScopedTiming | _DisabledScope:
     """Start timer on entering block scope, stop it (and optionally output) on exiting.
 
     The printout will only show walltime for the current scope.
     See :py:func:`pytimings.timer.cummulative_scoped_timing` for a version with cummulative output.
+    Returns a no-op scope while instrumentation is disabled, see :py:func:`set_enabled`.
+
+    sample: only measure some entries for very hot sections, every `sample`-th one for an integer or
+        entries chosen at random with probability `sample` for a float. The section's totals are then
+        extrapolated to all entries and marked as estimates in the outputs.
     """
-    timings = timings or global_timings
-    timings.start(section_name)
-    try:
-        yield
-    finally:
-        try:
-            previous_wall = timings.walltime(section_name)
-        except NoTimerError:
-            previous_wall = 0
-        delta = timings.stop(section_name)
-        assert delta is not None  # stop() returns the committed delta for a named section
-        if log_function:
-            log_function(f"Executing {section_name} took {delta.wall - previous_wall:^{format}}s")
+    if not _settings.enabled:
+        return _DISABLED_SCOPE
+    return ScopedTiming(section_name, log_function, timings, format, sample)
 
 
-@contextmanager
 def cummulative_scoped_timing(
     section_name: str,
     log_function: Callable[[str], None] | None = None,
     timings: Timings | None = None,
     format: str = "",
-) -> Iterator[None]:
+) -> ScopedTiming | _DisabledScope:
     """Start timer on entering block scope, stop it (and optionally output) on exiting.
 
     The printout will show the cummulated walltime for all scopes with this section name.
     See :py:func:`pytimings.timer.scoped_timing` for a version with non-cummulative output.
+    Returns a no-op scope while instrumentation is disabled, see :py:func:`set_enabled`.
     """
-    timings = timings or global_timings
-    timings.start(section_name)
-    try:
-        yield
-    finally:
-        delta = timings.stop(section_name)
-        assert delta is not None  # stop() returns the committed delta for a named section
-        if log_function:
-            log_function(f"Executing {section_name} cummulatively took {delta.wall:^{format}}s")
+    if not _settings.enabled:
+        return _DISABLED_SCOPE
+    return CummulativeScopedTiming(section_name, log_function, timings, format)
 
 
 def function_timer(
     section_name: str | None = None,
     log_function: Callable[[str], None] | None = None,
     timings: Timings | None = None,
+    sample: int | float | None = None,
 ) -> Callable:
-    def decorator(function: Callable) -> Callable:
-        @functools.wraps(function)
-        def wrapper(*args, **kwargs):
-            with scoped_timing(
-                section_name=section_name or function.__qualname__,
-                log_function=log_function,
-                timings=timings,
-            ):
-                return function(*args, **kwargs)
+    """Time every call of the decorated function, coroutine functions are timed until they complete
 
-        return wrapper
+    sample: only measure some calls, see :py:func:`scoped_timing`
+    See :py:func:`pytimings.aio.async_function_timer` for coroutine specific options.
+    While instrumentation is disabled (see :py:func:`set_enabled`) the function is returned unchanged.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        return ScopedTiming(section_name or function.__qualname__, log_function, timings, sample=sample)(function)
 
     return decorator
@@ -62,5 +62,7 @@ def generate_example_data(output_dir: str | Path, number_of_runs: int = 10) -> l
             busywait(number_of_runs / 10 / i)
         with scoped_timing("quadratic", timings=timings):
             busywait(number_of_runs / 10 / i**2)
-        files.append(timings.output_files(output_dir=output_dir, csv_base=f"example_speedup_{i:05}"))
+        outfile = timings.output_files(output_dir=output_dir, csv_base=f"example_speedup_{i:05}")
+        assert outfile is not None  # only MPI parallel output skips the return value
+        files.append(outfile)
     return files
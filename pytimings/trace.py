@@ -0,0 +1,156 @@
+"""Timestamped traces of the sections a Timings object records.
+
+A :py:class:`TraceRecorder` keeps the most recent section runs with their begin/end time, thread and process
+in a bounded ring buffer. Traces export to the Chrome trace event format, which Perfetto
+(https://ui.perfetto.dev), ``chrome://tracing`` and speedscope open offline, and to folded stacks for
+flame graph tools.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import pytimings
+from pytimings.timer import PERF_COUNTER_FUNCTION, TO_SECONDS_FACTOR
+
+if TYPE_CHECKING:
+    from pytimings.timer import TimingDelta, Timings
+
+__all__ = ["TraceEvent", "TraceRecorder"]
+
+
+class TraceEvent(NamedTuple):
+    """One finished run of a section, times in nanoseconds of the ``perf_counter_ns`` clock."""
+
+    name: str
+    path: tuple[str, ...]
+    begin_ns: int
+    duration_ns: int
+    pid: int
+    tid: int
+    # number of calls the run stands for, more than 1 for sections timed with sampling
+    weight: float = 1.0
+
+
+class TraceRecorder:
+    """Record begin/end timestamps of every section committed to `timings` from now on.
+
+    Only the last `max_events` runs are kept. An event's end is taken when the measurement is committed,
+    right after the section stopped, and its begin is derived from the measured walltime. Only the
+    measured runs of sections timed with sampling (see :py:func:`pytimings.timer.scoped_timing`) are
+    recorded, with the number of calls they stand for as their weight. Close the recorder (or use it
+    as a context manager) to stop recording.
+    """
+
+    def __init__(self, timings: Timings | None = None, max_events: int = 100_000) -> None:
+        from pytimings.timer import global_timings
+
+        self.timings = timings or global_timings
+        self.max_events = max_events
+        self._events: deque[TraceEvent] = deque(maxlen=max_events)
+        self._thread_names: dict[int, str] = {}
+        # recording threads append and count together, so dropped stays exact
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self._closed = False
+        self.timings.add_listener(self)
+
+    def __call__(self, section_name: str, delta: TimingDelta, path: tuple[str, ...], weight: float) -> None:
+        end = PERF_COUNTER_FUNCTION()
+        duration = int(delta.wall / TO_SECONDS_FACTOR)
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        event = TraceEvent(section_name, path, end - duration, duration, os.getpid(), tid, weight)
+        with self._lock:
+            # deque.append with maxlen drops the oldest event
+            self._events.append(event)
+            self.recorded += 1
+
+    @property
+    def dropped(self) -> int:
+        """number of events that fell out of the ring buffer"""
+        with self._lock:
+            return max(0, self.recorded - len(self._events))
+
+    def events(self) -> list[TraceEvent]:
+        """a copy of the buffered events, oldest first"""
+        with self._lock:
+            return list(self._events)
+
+    def close(self) -> None:
+        """stop recording, the buffered events stay available"""
+        if not self._closed:
+            self._closed = True
+            self.timings.remove_listener(self)
+
+    def __enter__(self) -> TraceRecorder:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """the buffered events as a Chrome trace event format object (complete "X" events, times in µs)"""
+        events = self.events()
+        trace_events: list[dict[str, Any]] = []
+        for pid in sorted({event.pid for event in events}):
+            trace_events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"pytimings {pid}"}})
+        for pid, tid in sorted({(event.pid, event.tid) for event in events}):
+            name = self._thread_names.get(tid, str(tid))
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        # parents are committed after their children, viewers expect enclosing events first
+        for event in sorted(events, key=lambda event: (event.begin_ns, -event.duration_ns)):
+            trace_events.append(
+                {
+                    "name": event.name,
+                    "cat": "pytimings",
+                    "ph": "X",
+                    "ts": event.begin_ns / 1000,
+                    "dur": event.duration_ns / 1000,
+                    "pid": event.pid,
+                    "tid": event.tid,
+                    "args": {"path": "/".join(event.path), "weight": event.weight},
+                }
+            )
+        return {
+            "traceEvents": trace_events,
+            "displayTimeUnit": "ms",
+            "otherData": {"version": pytimings.__version__, "dropped_events": self.dropped, **self.timings.extra_data},
+        }
+
+    def write_chrome_trace(self, path: str | Path) -> Path:
+        """write :py:meth:`to_chrome_trace` as JSON, returns the file's path"""
+        path = Path(path)
+        path.write_text(json.dumps(self.to_chrome_trace(), default=str), encoding="utf-8")
+        return path
+
+    def folded_stacks(self) -> dict[str, float]:
+        """seconds spent exclusively in each call path of the buffered events, keyed by ``a;b;c``
+
+        Time spent in nested sections is subtracted from their parent's, clamped at zero for parents
+        whose children outlived them in the ring buffer. Sampled runs count with their weight.
+        """
+        inclusive: dict[tuple[str, ...], float] = {}
+        for event in self.events():
+            inclusive[event.path] = inclusive.get(event.path, 0) + event.duration_ns * event.weight
+        exclusive = dict(inclusive)
+        for path, duration in inclusive.items():
+            if len(path) > 1 and path[:-1] in exclusive:
+                exclusive[path[:-1]] -= duration
+        return {";".join(path): max(0, duration) * TO_SECONDS_FACTOR for path, duration in exclusive.items()}
+
+    def write_folded(self, path: str | Path) -> Path:
+        """write :py:meth:`folded_stacks` in the collapsed stack format of flamegraph.pl and speedscope
+
+        One ``a;b;c <microseconds>`` line per call path.
+        """
+        path = Path(path)
+        lines = [f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in sorted(self.folded_stacks().items())]
+        path.write_text("".join(lines), encoding="utf-8")
+        return path
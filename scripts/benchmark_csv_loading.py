@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Report the time csv_to_dataframe takes to load many csv outputs with differing sections.
+
+usage: benchmark_csv_loading.py [number_of_files [sections_per_file]]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pytimings.processing import csv_to_dataframe
+from pytimings.timer import Timings
+
+files = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+sections = int(sys.argv[2]) if len(sys.argv) > 2 else 30  # noqa: PLR2004
+
+with tempfile.TemporaryDirectory() as directory:
+    timings = Timings(statistics=False)
+    for section in range(sections):
+        timings.add_walltime(f"section_{section}", 1.0)
+    template = Path(timings.output_files(directory, "template")).read_text()
+    Path(directory, "template.csv").unlink()
+    for index in range(files):
+        # every file lacks a different section, so the loaded frame is sparse
+        missing = f"section_{index % sections}"
+        lines = [line for line in template.splitlines() if not line.startswith(f"{missing}_")]
+        Path(directory, f"run_{index:05}.csv").write_text("\n".join(lines).replace(f"{missing}||", ""))
+    start = time.perf_counter()
+    csv_to_dataframe(directory, strict=False)
+    print(f"{files} files, {sections} sections: {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Compare the per-call cost of automatic instrumentation, for timed and for unselected functions.
+
+sys.setprofile is included as the reference an instrumenter without sys.monitoring would have to use,
+its callback runs for every call, selected or not. Requires Python 3.12+.
+
+usage: benchmark_instrumentation.py [number_of_iterations]
+"""
+
+import sys
+import timeit
+
+from constant_backend import ConstantBackend
+
+from pytimings.instrument import MonitoringInstrumenter
+from pytimings.timer import Timings, function_timer
+
+try:
+    iterations = int(sys.argv[1])
+except IndexError:
+    iterations = 100_000
+
+
+timings = Timings(backend=ConstantBackend(), statistics=False)
+
+
+def timed() -> None:
+    pass
+
+
+def unselected() -> None:
+    pass
+
+
+decorated = function_timer("decorated", timings=timings)(timed)
+
+
+def profile(frame, event, arg) -> None:
+    if event == "call" and frame.f_code is timed.__code__:
+        timings.start("profiled")
+    elif event == "return" and frame.f_code is timed.__code__:
+        timings.stop("profiled")
+
+
+def best(case) -> float:
+    return min(timeit.repeat(case, number=iterations, repeat=5)) / iterations * 1e9
+
+
+results = {"plain call": best(unselected), "function_timer": best(decorated)}
+with MonitoringInstrumenter([f"{__name__}:timed"], timings=timings):
+    results["monitoring, timed"] = best(timed)
+    results["monitoring, unselected"] = best(unselected)
+sys.setprofile(profile)
+try:
+    results["setprofile, timed"] = best(timed)
+    results["setprofile, unselected"] = best(unselected)
+finally:
+    sys.setprofile(None)
+for name, nanoseconds in results.items():
+    print(f"{name:>24}: {nanoseconds:8.1f} ns per call")
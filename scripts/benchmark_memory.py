@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Report the memory held per recorded section for the dict and the columnar storage.
+
+usage: benchmark_memory.py [number_of_sections ...]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from pytimings.timer import STORAGES, Timings
+
+sizes = [int(arg) for arg in sys.argv[1:]] or [10**5, 10**6]
+
+
+def record(storage: str, sections: int) -> tuple[int, float]:
+    """bytes allocated and seconds taken to record each of `sections` dynamically named sections once"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    timings = Timings(backend="fast", statistics=False, storage=storage)
+    for index in range(sections):
+        section = f"request_{index % 7}_shard_{index}"
+        timings.start(section)
+        timings.stop(section)
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del timings
+    return used, elapsed
+
+
+for sections in sizes:
+    for storage in STORAGES:
+        used, elapsed = record(storage, sections)
+        print(
+            f"{sections:>9} sections, {storage:>7}: {used / 2**20:8.1f} MiB, "
+            f"{used / sections:6.0f} bytes per section, {elapsed:6.1f}s"
+        )
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Report the fixed per-start/stop cost of each timing backend and of the disabled instrumentation.
+
+usage: benchmark_overhead.py [number_of_iterations]
+"""
+
+import sys
+import timeit
+from functools import partial
+
+from pytimings.timer import _BACKENDS, Timings, function_timer, scoped_timing, set_enabled
+
+try:
+    iterations = int(sys.argv[1])
+except IndexError:
+    iterations = 100_000
+
+
+def best_ns(function) -> float:
+    return min(timeit.repeat(function, number=iterations, repeat=5)) / iterations * 1e9
+
+
+def start_stop(timings: Timings) -> None:
+    timings.start("section")
+    timings.stop("section")
+
+
+for name in sorted(_BACKENDS):
+    timings = Timings(backend=name)
+    print(f"{name:>10}: {best_ns(partial(start_stop, timings)):10.1f} ns per start/stop")
+
+
+def plain() -> None:
+    pass
+
+
+def scoped() -> None:
+    with scoped_timing("section"):
+        pass
+
+
+print(f"{'baseline':>10}: {best_ns(plain):10.1f} ns per uninstrumented call")
+for enabled in (True, False):
+    set_enabled(enabled)
+    state = "enabled" if enabled else "disabled"
+    print(f"{state:>10}: {best_ns(function_timer()(plain)):10.1f} ns per decorated call")
+    print(f"{state:>10}: {best_ns(scoped):10.1f} ns per call with a scoped_timing block")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Compare the per-entry cost of ScopedTiming, section handles and the former @contextmanager scoped_timing.
+
+usage: benchmark_scoped_timing.py [number_of_iterations]
+"""
+
+import sys
+import timeit
+from contextlib import contextmanager
+
+from constant_backend import ConstantBackend
+
+from pytimings.timer import ScopedTiming, Timings, scoped_timing
+
+try:
+    iterations = int(sys.argv[1])
+except IndexError:
+    iterations = 100_000
+
+
+@contextmanager
+def generator_scoped_timing(section_name, log_function=None, timings=None, format=""):
+    """scoped_timing as implemented before the switch to ScopedTiming"""
+    timings.start(section_name)
+    try:
+        yield
+    finally:
+        previous = timings._commited_deltas.get(section_name)
+        previous_wall = previous.wall if previous is not None else 0.0
+        delta = timings.stop(section_name)
+        if log_function:
+            log_function(f"Executing {section_name} took {delta.wall - previous_wall:^{format}}s")
+
+
+timings = Timings(backend=ConstantBackend(), statistics=False)
+reused = ScopedTiming("section", timings=timings)
+handle = timings.section("section")
+
+
+def generator_block() -> None:
+    with generator_scoped_timing("section", timings=timings):
+        pass
+
+
+def function_block() -> None:
+    with scoped_timing("section", timings=timings):
+        pass
+
+
+def reused_block() -> None:
+    with reused:
+        pass
+
+
+def handle_start_stop() -> None:
+    handle.start()
+    handle.stop()
+
+
+def handle_block() -> None:
+    with handle:
+        pass
+
+
+@reused
+def decorated() -> None:
+    pass
+
+
+def start_stop() -> None:
+    timings.start("section")
+    timings.stop("section")
+
+
+cases = {
+    "start/stop": start_stop,
+    "generator": generator_block,
+    "scoped_timing": function_block,
+    "reused object": reused_block,
+    "decorator": decorated,
+    "handle": handle_start_stop,
+    "handle block": handle_block,
+}
+baseline = None
+for name, case in cases.items():
+    best = min(timeit.repeat(case, number=iterations, repeat=5)) / iterations * 1e9
+    baseline = baseline or best
+    print(f"{name:>14}: {best:8.1f} ns per entry, {best - baseline:+8.1f} ns over start/stop")
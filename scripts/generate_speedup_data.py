@@ -11,7 +11,7 @@ except IndexError:
     output_dir = Path.cwd()
 
 try:
-    runs = sys.argv[2]
+    runs = int(sys.argv[2])
 except IndexError:
     runs = 10
 
@@ -0,0 +1,170 @@
+import asyncio
+import time
+
+import pytest
+
+from pytimings.aio import async_function_timer, async_scoped_timing
+from pytimings.timer import ScopedTiming, Timings, function_timer, scoped_timing
+
+SLEEP_SECONDS = 0.1
+
+
+def _burn_cpu(seconds):
+    # spin on thread CPU time rather than wall time, so the result does not depend on machine load
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+def test_function_timer_awaits_coroutines():
+    timings = Timings()
+
+    @function_timer(section_name="sleeper", timings=timings)
+    async def sleeper():
+        await asyncio.sleep(SLEEP_SECONDS)
+
+    asyncio.run(sleeper())
+    assert timings.walltime("sleeper") > 0.9 * SLEEP_SECONDS
+
+
+def test_sampled_coroutines():
+    timings = Timings()
+    messages = []
+
+    @function_timer(section_name="hot", timings=timings, sample=10)
+    async def hot():
+        await asyncio.sleep(0)
+
+    @async_function_timer(section_name="async_hot", timings=timings, sample=10)
+    async def async_hot():
+        await asyncio.sleep(0)
+
+    @ScopedTiming("logged", log_function=messages.append, timings=timings, format=".3f")
+    async def logged():
+        pass
+
+    async def main():
+        for _ in range(100):
+            await hot()
+            await async_hot()
+        await logged()
+
+    asyncio.run(main())
+    for section in ("hot", "async_hot"):
+        assert timings.statistics(section).count == 10  # noqa: PLR2004
+        assert timings.is_estimated(section)
+        assert timings.snapshot().sampled_calls[section] == 100  # noqa: PLR2004
+    assert messages[0].endswith(f"{timings.walltime('logged'):^.3f}s")
+    with pytest.raises(ValueError, match="sample must be"):
+        async_function_timer(sample=True)
+
+
+def test_concurrent_tasks_share_a_section():
+    timings = Timings()
+
+    async def task():
+        async with async_scoped_timing("shared", timings=timings):
+            await asyncio.sleep(SLEEP_SECONDS)
+
+    async def main():
+        await asyncio.gather(*(task() for _ in range(5)))
+
+    asyncio.run(main())
+    stats = timings.statistics("shared")
+    # every task recorded its own full interval instead of clobbering a shared running flag
+    assert stats.count == 5  # noqa: PLR2004
+    assert stats.min > 0.9 * SLEEP_SECONDS
+    assert timings.walltime("shared") > 4.5 * SLEEP_SECONDS
+
+
+def test_nesting_per_task():
+    timings = Timings()
+    logged = []
+
+    async def main():
+        async with async_scoped_timing("outer", log_function=logged.append, timings=timings):
+            async with async_scoped_timing("outer", timings=timings):
+                pass
+            async with async_scoped_timing("inner", timings=timings):
+                await asyncio.sleep(0)
+
+    asyncio.run(main())
+    tree = timings.tree()
+    assert list(tree.children["outer"].children) == ["inner"]
+    assert timings.statistics("outer").count == 1
+    assert logged[0].startswith("Executing outer took")
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_nesting_with_sync_sections(concurrent):
+    timings = Timings(concurrent=concurrent)
+
+    async def main():
+        with scoped_timing("sync_outer", timings=timings):
+            async with async_scoped_timing("async_inner", timings=timings):
+                with scoped_timing("sync_leaf", timings=timings):
+                    async with async_scoped_timing("async_leaf", timings=timings):
+                        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert sorted(timings.snapshot().tree) == [
+        ("sync_outer",),
+        ("sync_outer", "async_inner"),
+        ("sync_outer", "async_inner", "sync_leaf"),
+        ("sync_outer", "async_inner", "sync_leaf", "async_leaf"),
+    ]
+    outer = timings.tree().children["sync_outer"]
+    assert outer.exclusive.wall == pytest.approx(outer.inclusive.wall - outer.children["async_inner"].inclusive.wall)
+
+
+def test_sampled_scope():
+    timings = Timings()
+
+    async def main():
+        for _ in range(10):
+            async with async_scoped_timing("sampled", timings=timings, sample=5):
+                pass
+
+    asyncio.run(main())
+    assert timings.statistics("sampled").count == 2  # noqa: PLR2004
+    assert timings.is_estimated("sampled")
+
+
+@pytest.mark.parametrize("on_cpu", [True, False])
+def test_on_cpu_time(on_cpu):
+    timings = Timings()
+
+    @async_function_timer(section_name="mixed", timings=timings, on_cpu=on_cpu)
+    async def mixed():
+        _burn_cpu(SLEEP_SECONDS)
+        await asyncio.sleep(SLEEP_SECONDS)
+        return 42
+
+    async def hog():
+        # burns CPU on the same thread while 'mixed' is suspended
+        await asyncio.sleep(0.01)
+        _burn_cpu(SLEEP_SECONDS)
+
+    async def main():
+        return (await asyncio.gather(mixed(), hog()))[0]
+
+    assert asyncio.run(main()) == 42  # noqa: PLR2004
+    delta = timings.delta("mixed")
+    assert delta.wall > 1.9 * SLEEP_SECONDS
+    if on_cpu:
+        assert SLEEP_SECONDS <= delta.thread < 1.5 * SLEEP_SECONDS
+    else:
+        assert delta.thread >= 2 * SLEEP_SECONDS
+
+
+def test_on_cpu_propagates_exceptions():
+    timings = Timings()
+
+    @async_function_timer(section_name="failing", timings=timings, on_cpu=True)
+    async def failing():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(failing())
+    assert timings.statistics("failing").count == 1
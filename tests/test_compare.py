@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from pytimings.cli import EXIT_OK, EXIT_REGRESSION, main
+from pytimings.compare import compare_files, load_runs
+from pytimings.timer import Timings
+
+
+def _write_runs(output_dir, walltimes):
+    """one csv per run, walltimes maps section names to their per-run times"""
+    runs = len(next(iter(walltimes.values())))
+    for run in range(runs):
+        timings = Timings()
+        for section, values in walltimes.items():
+            timings.add_walltime(section, values[run])
+        timings.output_files(output_dir=output_dir, csv_base=f"run_{run:03}")
+    return output_dir
+
+
+@pytest.fixture
+def runs(tmp_path):
+    noise = [1.0, 1.02, 0.98, 1.01, 0.99]
+    baseline = _write_runs(
+        tmp_path / "baseline", {"stable": noise, "regressed": noise, "improved": noise, "removed": noise}
+    )
+    candidate = _write_runs(
+        tmp_path / "candidate",
+        {
+            "stable": [value * 1.01 for value in noise[::-1]],
+            "regressed": [value * 1.5 for value in noise],
+            "improved": [value / 2 for value in noise],
+            "added": noise,
+        },
+    )
+    return baseline, candidate
+
+
+def test_compare(runs):
+    report = compare_files(*runs)
+    status = {section.section: section.status for section in report.sections}
+    assert status == {"stable": "unchanged", "regressed": "slower", "improved": "faster"}
+    assert [section.section for section in report.regressions] == ["regressed"]
+    assert report.only_baseline == ["removed"]
+    assert report.only_candidate == ["added"]
+    (regressed,) = report.regressions
+    assert regressed.speedup == pytest.approx(1 / 1.5)
+    assert regressed.ci_low <= regressed.speedup <= regressed.ci_high
+    assert (regressed.baseline_runs, regressed.candidate_runs) == (5, 5)
+    assert compare_files(*runs, threshold=1.0).regressions == []
+
+
+def test_compare_single_runs(tmp_path, capsys):
+    baseline = _write_runs(tmp_path / "baseline", {"section": [1.0]})
+    candidate = _write_runs(tmp_path / "candidate", {"section": [1.2]})
+    report = compare_files(baseline, candidate)
+    (section,) = report.sections
+    assert section.ci_low == section.ci_high == pytest.approx(1 / 1.2)
+    assert section.status == "inconclusive"
+    assert report.regressions == []
+    assert report.to_dict()["inconclusive"] == ["section"]
+    several = _write_runs(tmp_path / "several", {"section": [1.2, 1.2]})
+    assert compare_files(baseline, several).sections[0].status == "inconclusive"
+    assert compare_files(several, baseline).sections[0].status == "inconclusive"
+    assert main(["compare", str(baseline), str(candidate)]) == EXIT_OK
+    assert "need at least two runs" in capsys.readouterr().out
+    with pytest.raises(ValueError, match="not recorded"):
+        compare_files(baseline, candidate, field="rss")
+    (tmp_path / "empty").mkdir()
+    with pytest.raises(ValueError, match="no timing outputs"):
+        load_runs(tmp_path / "empty")
+
+
+def test_compare_cli(runs, tmp_path, capsys):
+    report = tmp_path / "report.json"
+    assert main(["compare", *map(str, runs), "--json", str(report)]) == EXIT_REGRESSION
+    assert "regressed" in capsys.readouterr().out
+    assert json.loads(report.read_text())["regressions"] == ["regressed"]
+    assert main(["compare", *map(str, runs), "--no-fail"]) == EXIT_OK
+    baseline, _ = runs
+    assert main(["compare", str(baseline), str(baseline)]) == EXIT_OK
+    with pytest.raises(SystemExit):
+        main(["compare", str(baseline)])
@@ -0,0 +1,106 @@
+import json
+import time
+
+import pytest
+
+from pytimings.eventlog import EventLogSink, read_event_log
+from pytimings.timer import Timings, scoped_timing
+
+
+def _stop_events(path):
+    return [line for line in path.read_text().splitlines() if '"stop"' in line]
+
+
+def test_roundtrip(tmp_path):
+    log = tmp_path / "events.jsonl"
+    timings = Timings()
+    timings.add_extra_data({"run": 3})
+    with EventLogSink(log, timings=timings, flush_interval=60):
+        for _ in range(3):
+            with scoped_timing("outer", timings=timings):
+                with scoped_timing("inner", timings=timings):
+                    pass
+    restored = read_event_log(log)
+    assert restored.extra_data == {"run": 3}
+    for section in ("outer", "inner"):
+        assert restored.delta(section) == pytest.approx(timings.delta(section))
+        assert restored.statistics(section).count == 3  # noqa: PLR2004
+    assert restored.tree().children["outer"].children["inner"].inclusive == pytest.approx(
+        timings.tree().children["outer"].children["inner"].inclusive
+    )
+
+
+def test_flushes_on_size_threshold(tmp_path):
+    log = tmp_path / "events.jsonl"
+    timings = Timings()
+    sink = EventLogSink(log, timings=timings, max_events=5, flush_interval=60)
+    try:
+        for _ in range(5):
+            timings.add_walltime("unused", 0)  # add_walltime bypasses listeners
+            with scoped_timing("section", timings=timings):
+                pass
+        deadline = time.monotonic() + 5
+        while len(_stop_events(log)) < 5 and time.monotonic() < deadline:  # noqa: PLR2004
+            time.sleep(0.01)
+        assert len(_stop_events(log)) == 5  # noqa: PLR2004
+    finally:
+        sink.close()
+    sink.close()  # closing twice is harmless
+    with scoped_timing("section", timings=timings):
+        pass
+    assert len(_stop_events(log)) == 5  # noqa: PLR2004
+
+
+def test_survives_truncated_write(tmp_path):
+    log = tmp_path / "events.jsonl"
+    timings = Timings()
+    with EventLogSink(log, timings=timings, fsync=False):
+        with scoped_timing("section", timings=timings):
+            pass
+    # simulate a crash in the middle of writing a later batch
+    with log.open("a") as out:
+        out.write(json.dumps({"event": "stop", "section": "section"})[:20])
+    assert read_event_log(log).statistics("section").count == 1
+
+
+def test_extra_data_added_later(tmp_path):
+    log = tmp_path / "events.jsonl"
+    timings = Timings()
+    timings.add_extra_data({"run": 1})
+    with EventLogSink(log, timings=timings, flush_interval=60) as sink:
+        timings.add_extra_data({"result": "converged"})
+        sink.flush()
+        timings.add_extra_data({"run": 2})
+    assert read_event_log(log).extra_data == {"run": 2, "result": "converged"}
+
+
+def test_several_runs(tmp_path):
+    log = tmp_path / "events.jsonl"
+    for run in range(3):
+        timings = Timings()
+        timings.add_extra_data({"run": run})
+        with EventLogSink(log, timings=timings, flush_interval=60):
+            for _ in range(run + 1):
+                with scoped_timing("section", timings=timings):
+                    pass
+    with pytest.raises(ValueError, match="3 runs"):
+        read_event_log(log)
+    for run in (0, 1, -1):
+        restored = read_event_log(log, run=run)
+        assert restored.extra_data == {"run": run % 3}
+        assert restored.statistics("section").count == run % 3 + 1
+
+
+def test_sampled_sections(tmp_path):
+    log = tmp_path / "events.jsonl"
+    timings = Timings()
+    with EventLogSink(log, timings=timings, flush_interval=60):
+        for _ in range(100):
+            with scoped_timing("sampled", timings=timings, sample=10):
+                pass
+    restored = read_event_log(log)
+    assert restored.is_estimated("sampled")
+    assert restored.statistics("sampled").count == 10  # noqa: PLR2004
+    assert restored.statistics("sampled").mean == pytest.approx(timings.statistics("sampled").mean)
+    assert restored.walltime("sampled") == pytest.approx(timings.walltime("sampled"))
+    assert restored.snapshot().sampled_calls["sampled"] == 100  # noqa: PLR2004
@@ -0,0 +1,188 @@
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from pytimings.exporter import CONTENT_TYPE, PrometheusExporter, to_prometheus
+from pytimings.timer import SYS_TIME, THREAD_TIME, USER_TIME, WALL_TIME, FastBackend, Timings, scoped_timing
+
+
+def _samples(metrics):
+    return dict(line.rsplit(" ", 1) for line in metrics.splitlines() if not line.startswith("#"))
+
+
+def test_snapshot_running():
+    timings = Timings()
+    timings.add_walltime("done", 1.0)
+    timings.start("running")
+    time.sleep(0.01)
+    assert "running" not in timings.snapshot().deltas
+    deltas = timings.snapshot(running=True).deltas
+    assert deltas["done"].wall == 1.0
+    assert deltas["running"].wall >= 0.01  # noqa: PLR2004
+    # the timer keeps running and is only committed once it stops
+    assert "running" not in timings.snapshot().deltas
+    timings.stop("running")
+    assert timings.walltime("running") >= deltas["running"].wall
+
+
+def test_snapshot_concurrent():
+    timings = Timings(concurrent=True)
+
+    def work():
+        with scoped_timing("work", timings=timings):
+            pass
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert timings.snapshot().statistics["work"].count == 4  # noqa: PLR2004
+    # taking a snapshot leaves the per-thread buffers alone
+    assert timings.snapshot().statistics["work"].count == 4  # noqa: PLR2004
+
+
+class _SlowBackend(FastBackend):
+    """widens the window between a section's end and its commit, where snapshots used to lose the run"""
+
+    name = "slow"
+
+    def __init__(self):
+        self.random = random.Random(0)
+
+    def sample(self):
+        # irregular delays keep the scraping and the recording thread from falling into lockstep
+        time.sleep(self.random.uniform(0, 0.004))
+        return super().sample()
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+@pytest.mark.parametrize("handle", [False, True])
+def test_running_totals_never_decrease(concurrent, handle):
+    timings = Timings(backend=_SlowBackend(), concurrent=concurrent)
+    recording = threading.Event()
+    recording.set()
+
+    def record():
+        section = timings.section("work")
+        while recording.is_set():
+            if handle:
+                with section:
+                    time.sleep(0.001)
+            else:
+                with scoped_timing("work", timings=timings):
+                    time.sleep(0.001)
+
+    thread = threading.Thread(target=record)
+    thread.start()
+    try:
+        previous = 0.0
+        # scrape for a while, so snapshots fall between the start, end and commit of many runs
+        deadline = time.perf_counter() + 0.3
+        while time.perf_counter() < deadline:
+            delta = timings.snapshot(running=True).deltas.get("work")
+            wall = delta.wall if delta is not None else 0.0
+            assert wall >= previous
+            previous = wall
+            time.sleep(0.0005)
+    finally:
+        recording.clear()
+        thread.join()
+
+
+class _ScatteredBackend:
+    """durations spread over twelve orders of magnitude, so quantile sketches keep adding buckets"""
+
+    name = "scattered"
+
+    def __init__(self):
+        self.now = 0.0
+        self.random = random.Random(0)
+
+    def sample(self):
+        self.now += 10 ** self.random.uniform(0, 12)
+        return {WALL_TIME: self.now, USER_TIME: 0.0, SYS_TIME: 0.0, THREAD_TIME: 0.0}
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+@pytest.mark.parametrize("storage", ["dict", "columns"])
+def test_export_while_recording(concurrent, storage):
+    timings = Timings(backend=_ScatteredBackend(), concurrent=concurrent, storage=storage, history=16)
+    recording = threading.Event()
+    recording.set()
+
+    calls = []
+
+    def record():
+        section = 0
+        while recording.is_set():
+            with scoped_timing(f"section_{section % 10}", timings=timings):
+                pass
+            section += 1
+        calls.append(section)
+
+    recorder = threading.Thread(target=record)
+    switch_interval = sys.getswitchinterval()
+    # switch threads often enough to interrupt copies
+    sys.setswitchinterval(1e-6)
+    recorder.start()
+    try:
+        with PrometheusExporter(timings, interval=60) as exporter:
+            deadline = time.monotonic() + 0.5
+            while time.monotonic() < deadline:
+                exporter.export()
+    finally:
+        recording.clear()
+        recorder.join()
+        sys.setswitchinterval(switch_interval)
+    assert sum(stats.count for stats in timings.snapshot().statistics.values()) == calls[0]
+
+
+def test_to_prometheus():
+    timings = Timings()
+    timings.add_walltime('odd "name"\\', 2.0)
+    with scoped_timing("section", timings=timings):
+        pass
+    metrics = to_prometheus(timings.snapshot(), prefix="app")
+    assert "# TYPE app_section_wall_seconds_total counter" in metrics
+    assert "# TYPE app_section_call_seconds summary" in metrics
+    assert "rss" not in metrics
+    samples = _samples(metrics)
+    assert float(samples['app_section_wall_seconds_total{section="odd \\"name\\"\\\\"}']) == 2.0  # noqa: PLR2004
+    assert samples['app_section_call_seconds_count{section="section"}'] == "1"
+    assert 'app_section_call_seconds{section="section",quantile="0.99"}' in samples
+
+
+def test_textfile(tmp_path):
+    timings = Timings()
+    timings.start("service")
+    textfile = tmp_path / "timings.prom"
+    with PrometheusExporter(timings, interval=0.01, textfile=textfile) as exporter:
+        first = float(_samples(exporter.export())['pytimings_section_wall_seconds_total{section="service"}'])
+        time.sleep(0.05)
+        written = float(_samples(textfile.read_text())['pytimings_section_wall_seconds_total{section="service"}'])
+    assert written > first
+    assert [path.name for path in tmp_path.iterdir()] == ["timings.prom"]
+    timings.stop("service")
+
+
+def test_http():
+    timings = Timings()
+    timings.add_walltime("section", 1.0)
+    with PrometheusExporter(timings, interval=60, port=0) as exporter:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics") as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            body = response.read().decode()
+        assert 'pytimings_section_wall_seconds_total{section="section"} 1.0' in body
+        # answered from the cached snapshot until interval passed
+        timings.add_walltime("section", 3.0)
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics") as response:
+            assert response.read().decode() == body
+        assert 'section="section"} 3.0' in exporter.export()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/other")
@@ -0,0 +1,96 @@
+import pickle
+import threading
+
+import matplotlib as mpl
+import pytest
+
+from pytimings.plotting.history import detect_warmup, plot_history
+from pytimings.statistics import SectionHistory
+from pytimings.timer import NoTimerError, TimingDelta, Timings, scoped_timing
+
+mpl.use("Agg")
+
+
+def test_ring_buffer_wraps():
+    history = SectionHistory(3, fields=("wall",))
+    for call in range(5):
+        history.add(float(call), (call * 10.0,))
+    assert len(history) == 3  # noqa: PLR2004
+    assert history.count == 5  # noqa: PLR2004
+    assert history.values() == [20.0, 30.0, 40.0]
+    assert history.to_numpy("time").tolist() == [2.0, 3.0, 4.0]
+    assert history.to_numpy().shape == (3, 2)
+    frame = history.to_dataframe()
+    assert list(frame.index) == [2, 3, 4]
+    assert list(frame["wall"]) == [20.0, 30.0, 40.0]
+    restored = pickle.loads(pickle.dumps(history, protocol=0))
+    assert restored.values() == history.values()
+    with pytest.raises(ValueError, match="positive"):
+        SectionHistory(0)
+
+
+def test_merge_keeps_latest_rows():
+    first, second = SectionHistory(4, fields=("wall",)), SectionHistory(4, fields=("wall",))
+    for time in (1.0, 3.0, 5.0):
+        first.add(time, (time,))
+    for time in (2.0, 4.0, 6.0):
+        second.add(time, (time,))
+    first.merge(second)
+    assert first.values("time") == [3.0, 4.0, 5.0, 6.0]
+    assert first.count == 6  # noqa: PLR2004
+    first.add(7.0, (7.0,))
+    assert first.values() == [4.0, 5.0, 6.0, 7.0]
+
+
+def test_timings_history():
+    timings = Timings(history=4)
+    for _ in range(6):
+        with scoped_timing("section", timings=timings):
+            pass
+    history = timings.history("section")
+    assert history.count == 6  # noqa: PLR2004
+    assert history.columns == ("time", *TimingDelta._fields)
+    times = history.values("time")
+    assert times == sorted(times)
+    assert sum(history.values()) <= timings.walltime("section")
+    with pytest.raises(NoTimerError):
+        timings.history("unknown")
+    timings.reset("section")
+    with pytest.raises(NoTimerError):
+        timings.history("section")
+    with pytest.raises(ValueError, match="no history"):
+        Timings().history("section")
+
+
+def test_concurrent_history():
+    timings = Timings(concurrent=True, history=100)
+
+    def work():
+        for _ in range(10):
+            with scoped_timing("section", timings=timings):
+                pass
+
+    workers = [threading.Thread(target=work) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert timings.snapshot().histories["section"].count == 30  # noqa: PLR2004
+    assert len(timings.history("section")) == 30  # noqa: PLR2004
+
+
+def test_detect_warmup():
+    assert detect_warmup([10.0] * 20 + [1.0] * 100) == 20  # noqa: PLR2004
+    assert detect_warmup([10.0] * 20 + [1.0] * 100, window=9) == 20  # noqa: PLR2004
+    assert detect_warmup([1.0] * 100) == 0
+    assert detect_warmup([5.0, 1.0]) == 0
+
+
+def test_plot_history():
+    history = SectionHistory(50, fields=("wall",))
+    for call in range(60):
+        history.add(float(call), (10.0 if call < 20 else 1.0,))  # noqa: PLR2004
+    ax = plot_history(history, label="section")
+    (line,) = ax.get_lines()[:1]
+    assert list(line.get_xdata()) == list(range(10, 60))
+    assert ax.get_lines()[1].get_xdata()[0] == 20  # noqa: PLR2004
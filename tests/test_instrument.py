@@ -0,0 +1,161 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+import pytimings
+from pytimings.instrument import ImportInstrumenter, MonitoringInstrumenter, instrument_module
+from pytimings.timer import Timings
+
+_WORKLOAD = """
+def solve(n):
+    return sum(Solver().step(i) for i in range(n))
+
+
+def _helper():
+    return 1
+
+
+def numbers():
+    yield 1
+
+
+class Solver:
+    def step(self, i):
+        return i + _helper()
+
+    @staticmethod
+    def create():
+        return Solver()
+
+    @classmethod
+    def default(cls):
+        return cls()
+"""
+
+
+def _write_package(root):
+    package = root / "workload"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "solver.py").write_text(_WORKLOAD)
+    return root
+
+
+def test_instrument_module(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(_write_package(tmp_path)))
+    timings = Timings()
+    with ImportInstrumenter(
+        ["workload.*:*", "workload.solver:_helper"], exclude=["workload.solver:*.default"], timings=timings
+    ) as instrumenter:
+        from workload import solver
+    try:
+        assert sorted(instrumenter.sections) == [
+            "workload.solver.Solver.create",
+            "workload.solver.Solver.step",
+            "workload.solver._helper",
+            "workload.solver.solve",
+        ]
+        assert solver.solve(3) == 6  # noqa: PLR2004
+        assert isinstance(solver.Solver.create(), solver.Solver)
+        assert isinstance(solver.Solver.default(), solver.Solver)
+        assert list(solver.numbers()) == [1]
+        assert timings._statistics["workload.solver.Solver.step"].count == 3  # noqa: PLR2004
+        assert "workload.solver.numbers" not in timings._commited_deltas
+        assert timings.tree().children["workload.solver.solve"].children
+        # instrumenting again does not wrap twice
+        assert instrument_module(solver, ["*"], timings=timings) == ["workload.solver.Solver.default"]
+        assert instrument_module(solver, ["*"], timings=timings) == []
+    finally:
+        sys.modules.pop("workload.solver")
+        sys.modules.pop("workload")
+
+
+_needs_monitoring = pytest.mark.skipif(not hasattr(sys, "monitoring"), reason="sys.monitoring requires Python 3.12+")
+
+
+@pytest.mark.parametrize("options", [[], pytest.param(["--monitoring", "-i", "__main__"], marks=_needs_monitoring)])
+def test_run_script(tmp_path, options):
+    _write_package(tmp_path)
+    script = tmp_path / "job.py"
+    script.write_text(
+        textwrap.dedent(
+            """
+            import sys
+            from workload.solver import solve
+
+
+            def main():
+                solve(int(sys.argv[1]))
+
+
+            main()
+            sys.exit(0)
+            """
+        )
+    )
+    python_path = [str(Path(pytimings.__file__).parents[1]), os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, python_path))}
+    command = [sys.executable, "-m", "pytimings", "run", "-q", "-o", "out", "-i", "workload.solver", *options]
+    subprocess.run([*command, "job.py", "4"], cwd=tmp_path, env=env, check=True)
+    rows = dict(line.split(",", 1) for line in (tmp_path / "out" / "timings.csv").read_text().splitlines())
+    assert "job.py_wall" in rows
+    assert "workload.solver.solve_wall" in rows
+    assert rows["workload.solver.Solver.step_count"] == "4"
+    assert rows["pytimings::data::arguments"] == "4"
+    assert "workload.solver._helper_wall" not in rows
+    assert ("__main__.main_wall" in rows) == bool(options)
+
+
+def _fibonacci(n):
+    return n if n < 2 else _fibonacci(n - 1) + _fibonacci(n - 2)  # noqa: PLR2004
+
+
+def _countdown(n):
+    while n:
+        yield n
+        n -= 1
+
+
+def _fail():
+    raise ValueError
+
+
+def _untimed():
+    return 0
+
+
+@_needs_monitoring
+def test_monitoring_instrumenter():
+    timings = Timings()
+    with MonitoringInstrumenter([f"{__name__}:_*"], exclude=[f"{__name__}:_untimed"], timings=timings):
+        assert _fibonacci(10) == 55  # noqa: PLR2004
+        assert list(_countdown(3)) == [3, 2, 1]
+        with pytest.raises(ValueError):
+            _fail()
+        _untimed()
+        _untimed()
+    _fibonacci(3)
+    stats = timings._statistics
+    # recursive calls are a single run of the outermost one
+    assert stats[f"{__name__}._fibonacci"].count == 1
+    # every resumption of the generator is a run
+    assert stats[f"{__name__}._countdown"].count == 4  # noqa: PLR2004
+    assert stats[f"{__name__}._fail"].count == 1
+    assert f"{__name__}._untimed" not in timings._commited_deltas
+    assert not any(name.startswith("pytimings.") for name in timings._commited_deltas)
+
+
+@_needs_monitoring
+def test_monitoring_instrumenter_reinstall():
+    timings = Timings()
+    with MonitoringInstrumenter([f"{__name__}:_fibonacci"], timings=timings):
+        _fibonacci(2)
+        _untimed()
+    # events of _untimed were disabled by the first instrumenter
+    with MonitoringInstrumenter([f"{__name__}:_untimed"], timings=timings):
+        _untimed()
+    assert timings._statistics[f"{__name__}._untimed"].count == 1
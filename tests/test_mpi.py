@@ -0,0 +1,78 @@
+import csv
+import threading
+
+import pytest
+
+from pytimings.mpi import RankSummary, summarize
+from pytimings.timer import TimingDelta, Timings
+
+RANKS = 4
+
+
+class _ThreadComm:
+    """stands in for an MPI communicator, each rank runs in its own thread"""
+
+    def __init__(self, rank, shared):
+        self._rank = rank
+        self._shared = shared
+
+    def Get_rank(self):  # noqa: N802
+        return self._rank
+
+    def Get_size(self):  # noqa: N802
+        return len(self._shared["slots"])
+
+    def gather(self, obj, root=0):
+        self._shared["slots"][self._rank] = obj
+        self._shared["barrier"].wait()
+        return list(self._shared["slots"]) if self._rank == root else None
+
+
+def _run_ranks(function):
+    shared = {"slots": [None] * RANKS, "barrier": threading.Barrier(RANKS)}
+    results = [None] * RANKS
+
+    def run(rank):
+        results[rank] = function(_ThreadComm(rank, shared))
+
+    threads = [threading.Thread(target=run, args=(rank,)) for rank in range(RANKS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_output_files_per_rank_and_summary(tmp_path):
+    def rank_main(comm):
+        timings = Timings()
+        rank = comm.Get_rank()
+        timings.add_walltime("balanced", 1.0)
+        timings.add_walltime("skewed", float(rank + 1))
+        if rank == 0:
+            timings.add_walltime("rank0_only", 4.0)
+        return timings.output_files(tmp_path, "timings", comm=comm)
+
+    results = _run_ranks(rank_main)
+    assert results[0] == tmp_path / "timings.csv"
+    assert results[1:] == [None] * (RANKS - 1)
+    for rank in range(RANKS):
+        assert (tmp_path / f"timings_p{rank:05}.csv").is_file()
+
+    with results[0].open() as summary_file:
+        summary = dict(csv.reader(summary_file))
+    assert summary["ranks"] == str(RANKS)
+    assert float(summary["balanced_imbalance"]) == 1
+    assert float(summary["skewed_wall_min"]) == 1
+    assert float(summary["skewed_wall_max"]) == RANKS
+    assert float(summary["skewed_wall_mean"]) == pytest.approx(2.5)
+    assert float(summary["skewed_imbalance"]) == pytest.approx(RANKS / 2.5)
+    assert float(summary["rank0_only_imbalance"]) == RANKS
+    assert summary["pytimings::data::_sections"] == "balanced||rank0_only||skewed"
+
+
+def test_summarize():
+    summary = summarize([{"a": TimingDelta(1, 2, 3)}, {"a": TimingDelta(3, 2, 1)}, {}])
+    assert summary["a"]["wall"] == RankSummary(0, 3, 4 / 3)
+    assert summary["a"]["user"].imbalance == pytest.approx(3 / (4 / 3))
+    assert RankSummary(0, 0, 0).imbalance == 1
@@ -1,7 +1,12 @@
+import math
 from io import StringIO
 
+import pytest
+
 import pytimings
-from pytimings.processing import csv_to_dataframe
+from pytimings import processing
+from pytimings.processing import csv_to_dataframe, file_sections, npz_to_dataframe
+from pytimings.timer import Timings, scoped_timing
 from pytimings.tools import generate_example_data
 
 
@@ -41,3 +46,80 @@ def test_csv_to_dataframe(tmpdir):
     assert all(f.is_file() for f in files), files
     frame = csv_to_dataframe(files)
     assert all(frame["pytimings::data::_version"] == pytimings.__version__)
+
+
+def test_npz_to_dataframe(tmp_path):
+    files = []
+    for run in range(1, 4):
+        timings = Timings()
+        timings.add_extra_data({"run": run, "label": f"r{run}", "scale": 0.5 * run})
+        with scoped_timing("outer", timings=timings):
+            with scoped_timing("inner", timings=timings):
+                pass
+        files.append(timings.output_npz(tmp_path, f"run_{run}"))
+    csv_file = timings.output_files(tmp_path, "run_3")
+
+    frame = npz_to_dataframe(files)
+    assert list(frame.index) == files
+    assert frame["pytimings::data::run"].tolist() == [1, 2, 3]
+    assert frame["pytimings::data::scale"].dtype == float
+    assert frame["outer_count"].tolist() == [1, 1, 1]
+    assert frame.loc[files[-1], "inner_wall"] == timings.walltime("inner")
+    # same columns as the csv loader produces for the timing values
+    csv_frame = csv_to_dataframe([csv_file])
+    totals = {c for c in csv_frame.columns if c.endswith(("_usr", "_wall", "_sys", "_thread")) and "_incl_" not in c}
+    assert {c for c in totals if "_excl_" not in c} <= set(frame.columns)
+
+    long = npz_to_dataframe(files, sort=True, long=True)
+    assert len(long) == 2 * len(files)
+    assert set(long["section"]) == {"outer", "inner"}
+    assert long["run"].tolist() == [1, 1, 2, 2, 3, 3]
+
+
+def test_csv_to_dataframe_directory_glob_and_cache(tmp_path, monkeypatch):
+    files = generate_example_data(tmp_path, number_of_runs=4)
+    by_list = csv_to_dataframe(files, workers=2)
+    by_dir = csv_to_dataframe(tmp_path)
+    by_glob = csv_to_dataframe(str(tmp_path / "example_speedup_*.csv"))
+    assert list(by_dir.index) == sorted(files)
+    assert by_glob.reset_index(drop=True).equals(by_dir.reset_index(drop=True))
+    assert by_list["linear_wall"].tolist() == by_dir["linear_wall"].tolist()
+    assert by_list["linear_wall"].dtype == float
+
+    parsed = []
+    original = processing._read_measures
+
+    def counting_read(filename):
+        parsed.append(filename)
+        return original(filename)
+
+    monkeypatch.setattr(processing, "_read_measures", counting_read)
+    cache = tmp_path / "parsed.pickle"
+    first = csv_to_dataframe(files, cache=cache)
+    assert len(parsed) == len(files)
+    # unchanged files come from the cache, a rewritten one is parsed again
+    files[0].write_text(files[0].read_text().replace("linear_wall,", "linear_wall,1"))
+    second = csv_to_dataframe(files, cache=cache)
+    assert parsed[len(files) :] == [files[0]]
+    assert second.loc[files[1]].equals(first.loc[files[1]])
+    assert second.loc[files[0], "linear_wall"] != first.loc[files[0], "linear_wall"]
+
+
+def test_csv_to_dataframe_differing_sections(tmp_path):
+    files = []
+    for run, sections in enumerate([("a", "b"), ("a",), ("b", "c")]):
+        timings = Timings(statistics=False)
+        for section in sections:
+            timings.add_walltime(section, 1.0 + run)
+        files.append(timings.output_files(tmp_path, f"run_{run}"))
+
+    with pytest.raises(ValueError, match="same sections"):
+        csv_to_dataframe(files)
+    frame = csv_to_dataframe(files, strict=False)
+    assert frame["a_wall"].tolist()[:2] == [1.0, 2.0]
+    assert math.isnan(frame.loc[files[2], "a_wall"])
+    assert math.isnan(frame.loc[files[0], "c_wall"])
+    assert frame.loc[files[2], "c_wall"] == 3.0  # noqa: PLR2004
+    assert file_sections(frame) == {files[0]: ["a", "b"], files[1]: ["a"], files[2]: ["b", "c"]}
+    # attrs would be deep-copied on every column access, which made loading thousands of files crawl
+    assert not frame.attrs
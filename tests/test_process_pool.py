@@ -0,0 +1,112 @@
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from pytimings.process_pool import TimedProcessPoolExecutor, call_and_snapshot
+from pytimings.timer import Timings, function_timer, global_timings, scoped_timing
+from pytimings.tools import busywait
+
+TASKS = 6
+
+
+@function_timer(section_name="task")
+def _task(value):
+    with scoped_timing("task.inner"):
+        busywait(0.01)
+    return value * 2
+
+
+def _failing_task():
+    with scoped_timing("failing"):
+        pass
+    raise RuntimeError("boom")
+
+
+def _slow_task():
+    time.sleep(0.2)
+
+
+def test_executor_merges_worker_timings():
+    timings = Timings()
+    with TimedProcessPoolExecutor(max_workers=2, timings=timings) as executor:
+        results = list(executor.map(_task, range(TASKS)))
+    assert results == [2 * value for value in range(TASKS)]
+    assert timings.statistics("task").count == TASKS
+    assert timings.walltime("task") > TASKS * 0.01
+    assert timings.tree().children["task"].children["task.inner"].inclusive.wall > TASKS * 0.01
+
+
+def test_executor_per_worker_breakdown():
+    timings = Timings()
+    with TimedProcessPoolExecutor(max_workers=2, timings=timings, per_worker=True) as executor:
+        list(executor.map(_task, range(TASKS)))
+    sections = [section for section in timings.snapshot().deltas if section.endswith(".task")]
+    assert all(section.startswith("worker_") for section in sections)
+    assert sum(timings.statistics(section).count for section in sections) == TASKS
+
+
+def test_executor_propagates_exceptions():
+    timings = Timings()
+    with TimedProcessPoolExecutor(max_workers=1, timings=timings) as executor:
+        future = executor.submit(_failing_task)
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result()
+        assert not hasattr(future.exception(), "__pytimings_snapshot__")
+    # the failed task's records are merged regardless
+    assert timings.statistics("failing").count == 1
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_forked_workers_start_empty():
+    global_timings.add_walltime("parent_only", 1.0)
+    timings = Timings()
+    context = multiprocessing.get_context("fork")
+    initialized = []
+    with TimedProcessPoolExecutor(
+        max_workers=2, mp_context=context, timings=timings, initializer=initialized.append, initargs=(1,)
+    ) as executor:
+        list(executor.map(_task, range(TASKS)))
+    global_timings.reset("parent_only")
+    assert set(timings.snapshot().deltas) == {"task", "task.inner"}
+
+
+def test_executor_cancel():
+    with TimedProcessPoolExecutor(max_workers=1, timings=Timings()) as executor:
+        futures = [executor.submit(_slow_task) for _ in range(4)]
+        futures[-1].cancel()
+        executor.shutdown(cancel_futures=True)
+    _done, pending = wait(futures, timeout=10)
+    assert not pending
+    assert futures[-1].cancelled()
+    assert any(future.cancelled() for future in futures[1:-1])
+
+
+def test_call_and_snapshot_resets_global_timings():
+    result, _pid, snapshot = call_and_snapshot(_task, 2)
+    assert result == 4  # noqa: PLR2004
+    assert snapshot.statistics["task"].count == 1
+    assert "task" not in global_timings.snapshot().statistics
+
+
+def test_snapshot_merge_and_pickle():
+    source = Timings()
+    with scoped_timing("outer", timings=source):
+        with scoped_timing("inner", timings=source):
+            pass
+    source.start("running")
+    snapshot = pickle.loads(pickle.dumps(source.snapshot()))
+    assert "running" not in snapshot.deltas
+
+    target = Timings()
+    target.merge(snapshot)
+    target.merge(source)
+    target.merge(snapshot, prefix="w1.")
+    assert target.walltime("inner") == 2 * source.walltime("inner")
+    assert target.statistics("outer").count == 2  # noqa: PLR2004
+    assert target.walltime("w1.inner") == source.walltime("inner")
+    assert target.tree().children["w1.outer"].children["inner"].inclusive == source.delta("inner")
+    # merging must not share statistics objects with the source
+    assert source.statistics("outer").count == 1
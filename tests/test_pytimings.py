@@ -2,14 +2,45 @@
 
 """Tests for `pytimings` package."""
 
+import os
 import pickle
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from io import StringIO
 from tempfile import TemporaryFile
 
 import numpy as np
 import pytest
 
-from pytimings.timer import NoTimerError, cummulative_scoped_timing, function_timer, scoped_timing
+from pytimings.timer import (
+    CONTEXT_SWITCHES,
+    IO_BYTES,
+    PAGE_FAULTS,
+    PEAK_RSS,
+    RESOURCE_FIELDS,
+    RSS,
+    SYS_TIME,
+    THREAD_TIME,
+    USER_TIME,
+    WALL_TIME,
+    NoTimerError,
+    PsutilBackend,
+    ScopedTiming,
+    TimingDelta,
+    Timings,
+    cummulative_scoped_timing,
+    function_timer,
+    get_backend,
+    is_enabled,
+    scoped_timing,
+    set_default_backend,
+    set_enabled,
+)
 from pytimings.tools import busywait, output_at_exit
 
 from .fixtures import is_mac_platform, is_windows_platform
@@ -109,6 +140,44 @@ def test_decorator(timings_object):
     _assert(delta_after.user, lower=delta_before.user)
 
 
+def test_scoped_timing_object(timings_object):
+    messages = []
+    timing = ScopedTiming(_DUMMY_SECTION, log_function=messages.append, timings=timings_object)
+    for _ in range(3):
+        with timing:
+            pass
+    assert timings_object.statistics(_DUMMY_SECTION).count == 3  # noqa: PLR2004
+    assert len(messages) == 3  # noqa: PLR2004
+
+    @ScopedTiming("recursive", timings=timings_object)
+    def countdown(n):
+        return countdown(n - 1) if n else "done"
+
+    assert countdown.__name__ == "countdown"
+    assert countdown(5) == "done"
+    assert "recursive" in timings_object._commited_deltas
+    assert not timings_object._stack
+
+
+@pytest.mark.parametrize("sample", [None, 1])
+def test_scoped_timing_object_shared_by_threads(sample):
+    timings = Timings(concurrent=True)
+    timing = ScopedTiming("shared", timings=timings, sample=sample)
+    inside = threading.Barrier(2, timeout=10)
+
+    def enter():
+        with timing:
+            # both threads are inside before either exits
+            inside.wait()
+            inside.wait()
+
+    with ThreadPoolExecutor(2) as pool:
+        for future in [pool.submit(enter) for _ in range(2)]:
+            future.result()
+    assert timings.statistics("shared").count == 2  # noqa: PLR2004
+    assert not any(buffer._known_timers_map for buffer in timings._thread_timings)
+
+
 def test_decorator_default_name(timings_object):
     @function_timer(timings=timings_object)
     def my_decorated_name():
@@ -210,3 +279,477 @@ def test_unknown_timer_error_message(timings_object):
     assert "known_timer" in error_msg
     # Should NOT mention "not been stopped yet" for truly unknown timer
     assert "has not been stopped yet" not in error_msg
+
+
+@pytest.mark.parametrize("backend", ["psutil", "fast", "resources"])
+def test_backends(backend):
+    timings = Timings(backend=backend)
+    timings.start(_DUMMY_SECTION)
+    slept = default_sleep()
+    timed = timings.stop(_DUMMY_SECTION)
+    _assert(timed.wall, lower=slept)
+    _assert(timed.user + timed.sys, lower=0.5 * slept)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="unknown timing backend"):
+        Timings(backend="nope")
+
+
+def test_default_backend(timings_object):
+    set_default_backend("fast")
+    try:
+        timings_object.start(_DUMMY_SECTION)
+        assert timings_object._known_timers_map[_DUMMY_SECTION][1]._backend is get_backend("fast")
+    finally:
+        set_default_backend("psutil")
+
+
+def test_psutil_backend_caches_process():
+    backend = PsutilBackend()
+    backend.sample()
+    process = backend._process
+    backend.sample()
+    assert backend._process is process
+    assert pickle.loads(pickle.dumps(backend))._process is None
+
+
+def test_resource_backend():
+    timings = Timings(backend="resources")
+    with scoped_timing(_DUMMY_SECTION, timings=timings):
+        block = bytearray(64 * 1024 * 1024)
+        block[::4096] = b"x" * len(block[::4096])
+    delta = timings.delta(_DUMMY_SECTION)
+    assert delta.peak_rss >= len(block)
+    if not is_windows_platform():
+        assert delta.page_faults > 0
+    out = StringIO()
+    timings.output_all_measures(out)
+    assert f"{_DUMMY_SECTION}_peak_rss," in out.getvalue()
+    timings.output_console()
+    out = StringIO()
+    Timings().output_all_measures(out)
+    assert "_rss" not in out.getvalue()
+
+
+class _ResourceStepBackend:
+    """every sample grows rss by 1 KiB, the peak by 10 KiB and counts one page fault, switch and I/O byte"""
+
+    name = "resource step"
+
+    def __init__(self):
+        self.step = 0
+
+    def sample(self):
+        self.step += 1
+        return {
+            WALL_TIME: self.step * 1e9,
+            USER_TIME: 0.0,
+            SYS_TIME: 0.0,
+            THREAD_TIME: 0.0,
+            RSS: self.step * 1024,
+            PEAK_RSS: self.step * 10240,
+            PAGE_FAULTS: self.step,
+            CONTEXT_SWITCHES: self.step,
+            IO_BYTES: self.step,
+        }
+
+
+@pytest.mark.parametrize("storage", ["dict", "columns"])
+def test_resource_accumulation(storage):
+    timings = Timings(backend=_ResourceStepBackend(), storage=storage)
+    for _ in range(3):
+        with scoped_timing("outer", timings=timings), scoped_timing("inner", timings=timings):
+            pass
+    outer, inner = timings.delta("outer"), timings.delta("inner")
+    # peaks are the maximum over all runs, everything else is summed up
+    assert outer.peak_rss == 12 * 10240
+    assert inner.peak_rss == 11 * 10240
+    assert outer.rss == 3 * 3 * 1024
+    assert (inner.page_faults, inner.context_switches, inner.io_bytes) == (3, 3, 3)
+    exclusive = timings.tree().children["outer"].exclusive
+    assert exclusive.peak_rss == outer.peak_rss
+    assert exclusive.rss == 2 * 3 * 1024
+    with scoped_timing("sampled", timings=timings, sample=2):
+        pass
+    # the peak of an extrapolated run is not scaled with its weight
+    assert timings.delta("sampled").peak_rss == 14 * 10240
+    assert timings.delta("sampled").rss == 2 * 1024
+    out = StringIO()
+    timings.output_all_measures(out)
+    assert [line for line in out.getvalue().splitlines() if line.startswith("inner_")][4:9] == [
+        f"inner_{field},{getattr(inner, field)}" for field in RESOURCE_FIELDS
+    ]
+
+
+class _StepBackend:
+    """every sample advances each thread's wall clock by exactly one second"""
+
+    name = "step"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def sample(self):
+        step = getattr(self._local, "step", 0) + 1
+        self._local.step = step
+        return {WALL_TIME: step * 1e9, USER_TIME: 0.0, SYS_TIME: 0.0, THREAD_TIME: 0.0}
+
+    def __reduce__(self):
+        return (_StepBackend, ())
+
+
+def test_concurrent_stress():
+    thread_count, calls_per_thread = 32, 500
+    timings = Timings(backend=_StepBackend(), concurrent=True)
+
+    @function_timer(section_name=_DUMMY_SECTION, timings=timings)
+    def hammered():
+        pass
+
+    barrier = threading.Barrier(thread_count)
+
+    def worker():
+        barrier.wait()
+        for _ in range(calls_per_thread):
+            hammered()
+
+    threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert timings.walltime(_DUMMY_SECTION) == thread_count * calls_per_thread
+    assert len(timings._thread_timings) == thread_count
+    with StringIO() as out:
+        timings.output_all_measures(out)
+        assert f"{_DUMMY_SECTION}_wall,{float(thread_count * calls_per_thread)}" in out.getvalue()
+
+
+def test_concurrent_running_flag_is_per_thread():
+    timings = Timings(backend=_StepBackend(), concurrent=True)
+    timings.start(_DUMMY_SECTION)
+    errors = []
+
+    def stop_elsewhere():
+        try:
+            timings.stop(_DUMMY_SECTION)
+        except NoTimerError as e:
+            errors.append(e)
+
+    other = threading.Thread(target=stop_elsewhere)
+    other.start()
+    other.join()
+    assert len(errors) == 1
+    # the other thread never started the section, so ours is still running
+    assert timings._local()._known_timers_map[_DUMMY_SECTION][0]
+    timings.stop(_DUMMY_SECTION)
+    assert timings.walltime(_DUMMY_SECTION) == 1
+
+
+def test_concurrent_reset_and_pickle():
+    timings = Timings(backend=_StepBackend(), concurrent=True)
+    with scoped_timing(_DUMMY_SECTION, timings=timings):
+        pass
+    restored = pickle.loads(pickle.dumps(timings))
+    assert restored.walltime(_DUMMY_SECTION) == 1
+    with scoped_timing(_DUMMY_SECTION, timings=restored):
+        pass
+    assert restored.walltime(_DUMMY_SECTION) == 2 * timings.walltime(_DUMMY_SECTION)
+    timings.reset()
+    assert timings.walltime(_DUMMY_SECTION) == 0
+
+
+def test_thread_time(timings_object):
+    with scoped_timing("busy", timings=timings_object):
+        slept = default_sleep()
+    with scoped_timing("idle", timings=timings_object):
+        time.sleep(DEFAULT_SLEEP_SECONDS)
+    _assert(timings_object.delta("busy").thread, lower=0.5 * slept)
+    idle = timings_object.delta("idle")
+    _assert(idle.wall, lower=0.9 * DEFAULT_SLEEP_SECONDS)
+    assert idle.thread < 0.5 * DEFAULT_SLEEP_SECONDS
+
+    with StringIO() as out:
+        timings_object.output_all_measures(out)
+        assert "busy_thread," in out.getvalue()
+
+
+def test_call_tree():
+    timings = Timings(backend=_StepBackend())
+    scope = partial(scoped_timing, timings=timings)
+    with scope("root"):
+        with scope("child"):
+            with scope("leaf"):
+                pass
+    # the same section below a different parent is a separate node
+    with scope("other"):
+        with scope("leaf"):
+            pass
+
+    tree = timings.tree()
+    assert list(tree.children) == ["other", "root"]
+    root = tree.children["root"]
+    child = root.children["child"]
+    leaf = child.children["leaf"]
+    assert (root.inclusive.wall, child.inclusive.wall, leaf.inclusive.wall) == (5, 3, 1)
+    assert (root.exclusive.wall, child.exclusive.wall, leaf.exclusive.wall) == (2, 2, 1)
+    assert leaf.path == ("root", "child", "leaf")
+    assert tree.children["other"].children["leaf"].inclusive.wall == 1
+    assert timings.walltime("leaf") == 2  # noqa: PLR2004
+
+    with StringIO() as out:
+        timings.output_all_measures(out)
+        output = out.getvalue()
+    assert "root/child/leaf_incl_wall,1.0" in output
+    assert "root/child_excl_wall,2.0" in output
+    timings.output_console()
+
+    timings.reset("leaf")
+    assert "leaf" not in timings.tree().children["root"].children["child"].children
+    timings.reset()
+    assert not timings.tree().children
+
+
+def test_call_tree_out_of_order_stop(timings_object):
+    timings_object.start("outer")
+    timings_object.start("inner")
+    timings_object.stop("outer")
+    timings_object.start("next")
+    timings_object.stop("next")
+    timings_object.stop("inner")
+    tree = timings_object.tree()
+    # 'inner' was still running when 'next' started, so that is where it is nested, below inner's own node
+    assert list(tree.children) == ["outer"]
+    inner = tree.children["outer"].children["inner"]
+    assert inner.children["next"].path == ("outer", "inner", "next")
+    assert all(node.inclusive.wall > 0 for node in tree.children["outer"].walk())
+    assert not timings_object._stack
+
+    with StringIO() as out:
+        timings_object.output_all_measures(out)
+        assert "outer/inner/next_incl_thread," in out.getvalue()
+
+
+def test_section_statistics():
+    timings = Timings(backend=_StepBackend())
+    for _ in range(10):
+        with scoped_timing(_DUMMY_SECTION, timings=timings):
+            pass
+    stats = timings.statistics(_DUMMY_SECTION)
+    assert stats.count == 10  # noqa: PLR2004
+    assert stats.min == stats.max == stats.mean == 1
+    assert stats.variance == 0
+    assert stats.percentile(99) == pytest.approx(1, rel=0.01)
+    with StringIO() as out:
+        timings.output_all_measures(out)
+        assert f"{_DUMMY_SECTION}_count,10" in out.getvalue()
+        assert f"{_DUMMY_SECTION}_p99," in out.getvalue()
+    timings.output_console()
+    restored = pickle.loads(pickle.dumps(timings, protocol=0))
+    assert restored.statistics(_DUMMY_SECTION).percentile(50) == stats.percentile(50)
+
+    with pytest.raises(NoTimerError):
+        timings.statistics("unknown")
+    timings.reset(_DUMMY_SECTION)
+    with pytest.raises(NoTimerError):
+        timings.statistics(_DUMMY_SECTION)
+    assert not Timings(statistics=False)._record_statistics
+
+
+def test_console_statistics_fit_narrow_terminals(monkeypatch, capsys):
+    monkeypatch.setenv("COLUMNS", "80")
+    timings = Timings(backend=_StepBackend())
+    section = "pkg.workload.solver.Solver.step"
+    with scoped_timing(section, timings=timings):
+        pass
+    timings.output_console()
+    output = capsys.readouterr().out
+    assert section in output
+    assert "0:00:01 " in output
+    assert "P99" in output
+    assert "Std" not in output
+    monkeypatch.setenv("COLUMNS", "200")
+    timings.output_console(all_statistics=True)
+    assert "Std (s)" in capsys.readouterr().out
+
+
+def test_concurrent_statistics():
+    timings = Timings(backend=_StepBackend(), concurrent=True)
+
+    def worker():
+        for _ in range(100):
+            with scoped_timing(_DUMMY_SECTION, timings=timings):
+                pass
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert timings.statistics(_DUMMY_SECTION).count == 400  # noqa: PLR2004
+    # merging must not alias the per-thread objects
+    assert timings.statistics(_DUMMY_SECTION).count == 400  # noqa: PLR2004
+
+
+def test_sampling_every_nth():
+    timings = Timings(backend=_StepBackend())
+
+    @function_timer(section_name=_DUMMY_SECTION, timings=timings, sample=10)
+    def hot():
+        pass
+
+    for _ in range(100):
+        hot()
+    # 10 measured calls of one second each, every one standing for 10 calls
+    assert timings.walltime(_DUMMY_SECTION) == 100  # noqa: PLR2004
+    assert timings.statistics(_DUMMY_SECTION).count == 10  # noqa: PLR2004
+    assert timings.statistics(_DUMMY_SECTION).mean == 1
+    assert timings.is_estimated(_DUMMY_SECTION)
+    with StringIO() as out:
+        timings.output_all_measures(out)
+        output = out.getvalue()
+    assert f"{_DUMMY_SECTION}_calls,100" in output
+    assert f"pytimings::data::_estimated,{_DUMMY_SECTION}" in output
+    timings.output_console()
+
+
+def test_sampling_at_random_rate():
+    random.seed(0)
+    timings = Timings(backend=_StepBackend())
+    for _ in range(2000):
+        with scoped_timing(_DUMMY_SECTION, timings=timings, sample=0.1):
+            pass
+    assert timings.walltime(_DUMMY_SECTION) == pytest.approx(2000, rel=0.15)
+    assert 100 < timings.statistics(_DUMMY_SECTION).count < 300  # noqa: PLR2004
+    timings.reset(_DUMMY_SECTION)
+    assert not timings.is_estimated(_DUMMY_SECTION)
+
+
+def test_sampling_validation(timings_object):
+    for sample in (0, 0.0, 1.5, -3, True):
+        with pytest.raises(ValueError, match="sample must be"):
+            with scoped_timing(_DUMMY_SECTION, timings=timings_object, sample=sample):
+                pass
+    assert not timings_object.is_estimated("never_sampled")
+
+
+def test_disabled(timings_object):
+    def function():
+        return 42
+
+    set_enabled(False)
+    try:
+        assert not is_enabled()
+        assert function_timer(timings=timings_object)(function) is function
+        scope = scoped_timing(_DUMMY_SECTION, timings=timings_object)
+        assert scope is cummulative_scoped_timing("other", timings=timings_object)
+        with scope, scope:
+            pass
+
+        # the decorator form of the scopes returns functions unchanged as well
+        @scoped_timing(_DUMMY_SECTION, timings=timings_object)
+        def decorated():
+            return 42
+
+        assert decorated() == 42  # noqa: PLR2004
+        assert cummulative_scoped_timing("other")(function) is function
+    finally:
+        set_enabled(True)
+    assert not timings_object._commited_deltas
+    with scoped_timing(_DUMMY_SECTION, timings=timings_object):
+        pass
+    assert _DUMMY_SECTION in timings_object._commited_deltas
+
+
+@pytest.mark.parametrize(("value", "enabled"), [("1", False), ("yes", False), ("0", True), ("", True)])
+def test_disabled_by_environment(value, enabled):
+    # decorating at import time must work either way
+    code = (
+        "from pytimings.timer import is_enabled, scoped_timing\n"
+        "@scoped_timing('module_level')\n"
+        "def function(): pass\n"
+        "function(); print(is_enabled())"
+    )
+    env = {**os.environ, "PYTIMINGS_DISABLE": value}
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == str(enabled)
+
+
+def test_stop_stopped_section():
+    timings = Timings(backend=_StepBackend())
+    timings.start(_DUMMY_SECTION)
+    first = timings.stop(_DUMMY_SECTION)
+    assert timings.stop(_DUMMY_SECTION) == first
+    assert timings.delta(_DUMMY_SECTION).wall == 1
+    assert _DUMMY_SECTION not in timings._known_timers_map
+
+
+@pytest.mark.parametrize("storage", ["dict", "columns"])
+def test_section_handle(storage):
+    reference = Timings(backend=_StepBackend(), storage=storage)
+    timings = Timings(backend=_StepBackend(), storage=storage)
+    handle = timings.section("outer")
+    assert timings.section("outer") is handle
+    for recorded in (reference, timings):
+        recorded.start("plain")
+        recorded.stop("plain")
+    for _ in range(2):
+        reference.start("outer")
+        reference.start("inner")
+        reference.stop("inner")
+        reference.stop("outer")
+        with handle:
+            assert handle.running
+            timings.start("inner")
+            timings.stop("inner")
+    assert not handle.running
+    assert handle.stop() == timings.delta("outer")
+    assert timings.walltime("outer") == reference.walltime("outer") == 6  # noqa: PLR2004
+    assert timings.tree() == reference.tree()
+    assert timings.statistics("outer").count == 2  # noqa: PLR2004
+    outputs = []
+    for recorded in (reference, timings):
+        out = StringIO()
+        recorded.output_all_measures(out)
+        # columnar storage orders rows by section id, the handle interned its name first
+        outputs.append(sorted(out.getvalue().splitlines()))
+    assert outputs[0] == outputs[1]
+    pickle.loads(pickle.dumps(timings)).section("outer")
+
+
+@pytest.mark.parametrize("storage", ["dict", "columns"])
+def test_section_handle_stop_and_reset(storage):
+    timings = Timings(backend=_StepBackend(), storage=storage)
+    handle = timings.section("handled")
+    handle.start()
+    timings.stop()
+    assert not handle.running
+    assert timings.walltime("handled") == 1
+    handle.start()
+    timings.reset("handled")
+    assert not handle.running
+    assert timings.walltime("handled") == 0
+    handle.start()
+    timings.reset()
+    assert not handle.running
+    assert not timings._stack
+    # nothing stale is committed by a later stop
+    assert handle.stop() == timings.delta("handled") == TimingDelta(0, 0, 0)
+
+
+def test_section_handle_concurrent():
+    timings = Timings(backend=_StepBackend(), concurrent=True)
+    handle = timings.section(_DUMMY_SECTION)
+
+    def worker():
+        for _ in range(10):
+            with handle:
+                pass
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert timings.delta(_DUMMY_SECTION).wall == 40  # noqa: PLR2004
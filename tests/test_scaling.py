@@ -0,0 +1,97 @@
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib as mpl
+import pandas as pd
+import pytest
+
+from pytimings.plotting.scaling import plot_scaling
+from pytimings.scaling import TOTAL_SECTION, load_study, run_study, scaling_metrics
+from pytimings.timer import scoped_timing
+
+mpl.use("Agg")
+
+
+def _work(workers, size, timings):
+    with scoped_timing("setup", timings=timings):
+        pass
+    timings.add_walltime("solve", size / workers)
+
+
+def test_run_study(tmp_path):
+    study = run_study(_work, workers=[1, 2, 4], sizes=[8, 16], repeats=2, output_dir=tmp_path)
+    assert len(study) == 3 * 2 * 2 * 3
+    assert set(study["section"]) == {TOTAL_SECTION, "setup", "solve"}
+    solve = study[study["section"] == "solve"]
+    assert list(solve["wall"]) == [size / workers for size in (8, 16) for workers in (1, 2, 4) for _ in range(2)]
+    loaded = load_study(tmp_path)
+    columns = ["workers", "size", "repeat", "section", "wall"]
+    key = ["size", "workers", "repeat", "section"]
+    expected = study[columns].sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(loaded[columns].sort_values(key).reset_index(drop=True), expected, check_dtype=False)
+
+
+def _threaded_work(workers, size, timings):
+    inside = threading.Barrier(workers, timeout=10)
+
+    def chunk():
+        for _ in range(size):
+            with scoped_timing("chunk", timings=timings):
+                # all threads are in the section at once
+                inside.wait()
+
+    with ThreadPoolExecutor(workers) as pool:
+        for future in [pool.submit(chunk) for _ in range(workers)]:
+            future.result()
+
+
+def test_run_study_threads():
+    study = run_study(_threaded_work, workers=iter([1, 4]), sizes=iter([20, 40]))
+    chunk = study[study["section"] == "chunk"]
+    assert list(zip(chunk["size"], chunk["workers"], strict=True)) == [(20, 1), (20, 4), (40, 1), (40, 4)]
+    assert (chunk["wall"] > 0).all()
+
+
+def test_load_study_sizes(tmp_path):
+    run_study(lambda workers, size, timings: None, workers=[1], sizes=[None, "small", 3, 2.5], output_dir=tmp_path)
+    loaded = load_study(tmp_path)
+    assert list(loaded[loaded["section"] == TOTAL_SECTION]["size"]) == [None, "small", 3, 2.5]
+
+
+def test_strong_scaling():
+    study = pd.DataFrame(
+        {
+            "workers": [1, 1, 2, 4],
+            "size": [None] * 4,
+            "repeat": [0, 1, 0, 0],
+            "section": ["solve"] * 4,
+            "wall": [7.0, 9.0, 4.0, 2.5],
+        }
+    )
+    metrics = scaling_metrics(study)
+    assert list(metrics["workers"]) == [1, 2, 4]
+    assert list(metrics["runs"]) == [2, 1, 1]
+    assert list(metrics["speedup"]) == pytest.approx([1, 2, 3.2])
+    assert list(metrics["efficiency"]) == pytest.approx([1, 1, 0.8])
+    assert math.isnan(metrics["karp_flatt"].iloc[0])
+    assert metrics["karp_flatt"].iloc[2] == pytest.approx((1 / 3.2 - 1 / 4) / (1 - 1 / 4))
+
+
+def test_weak_scaling():
+    study = pd.DataFrame(
+        {"workers": [2, 4], "size": [100, 200], "repeat": [0, 0], "section": ["solve"] * 2, "wall": [1.0, 1.25]}
+    )
+    metrics = scaling_metrics(study, weak=True)
+    assert list(metrics["efficiency"]) == pytest.approx([1, 0.8])
+    assert list(metrics["speedup"]) == pytest.approx([1, 1.6])
+    assert metrics["karp_flatt"].iloc[1] == pytest.approx(0.25)
+
+
+@pytest.mark.parametrize("metric", ["speedup", "efficiency", "karp_flatt"])
+def test_plot_scaling(metric):
+    study = run_study(_work, workers=[1, 2, 4], sizes=[8, 16])
+    ax = plot_scaling(scaling_metrics(study), metric=metric, sections=["solve"])
+    labels = [line.get_label() for line in ax.get_lines()]
+    assert labels[:2] == ["8 solve", "16 solve"]
+    assert ("ideal" in labels) == (metric != "karp_flatt")
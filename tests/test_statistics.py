@@ -0,0 +1,72 @@
+import math
+
+import numpy as np
+import pytest
+
+from pytimings.statistics import QuantileSketch, SectionStatistics
+
+
+@pytest.fixture
+def samples():
+    return np.random.default_rng(42).lognormal(mean=-7, sigma=1.5, size=10_000)
+
+
+def test_welford_matches_numpy(samples):
+    stats = SectionStatistics()
+    for value in samples:
+        stats.add(value)
+    assert stats.count == len(samples)
+    assert stats.mean == pytest.approx(samples.mean())
+    assert stats.variance == pytest.approx(samples.var(ddof=1))
+    assert stats.min == samples.min()
+    assert stats.max == samples.max()
+
+
+def test_percentiles_within_relative_accuracy(samples):
+    stats = SectionStatistics()
+    for value in samples:
+        stats.add(value)
+    for p in (1, 50, 90, 99, 99.9):
+        assert stats.percentile(p) == pytest.approx(np.percentile(samples, p, method="lower"), rel=0.02)
+
+
+def test_merge_equals_sequential(samples):
+    left, right, combined = SectionStatistics(), SectionStatistics(), SectionStatistics()
+    for value in samples[:3000]:
+        left.add(value)
+    for value in samples[3000:]:
+        right.add(value)
+    for value in samples:
+        combined.add(value)
+    left.merge(right)
+    assert left.count == combined.count
+    assert left.mean == pytest.approx(combined.mean)
+    assert left.variance == pytest.approx(combined.variance)
+    assert left.percentile(90) == combined.percentile(90)
+    assert SectionStatistics().copy().count == 0
+
+
+def test_sketch_memory_is_bounded():
+    sketch = QuantileSketch(max_buckets=16)
+    for exponent in range(-9, 6):
+        for mantissa in range(1, 10):
+            sketch.add(mantissa * 10.0**exponent)
+    assert len(sketch._buckets) <= sketch.max_buckets
+    assert sketch.quantile(1) == pytest.approx(9e5, rel=0.01)
+
+
+def test_sketch_edge_cases():
+    sketch = QuantileSketch()
+    assert math.isnan(sketch.quantile(0.5))
+    sketch.add(0.0)
+    sketch.add(-1e-9)
+    assert sketch.quantile(0.5) == 0
+    with pytest.raises(ValueError):
+        sketch.quantile(2)
+    with pytest.raises(ValueError):
+        QuantileSketch(relative_accuracy=0)
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(relative_accuracy=0.1))
+    single = SectionStatistics()
+    single.add(1.0)
+    assert math.isnan(single.variance)
@@ -0,0 +1,139 @@
+import pickle
+from io import StringIO
+
+import pytest
+
+from pytimings.storage import DeltaColumns, SectionIds
+from pytimings.timer import RESOURCE_FIELDS, SYS_TIME, THREAD_TIME, USER_TIME, WALL_TIME, TimingDelta, Timings
+
+
+class _CountingBackend:
+    """every sample advances the wall clock by one second and the cpu clocks by a quarter second"""
+
+    name = "counting"
+
+    def __init__(self):
+        self.step = 0
+
+    def sample(self):
+        self.step += 1
+        return {WALL_TIME: self.step * 1e9, USER_TIME: self.step / 4, SYS_TIME: 0.0, THREAD_TIME: 0.0}
+
+
+def _record(timings):
+    for shard in range(3):
+        with_nesting = f"request_{shard}"
+        timings.start(with_nesting)
+        timings.start("inner")
+        timings.stop("inner")
+        timings.stop(with_nesting)
+    timings.start("request_0")
+    timings.stop("request_0")
+
+
+def test_section_ids():
+    ids = SectionIds()
+    name = "".join(["dyn", "amic"])
+    assert ids.intern(name) == 0
+    assert ids.intern("other") == 1
+    assert ids.intern("dynamic") == 0
+    assert ids.key(0) is ids.key(ids.intern("".join(["dyn", "amic"])))
+    assert list(ids) == ["dynamic", "other"]
+    restored = pickle.loads(pickle.dumps(ids, protocol=0))
+    assert restored.get("other") == 1
+    assert len(restored) == 2  # noqa: PLR2004
+
+
+def test_delta_columns_mapping():
+    columns = DeltaColumns()
+    columns["a"] = TimingDelta(1, 2, 3, 4)
+    columns["b"] = TimingDelta(5, 6, 7)
+    assert columns["a"] == TimingDelta(1, 2, 3, 4)
+    assert columns.get("b") == TimingDelta(5, 6, 7, 0)
+    assert list(columns.column("wall")) == [1, 5]
+    assert len(columns) == 2  # noqa: PLR2004
+    del columns["a"]
+    assert "a" not in columns
+    assert list(columns) == ["b"]
+    with pytest.raises(KeyError):
+        columns["a"]
+    with pytest.raises(KeyError):
+        del columns["a"]
+    columns["a"] = TimingDelta(1, 1, 1, 1)
+    assert columns.ids.get("a") == 0
+    for protocol in (0, pickle.HIGHEST_PROTOCOL):
+        assert dict(pickle.loads(pickle.dumps(columns, protocol=protocol))) == dict(columns)
+
+
+def test_resource_columns_allocated_on_first_use():
+    columns = DeltaColumns()
+    columns.add("time_only", TimingDelta(1, 0, 0))
+    assert len(columns._columns) == len(TimingDelta._fields) - len(RESOURCE_FIELDS)
+    assert list(columns.column("peak_rss")) == [0]
+    columns.add("resources", TimingDelta(1, 0, 0, rss=10, peak_rss=100))
+    columns.add("resources", TimingDelta(1, 0, 0, rss=-4, peak_rss=50))
+    assert len(columns._columns) == len(TimingDelta._fields)
+    assert columns["resources"] == TimingDelta(2, 0, 0, rss=6, peak_rss=100)
+    assert columns["time_only"] == TimingDelta(1, 0, 0)
+    assert list(columns.column("peak_rss")) == [0, 100]
+    assert dict(pickle.loads(pickle.dumps(columns))) == dict(columns)
+
+
+def test_shared_ids():
+    ids = SectionIds()
+    first, second = DeltaColumns(ids), DeltaColumns(ids)
+    second["late"] = TimingDelta(1, 1, 1)
+    first["early"] = TimingDelta(2, 2, 2)
+    assert ids.get("late") == 0
+    assert list(first) == ["early"]
+    assert list(first.column("wall")) == [0, 2]
+
+
+def test_columns_storage_matches_dict_storage():
+    reference = Timings(backend=_CountingBackend())
+    compact = Timings(backend=_CountingBackend(), storage="columns")
+    _record(reference)
+    _record(compact)
+    assert isinstance(compact._commited_deltas, DeltaColumns)
+    for section in ("request_0", "request_2", "inner"):
+        assert compact.delta(section) == reference.delta(section)
+    assert compact.tree() == reference.tree()
+    outputs = []
+    for timings in (reference, compact):
+        out = StringIO()
+        timings.output_all_measures(out)
+        outputs.append(out.getvalue())
+    assert outputs[0] == outputs[1]
+    restored = pickle.loads(pickle.dumps(compact))
+    assert restored.delta("request_0") == reference.delta("request_0")
+
+
+def test_columns_storage_concurrent():
+    timings = Timings(backend=_CountingBackend(), concurrent=True, storage="columns")
+    _record(timings)
+    assert timings.delta("inner").wall == 3  # noqa: PLR2004
+    assert timings.snapshot().deltas["request_0"].wall == 4  # noqa: PLR2004
+
+
+def test_section_id(timings_object):
+    section_id = timings_object.section_id("section")
+    assert timings_object.section_id("section") == section_id
+    assert timings_object.section_name(section_id) == "section"
+
+
+def test_unknown_storage():
+    with pytest.raises(ValueError, match="unknown storage"):
+        Timings(storage="nope")
+
+
+def test_reset_columns_storage():
+    timings = Timings(backend=_CountingBackend(), storage="columns")
+    _record(timings)
+    timings.start("running")
+    timings.reset()
+    assert timings.delta("running") == TimingDelta(0, 0, 0)
+    assert timings.delta("inner") == TimingDelta(0, 0, 0)
+    assert not timings._tree_deltas
+    timings.start("inner")
+    timings.stop("inner")
+    assert timings.delta("inner").wall == 1
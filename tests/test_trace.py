@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+
+import pytest
+
+from pytimings.timer import Timings, scoped_timing
+from pytimings.tools import busywait
+from pytimings.trace import TraceRecorder
+
+
+def _nested(timings):
+    with scoped_timing("outer", timings=timings):
+        busywait(0.01)
+        with scoped_timing("inner", timings=timings):
+            busywait(0.01)
+
+
+def test_chrome_trace(tmp_path):
+    timings = Timings(concurrent=True)
+    with TraceRecorder(timings) as recorder:
+        _nested(timings)
+        worker = threading.Thread(target=_nested, args=(timings,), name="worker")
+        worker.start()
+        worker.join()
+    _nested(timings)  # after closing, not recorded
+    assert recorder.recorded == 4  # noqa: PLR2004
+    trace = json.loads(recorder.write_chrome_trace(tmp_path / "trace.json").read_text())
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert [event["name"] for event in spans].count("outer") == 2  # noqa: PLR2004
+    assert {event["args"]["name"] for event in trace["traceEvents"] if event["name"] == "thread_name"} >= {"worker"}
+    assert len({event["tid"] for event in spans}) == 2  # noqa: PLR2004
+    for outer in (event for event in spans if event["name"] == "outer"):
+        (inner,) = [event for event in spans if event["name"] == "inner" and event["tid"] == outer["tid"]]
+        assert inner["args"]["path"] == "outer/inner"
+        assert outer["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+        assert spans.index(outer) < spans.index(inner)
+
+
+def test_ring_buffer():
+    timings = Timings()
+    recorder = TraceRecorder(timings, max_events=3)
+    for index in range(5):
+        with scoped_timing(f"section_{index}", timings=timings):
+            pass
+    recorder.close()
+    assert [event.name for event in recorder.events()] == ["section_2", "section_3", "section_4"]
+    assert recorder.dropped == 2  # noqa: PLR2004
+    assert recorder.to_chrome_trace()["otherData"]["dropped_events"] == 2  # noqa: PLR2004
+
+
+def test_folded_stacks(tmp_path):
+    timings = Timings()
+    with TraceRecorder(timings) as recorder:
+        _nested(timings)
+    stacks = recorder.folded_stacks()
+    assert set(stacks) == {"outer", "outer;inner"}
+    assert stacks["outer"] + stacks["outer;inner"] == pytest.approx(timings.walltime("outer"))
+    assert stacks["outer"] == pytest.approx(timings.tree().children["outer"].exclusive.wall)
+    lines = recorder.write_folded(tmp_path / "stacks.folded").read_text().splitlines()
+    assert [line.split()[0] for line in lines] == ["outer", "outer;inner"]
+    assert all(int(line.split()[1]) > 0 for line in lines)
+
+
+def test_sampled_runs():
+    timings = Timings()
+    with TraceRecorder(timings) as recorder:
+        for _ in range(10):
+            with scoped_timing("sampled", timings=timings, sample=5):
+                busywait(0.005)
+    events = recorder.events()
+    assert len(events) == 2  # noqa: PLR2004
+    # spans cover the measured run, not the calls it was extrapolated to
+    assert all(event.duration_ns * 1e-9 >= 0.005 for event in events)  # noqa: PLR2004
+    assert sum(event.duration_ns for event in events) * 5e-9 == pytest.approx(timings.walltime("sampled"))
+    assert {event.weight for event in events} == {5}
+    assert recorder.folded_stacks()["sampled"] == pytest.approx(timings.walltime("sampled"))
+
+
+def test_export_while_recording():
+    timings = Timings(concurrent=True)
+    recording = threading.Event()
+    recording.set()
+
+    def record():
+        while recording.is_set():
+            with scoped_timing("outer", timings=timings):
+                with scoped_timing("inner", timings=timings):
+                    pass
+
+    with TraceRecorder(timings, max_events=100) as recorder:
+        recorders = [threading.Thread(target=record) for _ in range(4)]
+        for thread in recorders:
+            thread.start()
+        try:
+            deadline = time.monotonic() + 2
+            while recorder.recorded < 2000 and time.monotonic() < deadline:  # noqa: PLR2004
+                recorder.folded_stacks()
+        finally:
+            recording.clear()
+            for thread in recorders:
+                thread.join()
+    assert recorder.recorded == 2 * timings.statistics("outer").count
+    assert recorder.dropped == recorder.recorded - 100